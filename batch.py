@@ -0,0 +1,354 @@
+"""
+Batch runner for seeded headless games.
+
+Runs many games with a firing policy across a process pool and streams one
+result per game to a JSONL or CSV file. Games already in the output file are
+skipped with --resume, so an interrupted sweep can pick up where it stopped.
+
+Usage:
+    python -m batch --games 10000 --policy random --output results.jsonl
+"""
+
+import argparse
+import csv
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import firecontrol
+from scores import ScoreStore, run_from_result
+from settings import (
+    PLAYER_EXPLOSION_RADIUS,
+    PLAYER_MISSILE_SPEED,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+)
+from simulation import Simulation
+
+FIELDS = [
+    "seed",
+    "policy",
+    "level",
+    "score",
+    "cities_lost",
+    "bases_left",
+    "ammo_used",
+    "frames",
+]
+
+
+def random_policy(seed, interval=30):
+    """
+    Fires at a random point in the sky every `interval` steps.
+
+    Args:
+        seed (int): Seed for the policy's own random generator.
+        interval (int): Steps between shots.
+
+    Returns:
+        Callable[[Simulation], tuple[int, int] | None]: The policy.
+    """
+    rng = random.Random(seed)
+
+    def policy(sim):
+        if sim.frame % interval:
+            return None
+        return (rng.randint(0, SCREEN_WIDTH), rng.randint(0, SCREEN_HEIGHT * 2 // 3))
+
+    return policy
+
+
+def lowest_meteor_policy(seed, interval=20):
+    """
+    Fires at the lowest meteor every `interval` steps, leading it by the
+    time the missile needs to get there.
+
+    Args:
+        seed (int): Unused; scripted policies are deterministic.
+        interval (int): Steps between shots.
+
+    Returns:
+        Callable[[Simulation], tuple[int, int] | None]: The policy.
+    """
+
+    def policy(sim):
+        if sim.frame % interval or not sim.enemy_meteors:
+            return None
+        # Vectorized simulations only move the sprites when asked to.
+        sim.sync_views()
+        meteor = max(sim.enemy_meteors, key=lambda m: m.current_pos.y)
+        base = sim.find_closest_base(meteor.rect.center)
+        if base is None:
+            return None
+        distance = math.dist(base.rect.midtop, meteor.current_pos)
+        lead = meteor.current_pos + meteor.velocity * (distance / PLAYER_MISSILE_SPEED)
+        return (int(lead.x), int(lead.y))
+
+    return policy
+
+
+def intercept_policy(seed, interval=10):
+    """
+    Fires the most urgent shot of the fire-control plan every `interval`
+    steps, skipping meteors a missile in flight is already aimed near.
+
+    Args:
+        seed (int): Unused; scripted policies are deterministic.
+        interval (int): Steps between shots.
+
+    Returns:
+        Callable[[Simulation], tuple[int, int] | None]: The policy.
+    """
+
+    def policy(sim):
+        if sim.frame % interval or not sim.enemy_meteors:
+            return None
+        aimed = [missile.target_pos for missile in sim.player_missiles]
+        for shot in firecontrol.plan(sim):
+            if all(math.dist(shot.aim, t) > PLAYER_EXPLOSION_RADIUS for t in aimed):
+                return shot.aim
+        return None
+
+    return policy
+
+
+POLICIES = {
+    "random": random_policy,
+    "lowest": lowest_meteor_policy,
+}
+# The intercept solver needs NumPy (the "fast" extra).
+if firecontrol.np is not None:
+    POLICIES["intercept"] = intercept_policy
+
+
+def run_game(seed, policy="random", max_frames=100_000):
+    """
+    Plays one headless game to the end.
+
+    Args:
+        seed (int): Seed for the game and the policy.
+        policy (str): Name of a policy in POLICIES.
+        max_frames (int): Give up after this many steps.
+
+    Returns:
+        dict: The result, with the keys in FIELDS.
+    """
+    sim = Simulation(seed=seed)
+    choose_target = POLICIES[policy](seed)
+    cities = len(sim.cities)
+    while not sim.game_over and sim.frame < max_frames:
+        target = choose_target(sim)
+        if target is not None:
+            sim.fire(target)
+        sim.step()
+    return {
+        "seed": seed,
+        "policy": policy,
+        "level": sim.level,
+        "score": sim.score,
+        "cities_lost": cities - len(sim.cities),
+        "bases_left": sum(not base.is_destroyed() for base in sim.bases),
+        "ammo_used": sim.missiles_fired,
+        "frames": sim.frame,
+    }
+
+
+def _run_game(args):
+    """Pool entry point taking a single argument tuple."""
+    return run_game(*args)
+
+
+def completed_seeds(path):
+    """
+    Returns the seeds already recorded in an output file.
+
+    A partly written last line (e.g. after a crash) is ignored.
+    """
+    if not os.path.exists(path):
+        return set()
+    seeds = set()
+    with open(path, newline="") as f:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(f):
+                if row.get("frames"):
+                    seeds.add(int(row["seed"]))
+        else:
+            for line in f:
+                try:
+                    seeds.add(json.loads(line)["seed"])
+                except (ValueError, KeyError):
+                    continue
+    return seeds
+
+
+def _drop_partial_line(path):
+    """Truncates a file after its last complete line."""
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+class ResultWriter:
+    """
+    Appends results to a JSONL or CSV file, flushing every record.
+
+    Use it as a context manager so the file is closed if the batch fails.
+    """
+
+    def __init__(self, path):
+        """
+        Opens the output file for appending. A partly written last line
+        left by an interrupted run is removed first.
+
+        Args:
+            path (str): Output path; a .csv extension selects CSV, anything
+                else JSON Lines.
+        """
+        if os.path.exists(path):
+            _drop_partial_line(path)
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        # Held open for the writer's lifetime; closed by close() or __exit__.
+        self.file = open(path, "a", newline="")  # noqa: SIM115
+        self.csv = None
+        if path.endswith(".csv"):
+            self.csv = csv.DictWriter(self.file, fieldnames=FIELDS)
+            if is_new:
+                self.csv.writeheader()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, result):
+        """Writes one result."""
+        if self.csv is not None:
+            self.csv.writerow(result)
+        else:
+            self.file.write(json.dumps(result) + "\n")
+        self.file.flush()
+
+    def close(self):
+        """Closes the output file."""
+        self.file.close()
+
+
+def run_batch(
+    seeds,
+    output,
+    policy="random",
+    workers=None,
+    max_frames=100_000,
+    progress=None,
+    scores=None,
+):
+    """
+    Runs one game per seed and writes the results as they finish.
+
+    Args:
+        seeds (Iterable[int]): Seeds of the games to run.
+        output (str): Output file path.
+        policy (str): Name of a policy in POLICIES.
+        workers (int | None): Worker processes; defaults to every core. With
+            one worker the games run in this process.
+        max_frames (int): Step limit per game.
+        progress (Callable[[int, int], None] | None): Called with
+            (games done, games total) after each game.
+        scores (str | None): Also add every result to this score store,
+            in batched transactions.
+
+    Returns:
+        int: The number of games run.
+    """
+    jobs = [(seed, policy, max_frames) for seed in seeds]
+    workers = workers or os.cpu_count() or 1
+    store = runs = None
+    if scores:
+        store = ScoreStore(scores)
+        runs = store.writer()
+
+    def record(results):
+        for done, result in enumerate(results, 1):
+            writer.write(result)
+            if runs is not None:
+                runs.add(run_from_result(result))
+            if progress:
+                progress(done, len(jobs))
+
+    try:
+        with ResultWriter(output) as writer:
+            if workers == 1:
+                record(map(_run_game, jobs))
+            else:
+                with multiprocessing.Pool(workers) as pool:
+                    chunksize = max(1, len(jobs) // (workers * 16))
+                    record(pool.imap_unordered(_run_game, jobs, chunksize))
+    finally:
+        if runs is not None:
+            runs.flush()
+        if store is not None:
+            store.close()
+    return len(jobs)
+
+
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Run seeded headless games.")
+    parser.add_argument("--games", type=int, default=1000, help="number of games")
+    parser.add_argument("--seed-start", type=int, default=0, help="first seed")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="worker processes (default: all)"
+    )
+    parser.add_argument("--max-frames", type=int, default=100_000)
+    parser.add_argument(
+        "--output", default="results.jsonl", help="a .jsonl or .csv file"
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="skip seeds already in the output"
+    )
+    parser.add_argument(
+        "--scores", metavar="PATH", help="also add the results to a score store"
+    )
+    parser.add_argument("--quiet", action="store_true", help="no progress output")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Command line entry point."""
+    args = parse_args(argv)
+    seeds = range(args.seed_start, args.seed_start + args.games)
+    if args.resume:
+        done = completed_seeds(args.output)
+        seeds = [seed for seed in seeds if seed not in done]
+    elif os.path.exists(args.output):
+        os.remove(args.output)
+
+    start = time.perf_counter()
+
+    def progress(done, total):
+        rate = done / max(time.perf_counter() - start, 1e-9)
+        print(f"\r{done}/{total} games ({rate:.1f} games/s)", end="", file=sys.stderr)
+
+    count = run_batch(
+        seeds,
+        args.output,
+        args.policy,
+        args.workers,
+        args.max_frames,
+        None if args.quiet else progress,
+        args.scores,
+    )
+    if not args.quiet:
+        print(file=sys.stderr)
+    return count
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Performance benchmarks for Missile Command.
+
+Each scenario builds a seeded game from the real classes and times
+Game.update() plus drawing it with the scenario's renderer (to an off-screen
+surface) frame by frame.
+Results can be saved as a baseline JSON file; comparing against a baseline
+fails when a scenario's median or 95th percentile frame time regresses past
+the threshold.
+
+Usage:
+    python -m benchmark --save-baseline baseline.json
+    python -m benchmark --baseline baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from game import Game
+from renderer import BatchedRenderer, FullRenderer
+from settings import BLACK, SCREEN_HEIGHT, SCREEN_WIDTH
+from simulation import Simulation
+from world import np
+
+
+def _game(seed, vectorized=False, trails=False):
+    """Creates a game drawing to an off-screen surface."""
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    return Game(screen, Simulation(seed=seed, vectorized=vectorized), trails=trails)
+
+
+def idle_level_1(seed):
+    """A fresh game at level 1 with no player input."""
+    game = _game(seed)
+    return game, None, FullRenderer(game.screen)
+
+
+def falling_meteors(seed, count=500):
+    """Hundreds of meteors falling through the sky at once."""
+    game = _game(seed)
+    sim = game.simulation
+    rng = random.Random(seed)
+    targets = [city.rect.center for city in sim.cities]
+    for _ in range(count):
+        # Start high and slow so that none land during the run.
+        start = (rng.randint(0, SCREEN_WIDTH), rng.randint(0, 200))
+        sim.add_meteor(start, rng.choice(targets), rng.uniform(0.3, 0.9))
+    return game, None, FullRenderer(game.screen)
+
+
+def swarm(seed, count=3000, trails=False):
+    """
+    Thousands of meteors, simulated in the EntityWorld when NumPy is
+    installed and drawn by BatchedRenderer.
+    """
+    game = _game(seed, vectorized=np is not None, trails=trails)
+    sim = game.simulation
+    rng = random.Random(seed)
+    for _ in range(count):
+        start = (rng.randint(0, SCREEN_WIDTH), rng.randint(0, 200))
+        sim.add_meteor(
+            start, (rng.randint(0, SCREEN_WIDTH), 580), rng.uniform(0.1, 0.3)
+        )
+    return game, None, BatchedRenderer(game.screen)
+
+
+def contrails(seed, count=2000):
+    """
+    A swarm drawn with contrails while the player keeps shooting into it,
+    so that trails grow every frame and finished ones are erased.
+    """
+    game, _, renderer = swarm(seed, count, trails=True)
+    sim = game.simulation
+    rng = random.Random(seed)
+
+    def fire(game):
+        if sim.frame % 5 == 0:
+            for base in sim.bases:
+                base.ammo = 10
+            sim.fire((rng.randint(0, SCREEN_WIDTH), rng.randint(50, 250)))
+
+    return game, fire, renderer
+
+
+def overlapping_explosions(seed, count=100):
+    """A cluster of overlapping explosions that is topped up every frame."""
+    game = _game(seed)
+    sim = game.simulation
+    rng = random.Random(seed)
+
+    def top_up(game):
+        for _ in range(count - len(sim.explosions)):
+            pos = (rng.randint(300, 500), rng.randint(150, 250))
+            sim.add_explosion(pos, rng.choice((30, 50)))
+
+    top_up(game)
+    return game, top_up, FullRenderer(game.screen)
+
+
+def chain_reaction(seed, level=12, meteors=150):
+    """A late level where the player keeps firing into a dense wave."""
+    game = _game(seed)
+    sim = game.simulation
+    sim.level = level - 1
+    sim._start_new_level()
+    rng = random.Random(seed)
+    targets = [city.rect.center for city in sim.cities]
+    for _ in range(meteors):
+        start = (rng.randint(0, SCREEN_WIDTH), rng.randint(0, 150))
+        sim.add_meteor(start, rng.choice(targets), rng.uniform(0.3, 0.8))
+
+    def fire(game):
+        if sim.frame % 3 == 0 and sim.enemy_meteors:
+            meteor = rng.choice(sim.enemy_meteors.sprites())
+            for base in sim.bases:
+                base.ammo = 10
+            sim.fire(meteor.rect.center)
+
+    return game, fire, FullRenderer(game.screen)
+
+
+# Each scenario takes a seed and returns the game, a function called with it
+# before every frame (or None) and the renderer whose draw() is timed.
+SCENARIOS = {
+    "idle_level_1": idle_level_1,
+    "meteors_500": falling_meteors,
+    "swarm_3000": swarm,
+    "contrails_2000": contrails,
+    "explosions_100": overlapping_explosions,
+    "chain_reaction": chain_reaction,
+}
+
+
+def _percentile(values, fraction):
+    """Returns the value at `fraction` of the sorted values."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _frame(game, tick, renderer):
+    """Runs one timed frame and returns (update seconds, draw seconds)."""
+    if tick is not None:
+        tick(game)
+    start = time.perf_counter()
+    game.update()
+    middle = time.perf_counter()
+    game.screen.fill(BLACK)
+    renderer.draw(game)
+    return middle - start, time.perf_counter() - middle
+
+
+def run_scenario(name, frames=300, warmup=30, seed=0):
+    """
+    Times one scenario.
+
+    Args:
+        name (str): A key of SCENARIOS.
+        frames (int): Frames to measure.
+        warmup (int): Frames run before measuring.
+        seed (int): Seed for the game and the scenario.
+
+    Returns:
+        dict: Frame time percentiles in milliseconds, frames per second and
+        the peak bytes allocated during a frame.
+    """
+    game, tick, renderer = SCENARIOS[name](seed)
+    for _ in range(warmup):
+        _frame(game, tick, renderer)
+
+    update_times = []
+    draw_times = []
+    for _ in range(frames):
+        update_time, draw_time = _frame(game, tick, renderer)
+        update_times.append(update_time)
+        draw_times.append(draw_time)
+    totals = [u + d for u, d in zip(update_times, draw_times)]
+
+    # Allocation pass, run separately because tracing slows every frame down.
+    allocated = []
+    tracemalloc.start()
+    try:
+        for _ in range(min(frames, 60)):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            _frame(game, tick, renderer)
+            allocated.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+
+    ms = 1000.0
+    return {
+        "frames": frames,
+        "p50_ms": _percentile(totals, 0.50) * ms,
+        "p95_ms": _percentile(totals, 0.95) * ms,
+        "p99_ms": _percentile(totals, 0.99) * ms,
+        "max_ms": max(totals) * ms,
+        "update_p50_ms": _percentile(update_times, 0.50) * ms,
+        "draw_p50_ms": _percentile(draw_times, 0.50) * ms,
+        "fps": frames / sum(totals),
+        "alloc_bytes_per_frame": statistics.mean(allocated),
+        "entities": len(game.all_sprites),
+    }
+
+
+def run(names=None, frames=300, warmup=30, seed=0):
+    """Runs the given scenarios (all by default) and returns their results."""
+    pygame.font.init()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+        },
+        "scenarios": {
+            name: run_scenario(name, frames, warmup, seed)
+            for name in (names or SCENARIOS)
+        },
+    }
+
+
+def compare(results, baseline, threshold=0.25):
+    """
+    Finds scenarios that got slower than the baseline.
+
+    Args:
+        results (dict): Output of run().
+        baseline (dict): A previous output of run().
+        threshold (float): Allowed slowdown, e.g. 0.25 for 25%.
+
+    Returns:
+        list[str]: One message per regressed metric; empty if none.
+    """
+    regressions = []
+    for name, result in results["scenarios"].items():
+        reference = baseline["scenarios"].get(name)
+        if reference is None:
+            continue
+        if reference["frames"] != result["frames"]:
+            regressions.append(
+                f"{name}: not comparable, baseline measured "
+                f"{reference['frames']} frames"
+            )
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            limit = reference[metric] * (1 + threshold)
+            if result[metric] > limit:
+                regressions.append(
+                    f"{name}: {metric} {result[metric]:.3f} > {limit:.3f} "
+                    f"(baseline {reference[metric]:.3f})"
+                )
+    return regressions
+
+
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Run performance benchmarks.")
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help="comma-separated scenarios to run",
+    )
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--save-baseline", help="write the results as a baseline")
+    parser.add_argument("--baseline", help="compare against this baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed slowdown (0.25=25%%)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Command line entry point. Returns 1 if a scenario regressed."""
+    args = parse_args(argv)
+    names = [name for name in args.scenarios.split(",") if name]
+    results = run(names, args.frames, args.warmup, args.seed)
+
+    for name, result in results["scenarios"].items():
+        print(
+            f"{name:16} p50 {result['p50_ms']:7.3f} ms  "
+            f"p95 {result['p95_ms']:7.3f} ms  p99 {result['p99_ms']:7.3f} ms  "
+            f"{result['fps']:8.1f} fps  "
+            f"{result['alloc_bytes_per_frame'] / 1024:8.1f} KiB/frame"
+        )
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Spatial-hash broadphase for explosion collisions.
+
+Targets are bucketed into a uniform grid by the cell that holds their center.
+Each explosion only looks at the cells its circle can reach, so the cost of a
+frame grows with the number of nearby pairs instead of explosions x targets.
+The narrow-phase test is the same one pygame.sprite.collide_circle uses.
+"""
+
+import math
+from collections import namedtuple
+
+FrameHits = namedtuple("FrameHits", ["meteors", "cities", "bases"])
+
+
+def collision_radius(sprite):
+    """Returns the radius pygame.sprite.collide_circle would use for a sprite."""
+    try:
+        return sprite.radius
+    except AttributeError:
+        rect = sprite.rect
+        return 0.5 * math.sqrt(rect.width**2 + rect.height**2)
+
+
+class SpatialHash:
+    """Uniform grid of circles keyed by the cell containing their center."""
+
+    def __init__(self, cell_size=64):
+        """
+        Initializes an empty grid.
+
+        Args:
+            cell_size (int): Width and height of a grid cell in pixels.
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        self.max_radius = 0
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.cells.values())
+
+    def _cell(self, x, y):
+        return (x // self.cell_size, y // self.cell_size)
+
+    def clear(self):
+        """Removes every entry."""
+        self.cells.clear()
+        self.max_radius = 0
+
+    def insert(self, item, center, radius):
+        """
+        Adds a circle to the grid.
+
+        Args:
+            item: The object returned by queries.
+            center (tuple[int, int]): The center of the circle.
+            radius (float): The radius of the circle.
+        """
+        x, y = center
+        self.cells.setdefault(self._cell(x, y), []).append((item, x, y, radius))
+        self.max_radius = max(self.max_radius, radius)
+
+    def remove(self, item, center):
+        """Removes an item that was inserted at `center`."""
+        entries = self.cells.get(self._cell(*center), [])
+        entries[:] = [entry for entry in entries if entry[0] is not item]
+
+    def query(self, center, radius):
+        """
+        Yields the items whose circles overlap the given circle.
+
+        Args:
+            center (tuple[int, int]): The center of the query circle.
+            radius (float): The radius of the query circle.
+        """
+        x, y = center
+        reach = radius + self.max_radius
+        min_col, min_row = self._cell(math.floor(x - reach), math.floor(y - reach))
+        max_col, max_row = self._cell(math.ceil(x + reach), math.ceil(y + reach))
+        cells = self.cells
+        for col in range(min_col, max_col + 1):
+            for row in range(min_row, max_row + 1):
+                for item, ix, iy, iradius in cells.get((col, row), ()):
+                    dx = ix - x
+                    dy = iy - y
+                    if dx * dx + dy * dy <= (radius + iradius) ** 2:
+                        yield item
+
+
+class CollisionSystem:
+    """Finds every explosion hit of a frame in one pass over the explosions."""
+
+    def __init__(self, cities, bases, cell_size=64):
+        """
+        Initializes the collision grids.
+
+        Cities and bases never move, so they are inserted once and cities are
+        only removed when destroyed. Meteors are rebuilt every frame.
+
+        Args:
+            cities (Iterable[City]): The cities to protect.
+            bases (Iterable[MissileBase]): The missile bases.
+            cell_size (int): Width and height of a grid cell in pixels.
+        """
+        self.cities = SpatialHash(cell_size)
+        self.bases = SpatialHash(cell_size)
+        self.meteors = SpatialHash(cell_size)
+        for city in cities:
+            self.cities.insert(city, city.rect.center, collision_radius(city))
+        for base in bases:
+            self.bases.insert(base, base.rect.center, collision_radius(base))
+
+    def remove_city(self, city):
+        """Removes a destroyed city from the grid."""
+        self.cities.remove(city, city.rect.center)
+
+    def collide(self, explosions, meteors):
+        """
+        Tests every explosion against the meteors, cities and bases.
+
+        Args:
+            explosions (Iterable[Explosion]): The live explosions.
+            meteors (Iterable[EnemyMeteor]): The live meteors.
+
+        Returns:
+            FrameHits: The meteors, cities and bases touched by any explosion,
+            each listed once in the order they were first hit.
+        """
+        grid = self.meteors
+        grid.clear()
+        for meteor in meteors:
+            grid.insert(meteor, meteor.rect.center, collision_radius(meteor))
+
+        # Dicts keep first-hit order while dropping duplicates.
+        hit_meteors = {}
+        hit_cities = {}
+        hit_bases = {}
+        for explosion in explosions:
+            center = explosion.rect.center
+            radius = explosion.radius
+            hit_meteors.update(dict.fromkeys(grid.query(center, radius)))
+            hit_cities.update(dict.fromkeys(self.cities.query(center, radius)))
+            hit_bases.update(dict.fromkeys(self.bases.query(center, radius)))
+        return FrameHits(list(hit_meteors), list(hit_cities), list(hit_bases))
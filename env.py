@@ -0,0 +1,326 @@
+"""
+Vectorized training environment.
+
+VectorEnv steps K headless games in lockstep with a Gym-style API. Actions
+come in as one (K, 3) array of (fire, x, y) rows. Observations, rewards and
+done flags are written in place into NumPy arrays that are allocated once,
+optionally in shared memory so that another process can read them without
+copying:
+
+    env = VectorEnv(8, seed=0, shared=True)
+    obs = env.reset()
+    obs, reward, terminated, truncated, info = env.step(actions)
+    views = attach(env.shm.name, 8)  # in the learner process
+
+Finished games are reset automatically; the observation then shows the new
+game and info["final_score"] holds the score of the one that ended.
+
+NumPy is required; install it with the "fast" extra.
+"""
+
+import itertools
+import random
+from multiprocessing import shared_memory
+
+from simulation import Simulation
+from world import METEOR
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+CITIES = 6
+BASES = 3
+MAX_METEORS = 64
+
+
+def _require_numpy():
+    """Returns the numpy module, or raises ImportError when it is missing."""
+    if np is None:
+        raise ImportError("VectorEnv requires numpy; install the 'fast' extra.")
+    return np
+
+
+def layout(num_envs, max_meteors=MAX_METEORS):
+    """
+    Returns the observation buffer layout.
+
+    Args:
+        num_envs (int): Number of game instances.
+        max_meteors (int): Meteors reported per instance; extra ones are
+            left out.
+
+    Returns:
+        list[tuple[str, tuple[int, ...], str]]: (name, shape, dtype) of every
+        array, in buffer order.
+    """
+    K = num_envs
+    return [
+        ("meteors", (K, max_meteors, 4), "float32"),  # x, y, vx, vy
+        ("meteor_count", (K,), "int32"),
+        ("cities", (K, CITIES), "uint8"),
+        ("bases", (K, BASES), "uint8"),
+        ("ammo", (K, BASES), "int16"),
+        ("level", (K,), "int32"),
+        ("score", (K,), "int64"),
+        ("reward", (K,), "float32"),
+        ("terminated", (K,), "bool"),
+        ("truncated", (K,), "bool"),
+    ]
+
+
+def _views(buffer, fields):
+    """Maps every field of a layout onto `buffer` without copying."""
+    np = _require_numpy()
+    views = {}
+    offset = 0
+    for name, shape, dtype in fields:
+        offset = -(-offset // 8) * 8  # 8-byte aligned
+        array = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        views[name] = array
+        offset += array.nbytes
+    return views
+
+
+def buffer_size(num_envs, max_meteors=MAX_METEORS):
+    """Bytes needed for the observation buffer."""
+    np = _require_numpy()
+    size = 0
+    for _, shape, dtype in layout(num_envs, max_meteors):
+        size = -(-size // 8) * 8 + int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return size
+
+
+def attach(name, num_envs, max_meteors=MAX_METEORS):
+    """
+    Opens the observations of a shared VectorEnv from another process.
+
+    Args:
+        name (str): VectorEnv.shm.name of the environment.
+        num_envs (int): Its number of instances.
+        max_meteors (int): Its max_meteors.
+
+    Returns:
+        tuple[SharedMemory, dict[str, numpy.ndarray]]: The shared memory
+        block (close it when done) and the arrays, as in VectorEnv.buffers.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    _require_numpy()
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, _views(shm.buf, layout(num_envs, max_meteors))
+
+
+def _left_to_right(sprites):
+    """Sorts cities or bases by their position on screen."""
+    return sorted(sprites, key=lambda sprite: sprite.rect.x)
+
+
+class VectorEnv:
+    """K games stepped in lockstep with batched actions."""
+
+    def __init__(
+        self,
+        num_envs,
+        seed=0,
+        max_meteors=MAX_METEORS,
+        shared=False,
+        max_steps=None,
+        frame_skip=1,
+        step_rate=None,
+        vectorized=False,
+    ):
+        """
+        Creates the games and the observation buffers.
+
+        Args:
+            num_envs (int): Number of game instances.
+            seed (int | Sequence[int]): Seed of every instance, or a base
+                seed; instance i then uses seed + i. Games started by
+                auto-reset take their seeds from a generator seeded with
+                the instance's seed.
+            max_meteors (int): Meteors reported per instance.
+            shared (bool): Put the buffers in shared memory; see attach().
+            max_steps (int | None): Truncate games after this many steps.
+            frame_skip (int): Simulation steps per step() call; the action
+                is applied before the first one and rewards are summed.
+            step_rate (int | None): Step rate of the simulations.
+            vectorized (bool): Run the simulations on NumPy EntityWorlds.
+                Plain sprites are faster until a game holds hundreds of
+                entities.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        _require_numpy()
+        self.num_envs = num_envs
+        self.max_meteors = max_meteors
+        self.max_steps = max_steps
+        self.frame_skip = frame_skip
+        self.step_rate = step_rate
+        self.vectorized = vectorized
+        self.initial_seeds = self._seed_list(seed)
+        self.seeds = list(self.initial_seeds)
+
+        self.shm = None
+        if shared:
+            self.shm = shared_memory.SharedMemory(
+                create=True, size=buffer_size(num_envs, max_meteors)
+            )
+            buffer = self.shm.buf
+        else:
+            buffer = bytearray(buffer_size(num_envs, max_meteors))
+        self.buffers = _views(buffer, layout(num_envs, max_meteors))
+        self.observation = {
+            name: self.buffers[name]
+            for name in ("meteors", "meteor_count", "cities", "bases", "ammo", "level")
+        }
+        self.reset()
+
+    def _simulation(self, seed):
+        """Creates the game of one instance."""
+        return Simulation(
+            seed=seed, vectorized=self.vectorized, step_rate=self.step_rate
+        )
+
+    def _new_game(self, i, seed):
+        """Starts a new game in instance `i`."""
+        sim = self.games[i] = self._simulation(seed)
+        self.seeds[i] = seed
+        self._cities[i] = _left_to_right(sim.cities)
+        self._bases[i] = _left_to_right(sim.bases)
+        self._steps[i] = 0
+        self._observe(i)
+
+    def _seed_list(self, seed):
+        """Expands a base seed to one seed per instance."""
+        if isinstance(seed, int):
+            return [seed + i for i in range(self.num_envs)]
+        if len(seed) != self.num_envs:
+            raise ValueError("need one seed per instance")
+        return list(seed)
+
+    def reset(self, seed=None):
+        """
+        Starts a new game in every instance.
+
+        Args:
+            seed (int | Sequence[int] | None): New seeds, as in the
+                constructor; by default the constructor's seeds are reused.
+
+        Returns:
+            dict[str, numpy.ndarray]: The observation arrays.
+        """
+        if seed is not None:
+            self.initial_seeds = self._seed_list(seed)
+        self._seed_streams = [random.Random(s) for s in self.initial_seeds]
+        self.games = [self._simulation(s) for s in self.initial_seeds]
+        self.seeds = list(self.initial_seeds)
+        self._cities = [_left_to_right(sim.cities) for sim in self.games]
+        self._bases = [_left_to_right(sim.bases) for sim in self.games]
+        self._steps = [0] * self.num_envs
+        for i in range(self.num_envs):
+            self._observe(i)
+        self.episodes = [0] * self.num_envs
+        self.buffers["reward"][:] = 0
+        self.buffers["terminated"][:] = False
+        self.buffers["truncated"][:] = False
+        return self.observation
+
+    def step(self, actions):
+        """
+        Applies one action per instance and advances every game.
+
+        Args:
+            actions (numpy.ndarray): (K, 3) rows of (fire, x, y); a row fires
+                a missile at (x, y) when fire is non-zero.
+
+        Returns:
+            tuple: (observation, reward, terminated, truncated, info). The
+            arrays are the preallocated buffers, overwritten by the next call.
+            info["final_score"] maps instances whose game ended to its score.
+        """
+        actions = _require_numpy().asarray(actions)
+        fire = actions[:, 0].tolist()
+        xs = actions[:, 1].tolist()
+        ys = actions[:, 2].tolist()
+        rewards = []
+        ended = []
+        cut = []
+        final_scores = {}
+        for i, sim in enumerate(self.games):
+            before = sim.score
+            if fire[i]:
+                sim.fire((xs[i], ys[i]))
+            for _ in range(self.frame_skip):
+                sim.step()
+                if sim.game_over:
+                    break
+            self._steps[i] += 1
+            rewards.append(sim.score - before)
+            over = sim.game_over
+            truncated = (
+                not over
+                and self.max_steps is not None
+                and self._steps[i] >= self.max_steps
+            )
+            ended.append(over)
+            cut.append(truncated)
+            if over or truncated:
+                final_scores[i] = sim.score
+                self.episodes[i] += 1
+                self._new_game(i, self._seed_streams[i].getrandbits(31))
+            else:
+                self._observe(i)
+
+        self.buffers["reward"][:] = rewards
+        self.buffers["terminated"][:] = ended
+        self.buffers["truncated"][:] = cut
+        return (
+            self.observation,
+            self.buffers["reward"],
+            self.buffers["terminated"],
+            self.buffers["truncated"],
+            {"final_score": final_scores},
+        )
+
+    def _observe(self, i):
+        """Writes instance `i`'s state into the observation buffers."""
+        sim = self.games[i]
+        buffers = self.buffers
+        meteors = buffers["meteors"][i]
+        if sim.world is not None:
+            slots = sim.world.slots(METEOR)[: self.max_meteors]
+            count = len(slots)
+            meteors[:count, 0:2] = sim.world.pos[slots]
+            meteors[:count, 2:4] = sim.world.vel[slots]
+        else:
+            rows = [
+                (m.current_pos.x, m.current_pos.y, m.velocity.x, m.velocity.y)
+                for m in itertools.islice(sim.enemy_meteors, self.max_meteors)
+            ]
+            count = len(rows)
+            if rows:
+                meteors[:count] = rows
+        meteors[count:] = 0
+        buffers["meteor_count"][i] = count
+        buffers["cities"][i] = [city.alive() for city in self._cities[i]]
+        buffers["bases"][i] = [base.is_alive for base in self._bases[i]]
+        buffers["ammo"][i] = [base.ammo for base in self._bases[i]]
+        buffers["level"][i] = sim.level
+        buffers["score"][i] = sim.score
+
+    def close(self):
+        """
+        Releases the shared memory, if any. Drop every reference to the
+        observation arrays first; shared memory cannot be closed while
+        arrays still point into it.
+        """
+        if self.shm is not None:
+            self.buffers = {}
+            self.observation = {}
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
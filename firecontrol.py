@@ -0,0 +1,232 @@
+"""
+Batched intercept solver for bots and assisted aiming.
+
+For every live meteor and every usable base, solve() works out where a
+missile has to be sent so that its explosion catches the meteor, all as
+NumPy array operations over (meteor, base) pairs. plan() turns that into a
+ranked list of shots for a Simulation.
+
+The solver follows the game's own rules step by step: a missile explodes
+on the step its distance to the target drops below its speed, the explosion
+starts at radius 0 and grows by the expand speed each step, and a meteor is
+destroyed when it lies within the explosion radius plus its own collision
+radius before it lands. Simulation.fire() always uses the usable base
+closest to the aim point (see find_closest_base), so a solution only counts
+for the base that would actually fire it.
+
+NumPy is optional; install it with the "fast" extra to use this module.
+"""
+
+import collections
+import math
+
+from settings import (
+    EXPLOSION_EXPAND_SPEED,
+    EXPLOSION_LIFESPAN,
+    PLAYER_EXPLOSION_RADIUS,
+    PLAYER_MISSILE_SPEED,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+FiringSolution = collections.namedtuple(
+    "FiringSolution", ["meteor", "base", "aim", "intercept_step", "impact_step"]
+)
+
+# Collision radius of a 10x10 meteor, as in collision.collision_radius().
+METEOR_RADIUS = 0.5 * math.sqrt(10**2 + 10**2)
+
+
+def _require_numpy():
+    """Returns the numpy module, or raises ImportError when it is missing."""
+    if np is None:
+        raise ImportError("firecontrol requires numpy; install the 'fast' extra.")
+    return np
+
+
+def _flight_steps(aim, launchers, speed):
+    """Steps until a missile from each launcher explodes at `aim`."""
+    np = _require_numpy()
+    offset = aim - launchers[None, :, :]
+    distance = np.hypot(offset[..., 0], offset[..., 1])
+    return np.maximum(1, np.floor(distance / speed))
+
+
+def solve(
+    positions,
+    velocities,
+    ground,
+    launchers,
+    centers,
+    missile_speed=PLAYER_MISSILE_SPEED,
+    expand_speed=EXPLOSION_EXPAND_SPEED,
+    max_radius=PLAYER_EXPLOSION_RADIUS,
+    lifespan=EXPLOSION_LIFESPAN,
+    meteor_radius=METEOR_RADIUS,
+):
+    """
+    Solves the intercept of every meteor from every base.
+
+    Args:
+        positions (numpy.ndarray): (n, 2) meteor positions.
+        velocities (numpy.ndarray): (n, 2) meteor velocities per step.
+        ground (numpy.ndarray): (n,) target y at which each meteor lands.
+        launchers (numpy.ndarray): (m, 2) points missiles start from.
+        centers (numpy.ndarray): (m, 2) base centers, used to find the base
+            that fires at a given aim point.
+        missile_speed (float): Player missile pixels per step.
+        expand_speed (float): Explosion growth per step.
+        max_radius (int): Explosion radius at which it disappears.
+        lifespan (int): Explosion lifespan in steps.
+        meteor_radius (float): Meteor collision radius.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        aim points (n, m, 2) as integers, intercept steps (n, m) counted
+        from now with infinity where the base cannot hit the meteor, and
+        impact steps (n,) at which each meteor lands.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    np = _require_numpy()
+    P = positions[:, None, :]
+    V = velocities[:, None, :]
+    D = P - launchers[None, :, :]
+
+    # Continuous intercept: |D + V t| = s t.
+    a = (V**2).sum(axis=2) - missile_speed**2
+    b = 2 * (D * V).sum(axis=2)
+    c = (D**2).sum(axis=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root = np.sqrt(b**2 - 4 * a * c)
+        t1 = (-b - root) / (2 * a)
+        t2 = (-b + root) / (2 * a)
+    t1 = np.where(t1 > 0, t1, np.inf)
+    t2 = np.where(t2 > 0, t2, np.inf)
+    t = np.fmin(t1, t2)
+    t = np.where(np.isfinite(t), t, 0.0)
+
+    # Snap to whole steps: aim where the meteor is on the step the missile
+    # arrives, with pixel targets as fire() uses them.
+    aim = np.trunc(P + V * t[:, :, None])
+    steps = _flight_steps(aim, launchers, missile_speed)
+    aim = np.trunc(P + V * steps[:, :, None])
+    steps = _flight_steps(aim, launchers, missile_speed)
+
+    # Only the base closest to the aim point fires, and the missile must
+    # stay on screen to reach it.
+    offsets = aim[:, :, None, :] - centers[None, None, :, :]
+    closest = np.hypot(offsets[..., 0], offsets[..., 1]).argmin(axis=2)
+    usable = (
+        (closest == np.arange(len(centers))[None, :])
+        & (aim[..., 0] >= 0)
+        & (aim[..., 0] < SCREEN_WIDTH)
+        & (aim[..., 1] >= 0)
+        & (aim[..., 1] < SCREEN_HEIGHT)
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        impact = np.ceil((ground - positions[:, 1]) / velocities[:, 1])
+    impact = np.where(velocities[:, 1] > 0, np.maximum(1, impact), np.inf)
+
+    # Test the usable pairs against the explosion radius j steps after the
+    # missile arrives, for every step the explosion lives.
+    meteor_index, base_index = np.nonzero(usable)
+    last = min(lifespan - 1, int(max_radius // expand_speed)) if expand_speed else 0
+    j = np.arange(last + 1)
+    when = steps[meteor_index, base_index][:, None] + j
+    p = positions[meteor_index]
+    v = velocities[meteor_index]
+    target = aim[meteor_index, base_index]
+    dx = np.trunc(p[:, 0, None] + v[:, 0, None] * when) - target[:, 0, None]
+    dy = np.trunc(p[:, 1, None] + v[:, 1, None] * when) - target[:, 1, None]
+    reach = j * expand_speed + meteor_radius
+    hit = (dx * dx + dy * dy <= reach * reach) & (when < impact[meteor_index, None])
+
+    intercept = np.full(steps.shape, np.inf)
+    intercept[meteor_index, base_index] = np.where(
+        hit.any(axis=1), when[:, 0] + hit.argmax(axis=1), np.inf
+    )
+    return aim.astype(int), intercept, impact
+
+
+def plan(simulation):
+    """
+    Ranks the shots that intercept the simulation's live meteors.
+
+    Args:
+        simulation (Simulation): The game to aim for.
+
+    Returns:
+        list[FiringSolution]: One shot per meteor that can be hit, most
+        urgent (soonest to land) first. Each shot uses the base that intercepts
+        earliest; no base is given more shots than it has ammo.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    np = _require_numpy()
+    simulation.sync_views()
+    meteors = list(simulation.enemy_meteors)
+    bases = [b for b in simulation.bases if not b.is_destroyed() and b.ammo > 0]
+    if not meteors or not bases:
+        return []
+
+    state = np.array(
+        [
+            (
+                m.current_pos.x,
+                m.current_pos.y,
+                m.velocity.x,
+                m.velocity.y,
+                m.target_pos[1],
+            )
+            for m in meteors
+        ]
+    )
+    aim, intercept, impact = solve(
+        state[:, 0:2],
+        state[:, 2:4],
+        state[:, 4],
+        np.array([b.rect.midtop for b in bases], dtype=float),
+        np.array([b.rect.center for b in bases], dtype=float),
+        simulation.per_step(PLAYER_MISSILE_SPEED),
+        simulation.per_step(EXPLOSION_EXPAND_SPEED),
+        PLAYER_EXPLOSION_RADIUS,
+        simulation.steps_for(EXPLOSION_LIFESPAN),
+    )
+
+    ranked = np.argsort(intercept, axis=1, kind="stable")
+    best = np.take_along_axis(intercept, ranked, axis=1)
+    feasible = np.isfinite(best[:, 0])
+    order = np.lexsort((best[:, 0], impact))
+    order = order[feasible[order]].tolist()
+    ranked = ranked.tolist()
+    best = best.tolist()
+    aim = aim.tolist()
+
+    ammo = [base.ammo for base in bases]
+    solutions = []
+    for i in order:
+        for k, step in zip(ranked[i], best[i]):
+            if step == math.inf:
+                break
+            if ammo[k]:
+                ammo[k] -= 1
+                solutions.append(
+                    FiringSolution(
+                        meteors[i],
+                        bases[k],
+                        tuple(aim[i][k]),
+                        int(step),
+                        int(impact[i]),
+                    )
+                )
+                break
+    return solutions
@@ -3,99 +3,97 @@ Game class for Missile Command.
 """
 
 import pygame
-import math
-from settings import (
-    SCREEN_WIDTH,
-    SCREEN_HEIGHT,
-    WHITE,
-    SCORE_PER_METEOR,
-    BONUS_PER_CITY,
-    BONUS_PER_AMMO,
-)
-from sprites import City, MissileBase, EnemyMeteor, Explosion
-import random
+from hud import HUD
+from quality import LEVELS
+from simulation import Simulation
+from sprites import preload_simple_explosion_frames, simplified
+from trails import TrailLayer
+from world import MISSILE, METEOR
 
 
 class Game:
-    """Manages game state, sprites, and game loop."""
-
-    def __init__(self, screen):
-        """Initialize the game."""
+    """Renders a Simulation and feeds it player input."""
+
+    def __init__(self, screen, simulation=None, trails=False):
+        """
+        Initialize the game.
+
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+            simulation (Simulation | None): The game state to render. A new
+                one is created when omitted.
+            trails (bool): Draw contrails behind missiles and meteors. The
+                trail layer is drawn first and covers the whole screen.
+        """
         self.screen = screen
-        self.all_sprites = pygame.sprite.Group()
-        self.cities = pygame.sprite.Group()
-        self.bases = pygame.sprite.Group()
-        self.player_missiles = pygame.sprite.Group()
-        self.enemy_meteors = pygame.sprite.Group()
-        self.explosions = pygame.sprite.Group()
-
-        self.score = 0
-        self.game_over = False
-        pygame.font.init()
-        self.font = pygame.font.Font(None, 36)
-
-        self.level = 0
-        self.meteors_to_spawn_this_level = 0
-        self.meteors_spawned_this_level = 0
-        self._setup_initial_sprites()
-        self.meteor_spawn_timer = 0
-        self.meteor_spawn_interval = 60
-        self._start_new_level()
-
-    def _start_new_level(self):
-        """Initializes parameters for a new game level."""
-        self.level += 1
-        self.meteors_to_spawn_this_level = 5 + (self.level * 2)
-        self.meteors_spawned_this_level = 0
-        self.meteor_spawn_interval = max(20, 60 - (self.level * 5))
-        print(
-            f"Starting Level {self.level} with {self.meteors_to_spawn_this_level} meteors."
-        )
-
-    def _spawn_meteor(self):
-        """Spawns a single enemy meteor."""
-        if self.meteors_spawned_this_level < self.meteors_to_spawn_this_level:
-            start_x = random.randint(0, SCREEN_WIDTH)
-            start_pos = (start_x, 0)
-
-            all_targets = list(self.cities) + [
-                b for b in self.bases if not b.is_destroyed()
-            ]
-            if not all_targets:
-                return
-
-            target = random.choice(all_targets)
-            target_pos = target.rect.center
-
-            speed = random.uniform(1 + (self.level * 0.2), 3 + (self.level * 0.2))
-
-            EnemyMeteor(
-                start_pos, target_pos, speed, self.all_sprites, self.enemy_meteors
-            )
-            self.meteors_spawned_this_level += 1
-
-    def _setup_initial_sprites(self):
-        """Create initial cities and missile bases."""
-        ground_level = SCREEN_HEIGHT - 50
-
-        # Setup missile bases
-        base_positions = [100, SCREEN_WIDTH // 2, SCREEN_WIDTH - 100]
-        for pos in base_positions:
-            MissileBase(
-                pos - 20, ground_level, 40, 20, 10, self.all_sprites, self.bases
-            )
-
-        # Setup cities
-        city_positions = []
-        # Cities to the right of the left base
-        for i in range(3):
-            city_positions.append(base_positions[0] + 50 + i * 60)
-        # Cities to the left of the right base
-        for i in range(3):
-            city_positions.append(base_positions[2] - 90 - i * 60)
-
-        for pos in city_positions:
-            City(pos, ground_level + 5, 50, 30, self.all_sprites, self.cities)
+        self.simulation = simulation or Simulation(verbose=True)
+        self._trail_layer = TrailLayer(screen.get_size()) if trails else None
+        # The trail layer while the quality level draws trails, else None.
+        self.trails = self._trail_layer
+        self.quality = LEVELS[0]
+        self._hud_cache = None
+
+        # The font and HUD are created on first use, so a Game that is never
+        # drawn (tests, tools) does not pay for them. Explosion frames are
+        # likewise rendered when the first explosion asks for them.
+        self._font = None
+        self._hud = None
+        # Draw the simulation profiler's frame-time graph, if it has one.
+        self.show_profiler = False
+        # Best recorded scores, listed on the game over screen.
+        self.leaderboard: list[int] = []
+
+    @property
+    def font(self):
+        """The HUD font, initializing pygame.font on first use."""
+        if self._font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self._font = pygame.font.Font(None, 36)
+        return self._font
+
+    @property
+    def hud(self):
+        """The HUD, created on first use."""
+        if self._hud is None:
+            self._hud = HUD(self.font)
+        return self._hud
+
+    @property
+    def all_sprites(self):
+        return self.simulation.all_sprites
+
+    @property
+    def cities(self):
+        return self.simulation.cities
+
+    @property
+    def bases(self):
+        return self.simulation.bases
+
+    @property
+    def player_missiles(self):
+        return self.simulation.player_missiles
+
+    @property
+    def enemy_meteors(self):
+        return self.simulation.enemy_meteors
+
+    @property
+    def explosions(self):
+        return self.simulation.explosions
+
+    @property
+    def score(self):
+        return self.simulation.score
+
+    @property
+    def level(self):
+        return self.simulation.level
+
+    @property
+    def game_over(self):
+        return self.simulation.game_over
 
     def handle_events(self, events):
         """Handle all game events."""
@@ -104,125 +102,180 @@ class Game:
 
         for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                target_pos = event.pos
-                closest_base = self._find_closest_base(target_pos)
-                if closest_base:
-                    closest_base.fire_missile(
-                        target_pos, self.all_sprites, self.player_missiles
-                    )
+                self.simulation.fire(event.pos)
 
     def _find_closest_base(self, target_pos):
         """Finds the closest active missile base to the target position."""
-        closest_base = None
-        min_distance = float("inf")
-
-        for base in self.bases:
-            if not base.is_destroyed() and base.ammo > 0:
-                distance = math.hypot(
-                    base.rect.centerx - target_pos[0], base.rect.centery - target_pos[1]
-                )
-                if distance < min_distance:
-                    min_distance = distance
-                    closest_base = base
-        return closest_base
+        return self.simulation.find_closest_base(target_pos)
 
     def update(self):
-        """Update all game sprites."""
+        """Advance the simulation by one step."""
+        self.simulation.step()
+
+    def set_quality(self, quality):
+        """
+        Changes how frames are drawn; the simulation is not affected.
+
+        Args:
+            quality (quality.Quality): The new level.
+        """
+        if quality.trails and self.trails is None and self._trail_layer is not None:
+            # Trails were not followed while hidden; start over from the
+            # launch points.
+            self._trail_layer.clear()
+        self.trails = self._trail_layer if quality.trails else None
+        if quality.simple_explosions:
+            preload_simple_explosion_frames()
+        self.quality = quality
+        self._hud_cache = None
+
+    def draw_items(self, alpha=1.0):
+        """
+        Returns everything to draw this frame, in drawing order.
+
+        Args:
+            alpha (float): How far the frame lies between the previous and
+                the current simulation step, from 0.0 to 1.0. Moving sprites
+                are drawn at the interpolated position.
+
+        Returns:
+            list[tuple[pygame.Surface, pygame.Rect | tuple[int, int]]]:
+            (surface, destination) pairs as accepted by Surface.blits.
+        """
+        profiler = self.simulation.profiler
+        if profiler is not None:
+            profiler.start()
+        self.simulation.sync_views()
+        lag = 1.0 - alpha if self.quality.interpolate else 0.0
+        simple = self.quality.simple_explosions
+        items = []
+        if self.trails is not None:
+            self.trails.update(self.simulation, lag)
+            items.append((self.trails.surface, (0, 0)))
+        for sprite in self.all_sprites:
+            velocity = getattr(sprite, "velocity", None)
+            if velocity is None or not lag:
+                image = simplified(sprite.image) if simple else sprite.image
+                items.append((image, sprite.rect))
+            else:
+                # Projectiles move in straight lines, so the position between
+                # steps follows from the velocity alone.
+                x = sprite.current_pos.x - velocity.x * lag
+                y = sprite.current_pos.y - velocity.y * lag
+                items.append((sprite.image, sprite.image.get_rect(center=(x, y))))
+        if profiler is not None:
+            profiler.mark("sprites")
+        return items + self.hud_items()
+
+    def draw_batches(self, alpha=1.0):
+        """
+        Returns the sprites to draw this frame, grouped by image.
+
+        Sprites sharing an image (every meteor, every missile, explosions of
+        the same size and age) end up in one batch that can be drawn with a
+        single Surface.blits call. In vectorized mode missiles and meteors
+        are placed straight from the world arrays without syncing their
+        sprites.
+
+        Batches come in the order their image first appears, so sprites
+        with different images that overlap may stack differently than in
+        draw_items().
+
+        Args:
+            alpha (float): Interpolation between simulation steps, see
+                draw_items().
+
+        Returns:
+            list[tuple[pygame.Surface, list]]: (image, top-left corners)
+            pairs. The HUD is not included; see hud_items().
+        """
+        profiler = self.simulation.profiler
+        if profiler is not None:
+            profiler.start()
+        world = self.simulation.world
+        lag = 1.0 - alpha if self.quality.interpolate else 0.0
+        simple = self.quality.simple_explosions
+        batches = {}
+        if self.trails is not None:
+            self.trails.update(self.simulation, lag)
+            batches[self.trails.surface] = [(0, 0)]
+        if world is None:
+            sprites = self.all_sprites
+        else:
+            world.sync_views(projectiles=False)
+            sprites = [*self.cities, *self.bases]
+            for kind in (MISSILE, METEOR):
+                for sprite, dests in world.draw_batches(kind, lag):
+                    batches.setdefault(sprite.image, []).extend(dests)
+            sprites += self.explosions
+        for sprite in sprites:
+            image = simplified(sprite.image) if simple else sprite.image
+            velocity = getattr(sprite, "velocity", None)
+            if velocity is None or not lag:
+                dest = sprite.rect.topleft
+            else:
+                x = sprite.current_pos.x - velocity.x * lag
+                y = sprite.current_pos.y - velocity.y * lag
+                dest = image.get_rect(center=(x, y)).topleft
+            batch = batches.get(image)
+            if batch is None:
+                batches[image] = batch = []
+            batch.append(dest)
+        if profiler is not None:
+            profiler.mark("sprites")
+        return list(batches.items())
+
+    def hud_items(self):
+        """
+        Returns the HUD, the game over screen and the profiler overlay.
+
+        Returns:
+            list[tuple[pygame.Surface, tuple[int, int] | pygame.Rect]]:
+            (surface, destination) pairs, drawn after the sprites.
+        """
+        profiler = self.simulation.profiler
+        interval = self.quality.hud_interval
+        if interval > 1:
+            # Reuse the HUD of a recent step; the score may show late.
+            frame = self.simulation.frame
+            cache = self._hud_cache
+            if cache is None or not 0 <= frame - cache[0] < interval:
+                cache = self._hud_cache = (frame, self.hud.items(self.simulation))
+            items = list(cache[1])
+        else:
+            items = self.hud.items(self.simulation)
         if self.game_over:
-            return
-
-        self.meteor_spawn_timer += 1
-        if self.meteor_spawn_timer >= self.meteor_spawn_interval:
-            self._spawn_meteor()
-            self.meteor_spawn_timer = 0
-
-        self.all_sprites.update()
-
-        for missile in self.player_missiles:
-            if missile.is_at_target():
-                Explosion(
-                    missile.target_pos, 50, 2, 30, self.all_sprites, self.explosions
-                )
-                missile.kill()
-
-        for meteor in self.enemy_meteors:
-            if meteor.has_reached_target():
-                Explosion(
-                    meteor.rect.center, 30, 2, 30, self.all_sprites, self.explosions
-                )
-                meteor.kill()
-
-        for explosion in self.explosions:
-            destroyed_meteors = pygame.sprite.spritecollide(
-                explosion, self.enemy_meteors, True, pygame.sprite.collide_circle
+            items += self.hud.game_over_items(
+                self.score, self.leaderboard, dim=self.quality.overlay_alpha
             )
-            if destroyed_meteors:
-                self.score += SCORE_PER_METEOR * len(destroyed_meteors)
-
-        pygame.sprite.groupcollide(
-            self.explosions, self.cities, False, True, pygame.sprite.collide_circle
-        )
-        collided_bases = pygame.sprite.groupcollide(
-            self.explosions, self.bases, False, False, pygame.sprite.collide_circle
-        )
-        for _, bases in collided_bases.items():
-            for base in bases:
-                base.destroy()
-
-        if (
-            self.meteors_spawned_this_level == self.meteors_to_spawn_this_level
-            and not self.enemy_meteors
-        ):
-            for city in self.cities:
-                self.score += BONUS_PER_CITY
-            for base in self.bases:
-                if not base.is_destroyed():
-                    self.score += BONUS_PER_AMMO * base.ammo
-
-            self._start_new_level()
-
-        if not self.cities:
-            self.game_over = True
-
-    def _draw_ui(self):
-        """Draws the user interface (score, ammo, etc.)."""
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (10, 10))
-
-        cities_text = self.font.render(f"Cities: {len(self.cities)}", True, WHITE)
-        self.screen.blit(cities_text, (SCREEN_WIDTH - cities_text.get_width() - 10, 10))
-
-        for base in self.bases:
-            if not base.is_destroyed():
-                ammo_text = self.font.render(f"{base.ammo}", True, WHITE)
-                ammo_pos = (
-                    base.rect.centerx - ammo_text.get_width() // 2,
-                    base.rect.bottom + 5,
+        if profiler is not None:
+            if self.show_profiler:
+                overlay = profiler.overlay()
+                items.append(
+                    (
+                        overlay,
+                        overlay.get_rect(
+                            topright=(self.screen.get_width() - 10, 50)
+                        ).topleft,
+                    )
                 )
-                self.screen.blit(ammo_text, ammo_pos)
-
-    def _draw_game_over_screen(self):
-        """Draws the game over screen."""
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.screen.blit(overlay, (0, 0))
-
-        game_over_text = self.font.render("GAME OVER", True, WHITE)
-        text_rect = game_over_text.get_rect(
-            center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 40)
-        )
-        self.screen.blit(game_over_text, text_rect)
-
-        final_score_text = self.font.render(f"Final Score: {self.score}", True, WHITE)
-        score_rect = final_score_text.get_rect(
-            center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 10)
-        )
-        self.screen.blit(final_score_text, score_rect)
-
-    def draw(self):
-        """Draw all sprites to the screen."""
-        self.all_sprites.draw(self.screen)
-        self._draw_ui()
-
-        if self.game_over:
-            self._draw_game_over_screen()
+            profiler.mark("hud")
+        return items
+
+    def draw(self, alpha=1.0):
+        """
+        Draw all sprites to the screen.
+
+        Args:
+            alpha (float): Interpolation between simulation steps, see
+                draw_items().
+
+        Returns:
+            list: The (surface, destination) pairs that were drawn.
+        """
+        items = self.draw_items(alpha)
+        self.screen.blits(items, doreturn=False)
+        profiler = self.simulation.profiler
+        if profiler is not None:
+            profiler.mark("blit")
+        return items
@@ -0,0 +1,193 @@
+"""
+HUD rendering for Missile Command.
+
+Text surfaces are cached and only rebuilt when the value they show changes.
+Numbers are composed from a strip of pre-rendered digit glyphs, so a score
+change costs a few blits instead of a font rasterization.
+"""
+
+import pygame
+
+from settings import SCREEN_HEIGHT, SCREEN_WIDTH, WHITE
+
+DIGITS = "0123456789-"
+
+
+class GlyphStrip:
+    """Pre-rendered digit glyphs used to compose numbers."""
+
+    def __init__(self, font, color=WHITE):
+        """
+        Renders every digit once.
+
+        Args:
+            font (pygame.font.Font): The font to render with.
+            color (tuple[int, int, int]): The text color.
+        """
+        self.glyphs = {ch: font.render(ch, True, color) for ch in DIGITS}
+        self.height = max(glyph.get_height() for glyph in self.glyphs.values())
+
+    def width(self, text):
+        """Returns the width of `text` composed from glyphs."""
+        return sum(self.glyphs[ch].get_width() for ch in text)
+
+    def draw(self, surface, text, pos):
+        """
+        Blits the glyphs of `text` onto `surface`.
+
+        Args:
+            surface (pygame.Surface): The surface to draw on.
+            text (str): Digits to draw.
+            pos (tuple[int, int]): The top-left corner of the first glyph.
+        """
+        x, y = pos
+        for ch in text:
+            glyph = self.glyphs[ch]
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+
+
+class HUD:
+    """Draws the score, city count, ammo and game over screen."""
+
+    def __init__(self, font, color=WHITE):
+        """
+        Initializes the HUD.
+
+        Args:
+            font (pygame.font.Font): The font to render with.
+            color (tuple[int, int, int]): The text color.
+        """
+        self.font = font
+        self.color = color
+        self.digits = GlyphStrip(font, color)
+        self._texts = {}
+        self._labels = {}
+        self._overlay = None
+
+    def text(self, text):
+        """Returns a cached rendering of a fixed string."""
+        surface = self._texts.get(text)
+        if surface is None:
+            surface = self.font.render(text, True, self.color)
+            self._texts[text] = surface
+        return surface
+
+    def label(self, key, prefix, value):
+        """
+        Returns `prefix` followed by `value`, rebuilt only when it changes.
+
+        Args:
+            key (Hashable): Identifies the HUD element.
+            prefix (str): Fixed text in front of the number.
+            value (int): The number to show.
+        """
+        cached = self._labels.get(key)
+        if cached is not None and cached[0] == value:
+            return cached[1]
+
+        digits = str(value)
+        prefix_surface = self.text(prefix) if prefix else None
+        prefix_width = prefix_surface.get_width() if prefix_surface else 0
+        height = max(
+            self.digits.height, prefix_surface.get_height() if prefix_surface else 0
+        )
+        surface = pygame.Surface(
+            (prefix_width + self.digits.width(digits), height), pygame.SRCALPHA
+        )
+        if prefix_surface:
+            surface.blit(prefix_surface, (0, 0))
+        self.digits.draw(surface, digits, (prefix_width, 0))
+        self._labels[key] = (value, surface)
+        return surface
+
+    def items(self, simulation):
+        """
+        Returns the HUD as (surface, position) pairs.
+
+        Args:
+            simulation (Simulation): The game state to show.
+
+        Returns:
+            list[tuple[pygame.Surface, tuple[int, int]]]: Blit arguments.
+        """
+        bases = [
+            (id(base), base.ammo, base.rect.centerx, base.rect.bottom)
+            for base in simulation.bases
+            if not base.is_destroyed()
+        ]
+        return self.status_items(simulation.score, len(simulation.cities), bases)
+
+    def status_items(self, score, cities, bases):
+        """
+        Returns the HUD for plain values, e.g. from a render snapshot.
+
+        Args:
+            score (int): The score.
+            cities (int): Cities left.
+            bases (Iterable[tuple[Hashable, int, int, int]]): (key, ammo,
+                centerx, bottom) of every live base.
+
+        Returns:
+            list[tuple[pygame.Surface, tuple[int, int]]]: Blit arguments.
+        """
+        score_text = self.label("score", "Score: ", score)
+        items = [(score_text, (10, 10))]
+
+        cities_text = self.label("cities", "Cities: ", cities)
+        items.append((cities_text, (SCREEN_WIDTH - cities_text.get_width() - 10, 10)))
+
+        for key, ammo, centerx, bottom in bases:
+            ammo_text = self.label(("ammo", key), "", ammo)
+            items.append(
+                (ammo_text, (centerx - ammo_text.get_width() // 2, bottom + 5))
+            )
+        return items
+
+    def game_over_items(self, score, leaderboard=(), dim=True):
+        """
+        Returns the game over overlay and text as (surface, position) pairs.
+
+        Args:
+            score (int): The final score.
+            leaderboard (Sequence[int]): Best recorded scores, listed under
+                the final score.
+            dim (bool): Dim the game with a translucent overlay. Blending it
+                costs a full-screen alpha blit.
+        """
+        if self._overlay is None:
+            self._overlay = pygame.Surface(
+                (SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA
+            )
+            self._overlay.fill((0, 0, 0, 150))
+
+        game_over_text = self.text("GAME OVER")
+        text_rect = game_over_text.get_rect(
+            center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 40)
+        )
+        final_score_text = self.label("final_score", "Final Score: ", score)
+        score_rect = final_score_text.get_rect(
+            center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 10)
+        )
+        items = [
+            (game_over_text, text_rect.topleft),
+            (final_score_text, score_rect.topleft),
+        ]
+        if dim:
+            items.insert(0, (self._overlay, (0, 0)))
+        y = score_rect.bottom + 20
+        for place, best in enumerate(leaderboard, 1):
+            best_text = self.label(("best", place), f"{place}. ", best)
+            items.append(
+                (best_text, (SCREEN_WIDTH // 2 - best_text.get_width() // 2, y))
+            )
+            y += best_text.get_height()
+        return items
+
+    def draw(self, screen, simulation):
+        """Draws the score, city count and the ammo of each live base."""
+        screen.blits(self.items(simulation), doreturn=False)
+
+    def draw_game_over(self, screen, score):
+        """Draws the game over overlay and the final score."""
+        screen.blits(self.game_over_items(score), doreturn=False)
@@ -0,0 +1,188 @@
+"""
+Input sampling and click latency measurement.
+
+pygame events carry no timestamps, so InputSampler stamps clicks when it
+polls them and polls often: main.py waits for the next frame in
+INPUT_POLL_INTERVAL slices instead of one long sleep. Each click is then
+fired at the first simulation step that starts after it, with the time it
+waited passed to Simulation.fire() as lead.
+
+LatencyTracker records two histograms: click to missile spawn and click to
+the first presented frame that shows the missile.
+"""
+
+import collections
+import time
+
+import pygame
+
+from settings import INPUT_POLL_INTERVAL
+
+# A left click and the time.perf_counter() value it was polled at.
+TimedClick = collections.namedtuple("TimedClick", ["time", "pos"])
+
+
+class InputSampler:
+    """Polls pygame events and keeps clicks with their arrival times."""
+
+    def __init__(self, interval=INPUT_POLL_INTERVAL, keep_clicks=True):
+        """
+        Args:
+            interval (float): Seconds between polls while waiting.
+            keep_clicks (bool): Queue clicks for due(). Without it clicks
+                are dropped, e.g. while a replay provides the input and
+                due() is never called.
+        """
+        self.interval = interval
+        self.keep_clicks = keep_clicks
+        self.clicks = collections.deque()
+        self.events = []
+
+    def poll(self):
+        """Stamps new left clicks and queues every other event."""
+        now = time.perf_counter()
+        for event in pygame.event.get():
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if self.keep_clicks:
+                    self.clicks.append(TimedClick(now, event.pos))
+            else:
+                self.events.append(event)
+
+    def wait(self, deadline):
+        """Keeps polling until time.perf_counter() reaches `deadline`."""
+        while True:
+            self.poll()
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            time.sleep(min(self.interval, remaining))
+
+    def take_events(self):
+        """Returns and forgets the queued non-click events."""
+        events, self.events = self.events, []
+        return events
+
+    def due(self, boundary):
+        """Returns and forgets the clicks polled at or before `boundary`."""
+        due = []
+        while self.clicks and self.clicks[0].time <= boundary:
+            due.append(self.clicks.popleft())
+        return due
+
+
+class LatencyHistogram:
+    """
+    Counts latencies in fixed-width millisecond buckets.
+
+    The buckets and the maximum cover every latency ever added; percentiles
+    are taken from a bounded window of the most recent ones, so a long
+    session neither grows the histogram nor slows add() down.
+    """
+
+    def __init__(self, bucket_ms=1.0, max_ms=100.0, window=1000):
+        """
+        Args:
+            bucket_ms (float): Width of a bucket.
+            max_ms (float): Start of the last, open-ended bucket.
+            window (int): Recent latencies kept for percentiles.
+        """
+        self.bucket_ms = bucket_ms
+        self.counts = [0] * (int(max_ms / bucket_ms) + 1)
+        self.samples = collections.deque(maxlen=window)
+        self.count = 0
+        self.max_ms = 0.0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, seconds):
+        """Records one latency."""
+        ms = seconds * 1000
+        index = min(int(ms / self.bucket_ms), len(self.counts) - 1)
+        self.counts[index] += 1
+        self.samples.append(ms)
+        self.count += 1
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, fraction):
+        """Returns the latency in milliseconds at `fraction` of the window."""
+        if not self.samples:
+            return 0.0
+        samples = sorted(self.samples)
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def summary(self):
+        """Returns the sample count and the p50, p95, p99 and max latencies."""
+        return {
+            "count": self.count,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ms,
+        }
+
+    def format(self, width=40):
+        """Returns the non-empty buckets as a text bar chart."""
+        peak = max(self.counts) or 1
+        lines = []
+        for index, count in enumerate(self.counts):
+            if count:
+                low = index * self.bucket_ms
+                label = f">={low:g}" if index == len(self.counts) - 1 else f"{low:g}"
+                bar = "#" * max(1, round(count / peak * width))
+                lines.append(f"{label:>6} ms {count:6d} {bar}")
+        return "\n".join(lines)
+
+
+class LatencyTracker:
+    """Click-to-spawn and click-to-pixel latency histograms."""
+
+    def __init__(self, bucket_ms=1.0, max_ms=100.0):
+        """
+        Args:
+            bucket_ms (float): Histogram bucket width.
+            max_ms (float): Start of the last histogram bucket.
+        """
+        self.spawn = LatencyHistogram(bucket_ms, max_ms)
+        self.pixel = LatencyHistogram(bucket_ms, max_ms)
+        self._pending = []
+
+    def spawned(self, click, missile, now=None):
+        """
+        Records a fired click.
+
+        Args:
+            click (TimedClick): The click.
+            missile (PlayerMissile | None): The missile it launched, if any.
+                Clicks that launch nothing are not measured.
+            now (float | None): When the missile was spawned.
+        """
+        if missile is None:
+            return
+        now = time.perf_counter() if now is None else now
+        self.spawn.add(now - click.time)
+        self._pending.append(click.time)
+
+    def presented(self, now=None):
+        """Records the click-to-pixel latency of missiles spawned so far."""
+        now = time.perf_counter() if now is None else now
+        for clicked in self._pending:
+            self.pixel.add(now - clicked)
+        self._pending = []
+
+    def report(self):
+        """Returns both histograms with their percentiles as text."""
+        parts = []
+        for name, histogram in (
+            ("click to spawn", self.spawn),
+            ("click to pixel", self.pixel),
+        ):
+            stats = histogram.summary()
+            parts.append(
+                f"{name}: {stats['count']} clicks, p50 {stats['p50_ms']:.1f} ms, "
+                f"p95 {stats['p95_ms']:.1f} ms, p99 {stats['p99_ms']:.1f} ms, "
+                f"max {stats['max_ms']:.1f} ms"
+            )
+            if len(histogram):
+                parts.append(histogram.format())
+        return "\n".join(parts)
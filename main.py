@@ -2,40 +2,401 @@
 Main file for Missile Command game.
 """
 
+import startup  # first, so that the startup report includes the imports
+import argparse
 import pygame
+import random
+import signal
 import sys
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT, BLACK, FPS
+import time
+from settings import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    FPS,
+    UPDATE_RATE,
+    RENDER_RATE,
+    MAX_CATCHUP_STEPS,
+    BLACK,
+    EXPLOSION_EXPAND_SPEED,
+    SCORES_PATH,
+    LEADERBOARD_SIZE,
+)
 from game import Game
+from latency import InputSampler, LatencyTracker
+from memory import MemoryTelemetry
+from pipeline import SimulationThread, draw_snapshot
+from sprites import preload_explosion_frames
+from profiler import FrameProfiler
+from quality import LEVELS, QualityGovernor, level
+from renderer import FullRenderer, DirtyRectRenderer, BatchedRenderer
+from replay import Replay, record
+from scores import ScoreStore, run_from_simulation
+from simulation import Simulation
+import waves
 
+RENDERERS = {
+    "full": FullRenderer,
+    "dirty": DirtyRectRenderer,
+    "batched": BatchedRenderer,
+}
 
-def main():
-    """Main game loop."""
-    pygame.init()
 
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("Missile Command")
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Missile Command")
+    parser.add_argument(
+        "--render",
+        choices=sorted(RENDERERS),
+        default="full",
+        help="full: redraw and flip the whole screen every frame; "
+        "dirty: only update the regions that changed; "
+        "batched: like full, blitting sprites that share an image together",
+    )
+    parser.add_argument(
+        "--update-rate",
+        type=int,
+        default=UPDATE_RATE,
+        help="simulation steps per second",
+    )
+    parser.add_argument(
+        "--render-rate",
+        type=int,
+        default=RENDER_RATE,
+        help="frames drawn per second, 0 for uncapped",
+    )
+    parser.add_argument(
+        "--max-catchup",
+        type=int,
+        default=MAX_CATCHUP_STEPS,
+        help="most simulation steps run per frame before dropping time",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="game seed")
+    parser.add_argument("--waves", metavar="PATH", help="load meteor waves from JSON")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", metavar="PATH", help="record the game to a replay")
+    mode.add_argument(
+        "--playback", metavar="PATH", help="play a replay instead of mouse input"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="time every frame phase; F3 toggles the overlay, F4 exports",
+    )
+    parser.add_argument(
+        "--profile-export",
+        metavar="PATH",
+        default="profile.csv",
+        help="where F4 and exit write the profile (.csv or .json)",
+    )
+    parser.add_argument(
+        "--trails",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="draw contrails behind missiles and meteors (not with --pipeline)",
+    )
+    parser.add_argument(
+        "--quality",
+        choices=["auto"] + [quality.name for quality in LEVELS],
+        default="auto",
+        help="render quality; auto lowers it while frames run over budget and "
+        "logs every change (not with --pipeline)",
+    )
+    parser.add_argument(
+        "--lead-compensation",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="move a missile ahead by the time its click waited for the step",
+    )
+    parser.add_argument(
+        "--latency-report",
+        action="store_true",
+        help="print click-to-spawn and click-to-pixel latency histograms on exit",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="trace memory use; F6 (or SIGUSR1) and exit write the report",
+    )
+    parser.add_argument(
+        "--memory-export",
+        metavar="PATH",
+        default="memory.json",
+        help="where the memory report is written",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="step the simulation on a worker thread and draw its snapshots; "
+        "frames are always fully redrawn, so --render is ignored",
+    )
+    parser.add_argument(
+        "--scores",
+        metavar="PATH",
+        default=SCORES_PATH,
+        help="record finished games in this score store; empty to disable "
+        "(replays are never recorded)",
+    )
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="print how long each startup phase took once the first frame is shown",
+    )
+    args = parser.parse_args(argv)
+    if args.pipeline and (
+        args.playback or args.profile or args.latency_report or args.memory
+    ):
+        parser.error(
+            "--pipeline cannot be combined with --playback, --profile, "
+            "--latency-report or --memory"
+        )
+    return args
+
+
+def export_profile(profiler, path):
+    """Writes the recorded frames as CSV, or JSON for a .json path."""
+    if path.endswith(".json"):
+        profiler.export_json(path)
+    else:
+        profiler.export_csv(path)
+    print(f"Wrote {min(profiler.frame_count, profiler.capacity)} frames to {path}")
+
+
+def export_memory(telemetry, path):
+    """Writes the memory report and says where."""
+    telemetry.dump(path)
+    print(f"Wrote memory report to {path}")
+
+
+def record_score(store, simulation):
+    """
+    Records a finished game and returns the best recorded scores.
+
+    Args:
+        store (ScoreStore): The score store.
+        simulation (Simulation): The finished game.
+
+    Returns:
+        list[int]: The LEADERBOARD_SIZE best scores, best first.
+    """
+    run = run_from_simulation(simulation)
+    store.add(run)
+    print(f"Score {run.score} ranks #{store.rank(run.score)}")
+    return [best.score for best in store.top(LEADERBOARD_SIZE)]
+
+
+def preload_explosions(simulation):
+    """Renders the explosion frames for the simulation's step rate."""
+    preload_explosion_frames(float(simulation.per_step(EXPLOSION_EXPAND_SPEED)))
+
+
+def report_first_frame(timer, args):
+    """Finishes the startup timing once the first frame is shown."""
+    timer.mark("first frame")
+    if args.startup_report:
+        print(timer.report())
 
-    clock = pygame.time.Clock()
-    game = Game(screen)
 
+def run_pipelined(game, clock, args, timer, store=None):
+    """
+    Plays with the simulation on a worker thread (--pipeline).
+
+    The main thread only turns clicks into queued shots and draws the latest
+    snapshot the worker published. A finished game is recorded in `store`
+    once the worker has stopped.
+    """
+    screen = game.screen
+    simulation = game.simulation
+    # Rendered up front: the worker must not be the first to ask for them
+    # while the main thread is drawing.
+    preload_explosions(simulation)
+    timer.mark("warm-up")
+    worker = SimulationThread(simulation, args.max_catchup)
+    worker.start()
+    first_frame = True
     running = True
+    try:
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    worker.fire(event.pos)
+
+            snapshot = worker.latest()
+            screen.fill(BLACK)
+            draw_snapshot(screen, snapshot, game.hud, worker.alpha(snapshot))
+            pygame.display.flip()
+            if first_frame:
+                first_frame = False
+                report_first_frame(timer, args)
+
+            clock.tick(args.render_rate)
+    finally:
+        worker.stop()
+    if store is not None and simulation.game_over:
+        record_score(store, simulation)
+
+
+def main(argv=None):
+    """Main game loop."""
+    timer = startup.StartupTimer(startup.IMPORTED_AT)
+    timer.mark("imports")
+    args = parse_args(argv)
+    timer.mark("arguments")
+    # Only the display is started here. pygame.init() would also open the
+    # audio device, which the game never uses; the font module is started
+    # by Game the first time the HUD is drawn.
+    with timer.phase("display"):
+        pygame.display.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Missile Command")
+
+    clock = pygame.time.Clock()
+    playback = None
+    recorder = None
+    level_waves = waves.load(args.waves) if args.waves else None
+    if args.playback:
+        playback = Replay.load(args.playback)
+        simulation = playback.simulation(verbose=True, waves=level_waves)
+    else:
+        seed = args.seed if args.seed is not None else random.randrange(2**31)
+        simulation = Simulation(
+            seed, verbose=True, step_rate=args.update_rate, waves=level_waves
+        )
+        if args.record:
+            recorder = record(simulation, args.record)
+    # Replays repeat a game that was recorded when it was played.
+    store = ScoreStore(args.scores) if args.scores and playback is None else None
+    profiler = None
+    if args.profile:
+        profiler = simulation.profiler = FrameProfiler()
+    telemetry = None
+    memory_requests = []
+    if args.memory:
+        telemetry = MemoryTelemetry(simulation)
+        telemetry.start()
+        # Cabinets have no keyboard, so an operator can ask for a report
+        # with a signal; it is written by the main loop.
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, lambda *_: memory_requests.append(True))
+    game = Game(screen, simulation, trails=args.trails and not args.pipeline)
+    step_time = 1.0 / simulation.step_rate
+    renderer = RENDERERS[args.render](screen)
+    governor = None
+    if args.quality == "auto":
+        governor = QualityGovernor(1.0 / (args.render_rate or FPS))
+    else:
+        game.set_quality(level(args.quality))
+    timer.mark("simulation and game")
+    if args.pipeline:
+        run_pipelined(game, clock, args, timer, store)
+    first_frame = True
+
+    # Fixed-timestep loop: the simulation advances in constant steps of
+    # game time while rendering runs at its own rate and interpolates.
+    accumulator = 0.0
+    scored = False
+    # A replay provides the clicks; the player's are not queued.
+    sampler = InputSampler(keep_clicks=playback is None)
+    latency = LatencyTracker()
+    previous_time = time.perf_counter()
+
+    # With --pipeline the game has already been played.
+    running = not args.pipeline
     while running:
-        events = pygame.event.get()
-        for event in events:
+        now = time.perf_counter()
+        accumulator += now - previous_time
+        previous_time = now
+        if profiler is not None:
+            profiler.begin_frame()
+
+        sampler.poll()
+        for event in sampler.take_events():
             if event.type == pygame.QUIT:
                 running = False
+            elif profiler is not None and event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    game.show_profiler = not game.show_profiler
+                elif event.key == pygame.K_F4:
+                    export_profile(profiler, args.profile_export)
+            elif (
+                telemetry is not None
+                and event.type == pygame.KEYDOWN
+                and event.key == pygame.K_F6
+            ):
+                memory_requests.append(True)
+        if memory_requests:
+            memory_requests.clear()
+            export_memory(telemetry, args.memory_export)
 
-        game.handle_events(events)
-
-        screen.fill(BLACK)
-
-        game.update()
-        game.draw()
+        # Wall-clock time the next step starts at. A click is fired at the
+        # first step starting after it, moved ahead by the time it waited.
+        boundary = now - accumulator
+        update_start = time.perf_counter()
+        steps = 0
+        while accumulator >= step_time and steps < args.max_catchup:
+            if playback is not None:
+                if not playback.finished(simulation):
+                    playback.apply(simulation)
+                    game.update()
+            else:
+                for click in sampler.due(boundary):
+                    if game.game_over:
+                        continue
+                    lead = (boundary - click.time) / step_time
+                    missile = simulation.fire(
+                        click.pos, lead if args.lead_compensation else 0.0
+                    )
+                    latency.spawned(click, missile)
+                game.update()
+            if telemetry is not None:
+                telemetry.tick()
+            accumulator -= step_time
+            boundary += step_time
+            steps += 1
+        if steps == args.max_catchup:
+            # Too far behind: drop the backlog instead of spiralling.
+            accumulator = min(accumulator, step_time)
+        if store is not None and game.game_over and not scored:
+            scored = True
+            game.leaderboard = record_score(store, simulation)
 
-        pygame.display.flip()
+        draw_start = time.perf_counter()
+        renderer.render(game, alpha=min(accumulator / step_time, 1.0))
+        latency.presented()
+        if governor is not None:
+            done = time.perf_counter()
+            quality = governor.record(
+                draw_start - update_start, done - draw_start, simulation.frame
+            )
+            if quality is not None:
+                game.set_quality(quality)
+        if profiler is not None:
+            profiler.mark("present")
+            profiler.end_frame(simulation)
+        if first_frame:
+            first_frame = False
+            report_first_frame(timer, args)
+            # Render the explosion frames now rather than before the first
+            # frame, so they are ready before the first missile lands.
+            preload_explosions(simulation)
 
-        clock.tick(FPS)
+        # Sleep in short slices so that clicks are stamped close to when
+        # they happen rather than once per frame.
+        if args.render_rate:
+            sampler.wait(now + 1.0 / args.render_rate)
 
+    if recorder is not None:
+        recorder.close(simulation.frame)
+    if profiler is not None:
+        export_profile(profiler, args.profile_export)
+    if args.latency_report:
+        print(latency.report())
+    if telemetry is not None:
+        export_memory(telemetry, args.memory_export)
+        telemetry.stop()
+    if store is not None:
+        store.close()
     pygame.quit()
     sys.exit()
 
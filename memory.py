@@ -0,0 +1,166 @@
+"""
+Memory telemetry for long sessions.
+
+MemoryTelemetry samples a running Simulation every `interval` steps: the
+memory traced by tracemalloc, the live sprites of every group, the sprite
+pools, the scheduled events and the shared image caches. dump() writes the
+samples together with the biggest allocation sites and their growth since
+telemetry started, so a multi-day attract-mode run can show that memory
+stays flat:
+
+    telemetry = MemoryTelemetry(simulation)
+    telemetry.start()
+    ...  # telemetry.tick() once per step
+    telemetry.dump("memory.json")
+
+Tracing slows allocation-heavy code down noticeably; enable it only when
+the numbers are wanted.
+"""
+
+import collections
+import gc
+import json
+import time
+import tracemalloc
+
+import sprites
+
+GROUPS = (
+    "all_sprites",
+    "cities",
+    "bases",
+    "player_missiles",
+    "enemy_meteors",
+    "explosions",
+)
+
+
+class MemoryTelemetry:
+    """Periodic memory samples of one Simulation."""
+
+    def __init__(self, simulation, interval=600, history=1000, frames=1):
+        """
+        Args:
+            simulation (Simulation): The simulation to watch. It can be
+                replaced between samples, e.g. when attract mode starts a
+                new game.
+            interval (int): Steps between samples taken by tick().
+            history (int): Samples kept; older ones are dropped so that the
+                telemetry itself stays bounded.
+            frames (int): Stack frames tracemalloc records per allocation.
+        """
+        self.simulation = simulation
+        self.interval = interval
+        self.frames = frames
+        self.samples = collections.deque(maxlen=history)
+        self.baseline = None
+        self._started_tracing = False
+        self._ticks = 0
+
+    def start(self):
+        """Starts tracemalloc, if needed, and takes the baseline snapshot."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self.baseline = tracemalloc.take_snapshot()
+        self.sample()
+
+    def stop(self):
+        """Stops tracemalloc if start() started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def counts(self):
+        """Returns the live object counts that memory use should follow."""
+        sim = self.simulation
+        counts = {name: len(getattr(sim, name)) for name in GROUPS}
+        for name, stats in sim.pool_stats().items():
+            counts[f"{name}_pool"] = stats["size"]
+        counts["events"] = len(sim.events)
+        if sim.world is not None:
+            counts["world_slots"] = sim.world.capacity
+        counts["solid_images"] = sprites.cached_image_count()
+        counts["explosion_atlases"] = sprites.cached_explosion_count()
+        return counts
+
+    def sample(self, collect=False):
+        """
+        Records one sample and returns it.
+
+        Args:
+            collect (bool): Run a full garbage collection first, so that
+                unreachable cycles (sprites and their groups from a finished
+                game) are not counted. It can take milliseconds, so periodic
+                samples skip it.
+        """
+        if collect:
+            gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        sample = {
+            "time": time.time(),
+            "frame": self.simulation.frame,
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "counts": self.counts(),
+        }
+        self.samples.append(sample)
+        return sample
+
+    def tick(self):
+        """Call once per step; samples every `interval` steps."""
+        self._ticks += 1
+        if self._ticks % self.interval == 0:
+            self.sample()
+
+    def top(self, count=20):
+        """
+        Returns the biggest allocation sites and their growth.
+
+        Args:
+            count (int): Sites to report.
+
+        Returns:
+            dict: "top" lists the sites holding the most memory now, "growth"
+            those that grew the most since start().
+        """
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            )
+        )
+
+        def row(stat, size, count_):
+            frame = stat.traceback[0]
+            return {
+                "file": frame.filename,
+                "line": frame.lineno,
+                "size": size,
+                "count": count_,
+            }
+
+        top = [
+            row(stat, stat.size, stat.count)
+            for stat in snapshot.statistics("lineno")[:count]
+        ]
+        growth = []
+        if self.baseline is not None:
+            growth = [
+                row(stat, stat.size_diff, stat.count_diff)
+                for stat in snapshot.compare_to(self.baseline, "lineno")[:count]
+            ]
+        return {"top": top, "growth": growth}
+
+    def dump(self, path, count=20):
+        """
+        Writes the samples and the top allocation sites as JSON.
+
+        Args:
+            path (str): The file to write.
+            count (int): Allocation sites to include.
+        """
+        self.sample(collect=True)
+        report = {"samples": list(self.samples), **self.top(count)}
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
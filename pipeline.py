@@ -0,0 +1,213 @@
+"""
+Pipelined simulation and rendering.
+
+SimulationThread runs the fixed-timestep loop on a worker thread. After
+every step it publishes an immutable RenderSnapshot of what is on screen.
+The main thread only handles events and draws the latest snapshot, so a
+slow flip no longer delays the next step and a heavy collision step no
+longer delays the frame being drawn.
+
+Snapshots hold plain tuples and references to sprite images. Those images
+are never drawn on once created (MissileBase.destroy() swaps in a new one),
+so the main thread can blit them while the worker keeps stepping. Clicks
+reach the simulation through fire(), which queues them for the start of
+the next step, just like the single-threaded loop.
+"""
+
+import collections
+import threading
+import time
+
+from renderer import blit_batches
+from settings import MAX_CATCHUP_STEPS
+
+# What one step looks like to the renderer. `static` holds (image, top-left)
+# pairs of cities, bases and explosions; `moving` holds (image, top-left,
+# x, y, vx, vy) of missiles and meteors so that they can be interpolated.
+# `bases` holds (key, ammo, centerx, bottom) of the live bases for the HUD.
+RenderSnapshot = collections.namedtuple(
+    "RenderSnapshot",
+    [
+        "frame",
+        "time",
+        "static",
+        "moving",
+        "score",
+        "level",
+        "cities",
+        "bases",
+        "game_over",
+    ],
+)
+
+
+def capture(simulation, now=None):
+    """
+    Records the drawable state of a simulation.
+
+    Args:
+        simulation (Simulation): The simulation, between two steps.
+        now (float | None): time.perf_counter() value of the step; defaults
+            to now.
+
+    Returns:
+        RenderSnapshot: The snapshot.
+    """
+    simulation.sync_views()
+    static = []
+    moving = []
+    for sprite in simulation.all_sprites:
+        velocity = getattr(sprite, "velocity", None)
+        if velocity is None:
+            static.append((sprite.image, sprite.rect.topleft))
+        else:
+            position = sprite.current_pos
+            moving.append(
+                (
+                    sprite.image,
+                    sprite.rect.topleft,
+                    position.x,
+                    position.y,
+                    velocity.x,
+                    velocity.y,
+                )
+            )
+    bases = tuple(
+        (id(base), base.ammo, base.rect.centerx, base.rect.bottom)
+        for base in simulation.bases
+        if not base.is_destroyed()
+    )
+    return RenderSnapshot(
+        frame=simulation.frame,
+        time=time.perf_counter() if now is None else now,
+        static=tuple(static),
+        moving=tuple(moving),
+        score=simulation.score,
+        level=simulation.level,
+        cities=len(simulation.cities),
+        bases=bases,
+        game_over=simulation.game_over,
+    )
+
+
+def draw_snapshot(screen, snapshot, hud, alpha=1.0):
+    """
+    Draws a snapshot, blitting sprites that share an image together.
+
+    Args:
+        screen (pygame.Surface): The surface to draw on.
+        snapshot (RenderSnapshot): What to draw.
+        hud (HUD): Renders the score, cities and ammo.
+        alpha (float): Interpolation towards the snapshot's step, as in
+            Game.draw_items().
+    """
+    lag = 1.0 - alpha
+    batches = {}
+    for image, dest in snapshot.static:
+        batches.setdefault(image, []).append(dest)
+    for image, dest, x, y, vx, vy in snapshot.moving:
+        if lag:
+            dest = image.get_rect(center=(x - vx * lag, y - vy * lag)).topleft
+        batches.setdefault(image, []).append(dest)
+    blit_batches(screen, batches.items())
+
+    items = hud.status_items(snapshot.score, snapshot.cities, snapshot.bases)
+    if snapshot.game_over:
+        items += hud.game_over_items(snapshot.score)
+    screen.blits(items, doreturn=False)
+
+
+class SimulationThread:
+    """Steps a Simulation on a worker thread and publishes snapshots."""
+
+    def __init__(self, simulation, max_catchup=MAX_CATCHUP_STEPS):
+        """
+        Prepares the worker; start() launches it.
+
+        Args:
+            simulation (Simulation): The simulation. Only the worker touches
+                it while the thread runs.
+            max_catchup (int): Most steps run back to back before dropping
+                time.
+        """
+        self.simulation = simulation
+        self.step_time = 1.0 / simulation.step_rate
+        self.max_catchup = max_catchup
+        self.error = None
+        self._clicks = collections.deque()
+        # Two slots: the worker fills the back one and then flips `_front`,
+        # so readers always see a complete snapshot.
+        self._buffers = [capture(simulation), None]
+        self._front = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="simulation", daemon=True
+        )
+
+    def fire(self, pos):
+        """Queues a click for the start of the next step."""
+        self._clicks.append(pos)
+
+    def latest(self):
+        """
+        Returns the most recent snapshot.
+
+        Raises:
+            RuntimeError: If the worker died; the cause is chained.
+        """
+        if self.error is not None:
+            raise RuntimeError("simulation thread failed") from self.error
+        return self._buffers[self._front]
+
+    def alpha(self, snapshot, now=None):
+        """Interpolation factor for drawing `snapshot` at `now`."""
+        now = time.perf_counter() if now is None else now
+        return min(max((now - snapshot.time) / self.step_time, 0.0), 1.0)
+
+    def advance(self):
+        """Applies the queued clicks, runs one step and publishes it."""
+        simulation = self.simulation
+        while self._clicks:
+            pos = self._clicks.popleft()
+            if not simulation.game_over:
+                simulation.fire(pos)
+        simulation.step()
+        back = 1 - self._front
+        self._buffers[back] = capture(simulation)
+        self._front = back
+
+    def _run(self):
+        accumulator = 0.0
+        previous_time = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                now = time.perf_counter()
+                accumulator += now - previous_time
+                previous_time = now
+                steps = 0
+                while accumulator >= self.step_time and steps < self.max_catchup:
+                    self.advance()
+                    accumulator -= self.step_time
+                    steps += 1
+                if steps == self.max_catchup:
+                    accumulator = min(accumulator, self.step_time)
+                self._stop.wait(self.step_time - accumulator)
+        except Exception as error:  # noqa: BLE001
+            # Any failure is re-raised on the main thread by latest().
+            self.error = error
+
+    def start(self):
+        """Starts stepping in the background."""
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the worker and waits for it.
+
+        Raises:
+            RuntimeError: If the worker died; the cause is chained.
+        """
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.latest()
@@ -0,0 +1,137 @@
+"""
+Object pools for short-lived sprites.
+
+Missiles, meteors and explosions are created and killed by the thousand in
+long games. A SpritePool keeps killed sprites and hands them out again,
+re-initialized through their reset() method, so that neither the sprites nor
+their surfaces have to be allocated and garbage collected over and over.
+"""
+
+import math
+
+import pygame
+
+
+class Poolable(pygame.sprite.Sprite):
+    """
+    Base for sprites that go back to their pool when killed.
+
+    It can be combined with another Sprite subclass, e.g. CompactSprite, by
+    listing Poolable first. Sprites with __slots__ must declare "pool" and
+    "pooled".
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *groups):
+        self.pool = None
+        # True while the sprite sits in its pool's free list.
+        self.pooled = False
+        super().__init__(*groups)
+
+    def kill(self):
+        """Removes the sprite from its groups and returns it to its pool."""
+        super().kill()
+        if self.pool is not None and not self.pooled:
+            self.pool.release(self)
+
+
+class SpritePool:
+    """Free list of reusable sprites of one kind."""
+
+    def __init__(self, factory, capacity=0, max_size=None, growth=2.0, lazy=False):
+        """
+        Creates the pool and pre-allocates its first sprites.
+
+        Args:
+            factory (Callable[[], Poolable]): Creates one blank sprite.
+            capacity (int): Sprites allocated up front.
+            max_size (int | None): Most sprites the pool ever owns. Beyond
+                it, acquire() still works but returns sprites that are thrown
+                away when killed. None means unbounded.
+            growth (float): When the pool runs dry it grows its total size
+                by this factor (at least one sprite, at most max_size).
+            lazy (bool): Allocate the first `capacity` sprites on the first
+                acquire() instead of now, so that creating a pool that is
+                never used costs nothing.
+        """
+        self.factory = factory
+        self.max_size = max_size
+        self.growth = growth
+        self.free = []
+        self.size = 0
+        self.in_use = 0
+        self.high_water = 0
+        self.acquired = 0
+        self.allocated = 0
+        self.overflows = 0
+        self._reserve = capacity if lazy else 0
+        if not lazy:
+            self._allocate(capacity)
+
+    def _allocate(self, count):
+        """Adds up to `count` new sprites to the free list."""
+        if self.max_size is not None:
+            count = min(count, self.max_size - self.size)
+        for _ in range(count):
+            sprite = self.factory()
+            sprite.pool = self
+            sprite.pooled = True
+            self.free.append(sprite)
+        self.size += max(count, 0)
+        self.allocated += max(count, 0)
+
+    def acquire(self, *args, groups=()):
+        """
+        Returns a sprite reset with `args` and added to `groups`.
+
+        Args:
+            *args: Arguments for the sprite's reset() method.
+            groups (Iterable[pygame.sprite.AbstractGroup]): Groups to add
+                the sprite to.
+        """
+        if not self.free:
+            if self._reserve:
+                self._allocate(self._reserve)
+                self._reserve = 0
+            else:
+                self._allocate(max(1, math.ceil(self.size * (self.growth - 1))))
+        self.acquired += 1
+        if self.free:
+            sprite = self.free.pop()
+            sprite.pooled = False
+            self.in_use += 1
+            self.high_water = max(self.high_water, self.in_use)
+        else:
+            sprite = self.factory()
+            self.allocated += 1
+            self.overflows += 1
+        sprite.reset(*args)
+        sprite.add(*groups)
+        return sprite
+
+    def release(self, sprite):
+        """Takes back a killed sprite; called by Poolable.kill()."""
+        sprite.pooled = True
+        self.in_use -= 1
+        self.free.append(sprite)
+
+    def stats(self):
+        """
+        Returns the pool's counters.
+
+        Returns:
+            dict: size (sprites owned), free, in_use, high_water (most in
+            use at once), acquired, allocated (sprites ever created,
+            including overflows) and overflows (sprites handed out past
+            max_size).
+        """
+        return {
+            "size": self.size,
+            "free": len(self.free),
+            "in_use": self.in_use,
+            "high_water": self.high_water,
+            "acquired": self.acquired,
+            "allocated": self.allocated,
+            "overflows": self.overflows,
+        }
@@ -0,0 +1,155 @@
+"""
+Per-frame phase profiler.
+
+FrameProfiler times the phases of each frame (simulation phases, drawing,
+presenting) into a fixed-size ring buffer together with the entity counts of
+that frame. Nothing is allocated per frame. When no profiler is attached the
+game only pays for an `is None` check per phase.
+
+The last frames can be exported to CSV or JSON, and an overlay surface with
+a frame-time graph can be drawn on top of the game.
+"""
+
+import array
+import csv
+import json
+import time
+
+import pygame
+
+from settings import FPS, WHITE
+
+PHASES = (
+    "spawn",
+    "move",
+    "arrivals",
+    "collisions",
+    "level_end",
+    "sprites",
+    "hud",
+    "blit",
+    "present",
+)
+COUNTS = ("meteors", "missiles", "explosions")
+COLUMNS = ("frame", "total_ms") + tuple(f"{p}_ms" for p in PHASES) + COUNTS
+
+_PHASE_INDEX = {phase: 2 + i for i, phase in enumerate(PHASES)}
+_WIDTH = len(COLUMNS)
+
+
+class FrameProfiler:
+    """Ring buffer of per-phase frame timings."""
+
+    def __init__(self, capacity=600, budget_ms=1000 / FPS):
+        """
+        Initializes an empty profiler.
+
+        Args:
+            capacity (int): Number of frames kept.
+            budget_ms (float): Frame budget drawn as a line on the overlay.
+        """
+        self.capacity = capacity
+        self.budget_ms = budget_ms
+        self.data = array.array("d", bytes(8 * capacity * _WIDTH))
+        self.frame_count = 0
+        self._row = 0
+        self._last = 0.0
+        self._font = None
+
+    def begin_frame(self):
+        """Starts a new frame row."""
+        self._row = (self.frame_count % self.capacity) * _WIDTH
+        data = self.data
+        for i in range(self._row, self._row + _WIDTH):
+            data[i] = 0.0
+        data[self._row] = self.frame_count
+        self._last = time.perf_counter()
+
+    def start(self):
+        """Resets the phase clock, e.g. at the start of a step or a draw."""
+        self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """Adds the time since the last start() or mark() to `phase`."""
+        now = time.perf_counter()
+        self.data[self._row + _PHASE_INDEX[phase]] += (now - self._last) * 1000.0
+        self._last = now
+
+    def end_frame(self, simulation):
+        """
+        Closes the current frame row.
+
+        Args:
+            simulation (Simulation): Source of the entity counts.
+        """
+        data = self.data
+        row = self._row
+        data[row + 1] = sum(data[row + 2 : row + 2 + len(PHASES)])
+        counts = row + 2 + len(PHASES)
+        data[counts] = len(simulation.enemy_meteors)
+        data[counts + 1] = len(simulation.player_missiles)
+        data[counts + 2] = len(simulation.explosions)
+        self.frame_count += 1
+
+    def frames(self, count=None):
+        """
+        Returns recorded frames, oldest first.
+
+        Args:
+            count (int | None): Only the last `count` frames.
+
+        Returns:
+            list[dict]: One dict per frame keyed by COLUMNS.
+        """
+        available = min(self.frame_count, self.capacity)
+        count = available if count is None else min(count, available)
+        rows = []
+        for frame in range(self.frame_count - count, self.frame_count):
+            start = (frame % self.capacity) * _WIDTH
+            rows.append(dict(zip(COLUMNS, self.data[start : start + _WIDTH])))
+        return rows
+
+    def export_csv(self, path, count=None):
+        """Writes the last frames to a CSV file."""
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.frames(count))
+
+    def export_json(self, path, count=None):
+        """Writes the last frames to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.frames(count), f)
+
+    def overlay(self, width=300, height=100):
+        """
+        Renders a frame-time graph of the recorded frames.
+
+        Each column is one frame, scaled so that twice the budget fills the
+        height. The budget is drawn as a horizontal line.
+
+        Returns:
+            pygame.Surface: The overlay.
+        """
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 160))
+        scale = height / (2 * self.budget_ms)
+        frames = self.frames(width)
+        for x, frame in enumerate(frames):
+            bar = min(height, int(frame["total_ms"] * scale))
+            color = (255, 80, 80) if frame["total_ms"] > self.budget_ms else WHITE
+            pygame.draw.line(surface, color, (x, height - 1), (x, height - bar))
+        budget_y = height - int(self.budget_ms * scale)
+        pygame.draw.line(surface, (80, 255, 80), (0, budget_y), (width, budget_y))
+
+        if frames:
+            if self._font is None:
+                self._font = pygame.font.Font(None, 18)
+            last = frames[-1]
+            slowest = max(PHASES, key=lambda phase: last[f"{phase}_ms"])
+            text = (
+                f"{last['total_ms']:.2f} ms  {slowest} "
+                f"{last[f'{slowest}_ms']:.2f} ms  meteors {int(last['meteors'])}"
+            )
+            surface.blit(self._font.render(text, True, WHITE), (4, 4))
+        return surface
@@ -0,0 +1,156 @@
+"""
+Adaptive render quality.
+
+QualityGovernor watches how long the recent frames took to update and draw
+and steps through LEVELS to keep them within the frame budget: down one
+level as soon as the average cost runs over budget, back up one level once
+it has stayed well under budget for a while. Every change is logged.
+
+Quality only ever changes how a frame is drawn, never what the simulation
+does, so a game plays out exactly the same at every level:
+
+    governor = QualityGovernor(budget=1 / 60)
+    ...
+    quality = governor.record(update_seconds, draw_seconds)
+    if quality is not None:
+        game.set_quality(quality)
+"""
+
+import collections
+import time
+
+# How to draw a frame.
+# interpolate: place moving sprites between steps (see Game.draw_items()).
+# trails: draw the contrail layer, if the game has one.
+# simple_explosions: draw explosions as cheap outlines.
+# overlay_alpha: dim the game under the game over text.
+# hud_interval: rebuild the HUD every this many steps; it is reused between.
+Quality = collections.namedtuple(
+    "Quality",
+    [
+        "name",
+        "interpolate",
+        "trails",
+        "simple_explosions",
+        "overlay_alpha",
+        "hud_interval",
+    ],
+)
+
+LEVELS = (
+    Quality("high", True, True, False, True, 1),
+    Quality("medium", True, True, True, False, 1),
+    Quality("low", False, True, True, False, 6),
+    Quality("minimal", False, False, True, False, 30),
+)
+
+
+def level(name):
+    """Returns the quality level called `name`."""
+    for quality in LEVELS:
+        if quality.name == name:
+            return quality
+    raise ValueError(f"unknown quality level: {name}")
+
+
+# One logged level change: when, the levels, and the average frame cost in
+# milliseconds that caused it.
+QualityChange = collections.namedtuple(
+    "QualityChange", ["time", "frame", "old", "new", "cost_ms"]
+)
+
+
+class QualityGovernor:
+    """Picks the quality level that keeps frames within budget."""
+
+    def __init__(
+        self,
+        budget,
+        window=30,
+        lower_at=0.9,
+        raise_at=0.5,
+        hold=120,
+        levels=LEVELS,
+        log=print,
+    ):
+        """
+        Args:
+            budget (float): Seconds a frame may take to update and draw.
+            window (int): Frames averaged before deciding.
+            lower_at (float): Lower the quality when the average cost
+                exceeds this fraction of the budget.
+            raise_at (float): Raise it again when the average cost stays
+                below this fraction of the budget. The gap between the two
+                keeps the level from flapping.
+            hold (int): Frames to wait after any change before raising.
+            levels (Sequence[Quality]): Levels from best to cheapest.
+            log (Callable[[str], None] | None): Receives a line for every
+                change.
+        """
+        self.budget = budget
+        self.window = window
+        self.lower_at = lower_at
+        self.raise_at = raise_at
+        self.hold = hold
+        self.levels = levels
+        self.log = log
+        self.index = 0
+        self.changes = []
+        self._costs = collections.deque(maxlen=window)
+        self._frames = 0
+        self._since_change = 0
+
+    @property
+    def quality(self):
+        """The current level."""
+        return self.levels[self.index]
+
+    def record(self, update_seconds, draw_seconds, frame=None):
+        """
+        Adds the cost of one frame and changes the level if needed.
+
+        Args:
+            update_seconds (float): Time spent stepping the simulation.
+            draw_seconds (float): Time spent drawing and presenting.
+            frame (int | None): Simulation frame, for the log.
+
+        Returns:
+            Quality | None: The new level if it changed.
+        """
+        self._frames += 1
+        self._since_change += 1
+        self._costs.append(update_seconds + draw_seconds)
+        if len(self._costs) < self.window:
+            return None
+        cost = sum(self._costs) / len(self._costs)
+        if cost > self.budget * self.lower_at and self.index < len(self.levels) - 1:
+            return self._change(self.index + 1, cost, frame)
+        if (
+            cost < self.budget * self.raise_at
+            and self.index > 0
+            and self._since_change >= self.hold
+        ):
+            return self._change(self.index - 1, cost, frame)
+        return None
+
+    def _change(self, index, cost, frame):
+        """Switches to levels[index] and logs it."""
+        old = self.quality
+        self.index = index
+        change = QualityChange(
+            time.time(),
+            self._frames if frame is None else frame,
+            old.name,
+            self.quality.name,
+            cost * 1000,
+        )
+        self.changes.append(change)
+        if self.log is not None:
+            self.log(
+                f"Quality {change.old} -> {change.new} at frame {change.frame}: "
+                f"{change.cost_ms:.1f} ms per frame, budget {self.budget * 1000:.1f} ms"
+            )
+        # Judge the new level on its own frames only.
+        self._costs.clear()
+        self._since_change = 0
+        return self.quality
@@ -0,0 +1,185 @@
+"""
+Frame presentation strategies for Missile Command.
+
+FullRenderer clears the screen and flips the whole display every frame.
+DirtyRectRenderer only clears what was drawn last frame and pushes the
+regions whose contents changed to the display. With a trail layer it clears
+by copying those regions back from the layer, and copies and pushes only the
+regions of the layer that changed, never the whole layer.
+BatchedRenderer redraws everything like FullRenderer but submits the
+sprites one batch per shared image, for games with thousands of entities.
+"""
+
+from itertools import repeat
+
+import pygame
+
+from settings import BLACK
+
+
+def blit_batches(surface, batches):
+    """
+    Draws (image, destinations) batches with one call per image.
+
+    Uses Surface.fblits where pygame provides it (pygame-ce) and
+    Surface.blits otherwise.
+
+    Args:
+        surface (pygame.Surface): The surface to draw on.
+        batches (Iterable[tuple[pygame.Surface, Sequence]]): Images and the
+            top-left corners to draw each of them at.
+    """
+    fblits = getattr(surface, "fblits", None)
+    for image, dests in batches:
+        if fblits is not None:
+            fblits(list(zip(repeat(image), dests)))
+        else:
+            surface.blits(zip(repeat(image), dests), doreturn=False)
+
+
+class FullRenderer:
+    """Clears, redraws and flips the whole screen every frame."""
+
+    def __init__(self, screen, background=BLACK):
+        """
+        Initializes the renderer.
+
+        Args:
+            screen (pygame.Surface): The display surface.
+            background (tuple[int, int, int]): The clear color.
+        """
+        self.screen = screen
+        self.background = background
+
+    def draw(self, game, alpha=1.0):
+        """Draws one frame of `game` without presenting it."""
+        game.draw(alpha)
+
+    def render(self, game, alpha=1.0):
+        """Draws one frame of `game` and presents it."""
+        self.screen.fill(self.background)
+        self.draw(game, alpha)
+        pygame.display.flip()
+
+
+class BatchedRenderer(FullRenderer):
+    """Redraws the whole screen every frame, blitting sprites in batches."""
+
+    def draw(self, game, alpha=1.0):
+        """Draws one frame of `game` without presenting it."""
+        blit_batches(self.screen, game.draw_batches(alpha))
+        profiler = game.simulation.profiler
+        if profiler is not None:
+            profiler.mark("blit")
+        # hud_items() marks "hud" for building the HUD; blitting it is "blit".
+        items = game.hud_items()
+        self.screen.blits(items, doreturn=False)
+        if profiler is not None:
+            profiler.mark("blit")
+
+
+class DirtyRectRenderer:
+    """Redraws only what changed and updates just those display regions."""
+
+    def __init__(self, screen, background=BLACK):
+        """
+        Initializes the renderer.
+
+        Args:
+            screen (pygame.Surface): The display surface.
+            background (tuple[int, int, int]): The clear color.
+        """
+        self.screen = screen
+        self.background = background
+        self._previous = None
+        self._quality = None
+
+    def render(self, game, alpha=1.0):
+        """
+        Draws one frame of `game` and presents the changed regions.
+
+        Args:
+            game (Game): The game to draw.
+            alpha (float): Interpolation between simulation steps.
+
+        Returns:
+            list[pygame.Rect]: The regions pushed to the display.
+        """
+        if (
+            self._previous is None
+            or game.game_over
+            or game.quality is not self._quality
+        ):
+            # The first frame, the translucent game over overlay and a
+            # change of quality level need the whole screen.
+            self._quality = game.quality
+            self.screen.fill(self.background)
+            items = self._draw(game, alpha)
+            self._previous = None if game.game_over else self._index(items)
+            pygame.display.flip()
+            return [self.screen.get_rect()]
+
+        items = game.draw_items(alpha)
+        stale = [rect for rect, _ in self._previous.values()]
+        if game.trails is None:
+            for rect in stale:
+                self.screen.fill(self.background, rect)
+            dirty = []
+        else:
+            # The trail layer is the background: repaint from it where the
+            # sprites were last frame and where trails changed.
+            layer = game.trails.surface
+            items = [item for item in items if item[0] is not layer]
+            dirty = list(game.trails.dirty)
+            self.screen.blits(
+                [(layer, rect, rect) for rect in stale + dirty], doreturn=False
+            )
+        self.screen.blits(items, doreturn=False)
+        profiler = game.simulation.profiler
+        if profiler is not None:
+            profiler.mark("blit")
+        current = self._index(items)
+        dirty += self.dirty_rects(self._previous, current)
+        self._previous = current
+        pygame.display.update(dirty)
+        return dirty
+
+    @staticmethod
+    def _draw(game, alpha):
+        """
+        Draws `game` and returns the items to track between frames.
+
+        A trail layer covers the whole screen, so it is left out; the
+        regions its trails change are reported by the layer itself.
+        """
+        items = game.draw(alpha)
+        if game.trails is not None:
+            items = [item for item in items if item[0] is not game.trails.surface]
+        return items
+
+    @staticmethod
+    def _index(items):
+        """
+        Keys every drawn item by its image and screen area.
+
+        The surfaces are kept referenced until the next frame so that a new
+        surface can never reuse the id of one still being compared against.
+        """
+        index = {}
+        for surface, dest in items:
+            rect = surface.get_rect(topleft=getattr(dest, "topleft", dest))
+            index[(id(surface), tuple(rect))] = (rect, surface)
+        return index
+
+    @staticmethod
+    def dirty_rects(previous, current):
+        """
+        Returns the regions whose pixels may differ between two frames.
+
+        An item drawn with the same image at the same place in both frames
+        produces the same pixels, so only items that appeared, moved, changed
+        image or disappeared are reported.
+        """
+        dirty = [rect for key, (rect, _) in current.items() if key not in previous]
+        dirty += [rect for key, (rect, _) in previous.items() if key not in current]
+        return dirty
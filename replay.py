@@ -0,0 +1,271 @@
+"""
+Deterministic input recording and replay.
+
+A game is fully determined by its seed, its step rate, its waves and the
+clicks the player made, so a replay is just those. The file is a small
+binary stream:
+
+    header: magic "MCRP", version (u8), step rate (u16), seed (i64),
+            waves digest (u32)
+    record: type (u8), frame (u32), x (i16), y (i16)
+
+Click records are appended as they happen; an end record marks the frame
+the recording stopped at. A click fired with input lead is preceded by a
+lead record holding the lead in thousandths of a step in its x field. A
+truncated file (e.g. after a crash) still plays back up to its last complete
+record. The waves are stored as waves.digest(), so a replay recorded with a
+--waves table refuses to play back without the same table.
+
+Usage:
+    python -m replay run1.mcr run2.mcr --render-frames 600,1200 --output-dir out
+"""
+
+import argparse
+import json
+import os
+import struct
+
+import pygame
+
+from game import Game
+from settings import BLACK, SCREEN_HEIGHT, SCREEN_WIDTH
+from simulation import Simulation
+from waves import digest, load
+
+MAGIC = b"MCRP"
+# Bumped whenever the same seed and clicks would play out differently.
+VERSION = 4
+HEADER = struct.Struct("<4sBHqI")
+RECORD = struct.Struct("<BIhh")
+CLICK = 0
+END = 1
+LEAD = 2
+
+
+class ReplayWriter:
+    """
+    Streams a game's seed and clicks to a replay file.
+
+    When used as a context manager, leaving the block without close(frame)
+    closes the file with no end record, so the replay plays until game over.
+    """
+
+    def __init__(self, path, seed, step_rate, waves_digest):
+        """
+        Creates the file and writes the header.
+
+        Args:
+            path (str): The replay file to write.
+            seed (int): The seed of the recorded Simulation.
+            step_rate (int): The step rate of the recorded Simulation.
+            waves_digest (int): waves.digest() of its waves.
+        """
+        # Held open for the whole game; closed by close() or __exit__.
+        self.file = open(path, "wb")  # noqa: SIM115
+        self.file.write(HEADER.pack(MAGIC, VERSION, step_rate, seed, waves_digest))
+        self.file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.file.close()
+
+    def record(self, frame, pos, lead=0.0):
+        """Appends a click applied before step `frame`."""
+        if lead:
+            self.file.write(RECORD.pack(LEAD, frame, round(lead * 1000), 0))
+        self.file.write(RECORD.pack(CLICK, frame, pos[0], pos[1]))
+        self.file.flush()
+
+    def close(self, frame):
+        """Writes the end record and closes the file."""
+        if not self.file.closed:
+            self.file.write(RECORD.pack(END, frame, 0, 0))
+            self.file.close()
+
+
+def record(simulation, path):
+    """
+    Starts recording every click fired into a simulation.
+
+    Args:
+        simulation (Simulation): A simulation created with an explicit seed.
+        path (str): The replay file to write.
+
+    Returns:
+        ReplayWriter: The writer; close it with the final frame.
+    """
+    writer = ReplayWriter(
+        path, simulation.seed, simulation.step_rate, digest(simulation.waves)
+    )
+    simulation.recorder = writer
+    return writer
+
+
+class Replay:
+    """A loaded replay that can drive a Simulation."""
+
+    def __init__(self, seed, step_rate, clicks, end_frame=None, waves_digest=None):
+        """
+        Args:
+            seed (int): The seed of the recorded game.
+            step_rate (int): The step rate of the recorded game.
+            clicks (dict[int, list[tuple[int, int, float]]]): Clicks by
+                frame, as (x, y, lead).
+            end_frame (int | None): The frame recording stopped at, or None
+                if the file was cut short.
+            waves_digest (int | None): waves.digest() of the recorded
+                game's waves. Defaults to the classic waves.
+        """
+        self.seed = seed
+        self.step_rate = step_rate
+        self.clicks = clicks
+        self.end_frame = end_frame
+        self.waves_digest = digest(None) if waves_digest is None else waves_digest
+
+    @classmethod
+    def load(cls, path):
+        """Reads a replay file."""
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, step_rate, seed, waves_digest = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay file")
+
+        clicks = {}
+        end_frame = None
+        lead = 0.0
+        usable = len(data) - (len(data) - HEADER.size) % RECORD.size
+        for kind, frame, x, y in RECORD.iter_unpack(data[HEADER.size : usable]):
+            if kind == END:
+                end_frame = frame
+                break
+            if kind == LEAD:
+                lead = x / 1000
+                continue
+            clicks.setdefault(frame, []).append((x, y, lead))
+            lead = 0.0
+        return cls(seed, step_rate, clicks, end_frame, waves_digest)
+
+    def check_waves(self, waves):
+        """
+        Makes sure the game is played back with the waves it was recorded with.
+
+        Args:
+            waves (Callable[[int], Wave] | None): The waves to play back
+                with; None means classic.
+
+        Raises:
+            ValueError: If they differ from the recorded waves.
+        """
+        if digest(waves) != self.waves_digest:
+            raise ValueError(
+                "the replay was recorded with other waves; pass the same --waves file"
+            )
+
+    def simulation(self, **kwargs):
+        """
+        Creates a Simulation set up like the recorded one.
+
+        Raises:
+            ValueError: If kwargs["waves"] are not the recorded waves.
+        """
+        self.check_waves(kwargs.get("waves"))
+        return Simulation(seed=self.seed, step_rate=self.step_rate, **kwargs)
+
+    def apply(self, simulation):
+        """Fires the clicks recorded for the simulation's current frame."""
+        for x, y, lead in self.clicks.get(simulation.frame, ()):
+            simulation.fire((x, y), lead)
+
+    def finished(self, simulation):
+        """Returns True once playback has reached the end of the recording."""
+        if simulation.game_over:
+            return True
+        return self.end_frame is not None and simulation.frame >= self.end_frame
+
+    def play(self, simulation=None, on_frame=None, frames=()):
+        """
+        Plays the replay as fast as possible without drawing.
+
+        Args:
+            simulation (Simulation | None): The simulation to drive; a new
+                one is created when omitted.
+            on_frame (Callable[[Simulation], None] | None): Called after
+                each step whose frame number is in `frames`, e.g. to render it.
+            frames (Iterable[int]): The frames to call `on_frame` for.
+
+        Returns:
+            Simulation: The simulation at the end of the replay.
+
+        Raises:
+            ValueError: If the simulation does not use the recorded waves.
+        """
+        if simulation is not None:
+            self.check_waves(simulation.waves)
+        sim = simulation or self.simulation()
+        frames = set(frames)
+        while not self.finished(sim):
+            self.apply(sim)
+            sim.step()
+            if on_frame is not None and sim.frame in frames:
+                on_frame(sim)
+        return sim
+
+
+def render_frame(simulation, path):
+    """Draws the simulation off-screen and saves it as an image."""
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    screen.fill(BLACK)
+    Game(screen, simulation).draw()
+    pygame.image.save(screen, path)
+
+
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Replay recorded games.")
+    parser.add_argument("replays", nargs="+", help="replay files")
+    parser.add_argument(
+        "--render-frames",
+        default="",
+        help="comma-separated frames to save as images",
+    )
+    parser.add_argument("--output-dir", default=".", help="where to save images")
+    parser.add_argument(
+        "--waves",
+        metavar="PATH",
+        help="JSON waves file the replays were recorded with",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Rescores replays at full speed and prints one JSON line per file."""
+    args = parse_args(argv)
+    frames = [int(frame) for frame in args.render_frames.split(",") if frame]
+    level_waves = load(args.waves) if args.waves else None
+    results = []
+    for path in args.replays:
+        name = os.path.splitext(os.path.basename(path))[0]
+
+        def save(sim, name=name):
+            render_frame(sim, os.path.join(args.output_dir, f"{name}_{sim.frame}.png"))
+
+        replay = Replay.load(path)
+        sim = replay.play(replay.simulation(waves=level_waves), save, frames)
+        result = {
+            "replay": path,
+            "seed": sim.seed,
+            "frames": sim.frame,
+            "level": sim.level,
+            "score": sim.score,
+            "game_over": sim.game_over,
+        }
+        print(json.dumps(result))
+        results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    main()
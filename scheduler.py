@@ -0,0 +1,64 @@
+"""
+Frame-based event scheduler.
+
+Projectiles fly in straight lines at constant speed, so the step at which
+each one reaches its target is known when it is launched. The Simulation
+pushes those arrivals (and the next meteor spawn) onto a heap and only looks
+at the events that are due, instead of testing every live object each step.
+
+Events are never removed from the heap. Whoever pushes an event keeps a
+token for it and ignores the event when it pops with an outdated token.
+"""
+
+import heapq
+import itertools
+
+
+class EventScheduler:
+    """Priority queue of (frame, order) keyed events."""
+
+    def __init__(self):
+        self.heap = []
+        self._order = itertools.count()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, frame, kind, item=None, token=None, order=None):
+        """
+        Schedules an event.
+
+        Args:
+            frame (int): The step the event is due at.
+            kind (int): What kind of event this is; chosen by the caller.
+            item (object): The object the event is about.
+            token (object): Compared by the caller to spot outdated events.
+            order (int | None): Tie-breaker among events due at the same
+                frame. Pass the order of an earlier event to keep its place
+                when rescheduling it; a new order is drawn when omitted.
+
+        Returns:
+            int: The event's order.
+        """
+        if order is None:
+            order = next(self._order)
+        heapq.heappush(self.heap, (frame, order, kind, item, token))
+        return order
+
+    def pop_due(self, frame):
+        """
+        Removes and returns every event due at or before `frame`.
+
+        Returns:
+            list[tuple]: (frame, order, kind, item, token) tuples in due
+            order; events of the same frame keep the order they were pushed.
+        """
+        heap = self.heap
+        due = []
+        while heap and heap[0][0] <= frame:
+            due.append(heapq.heappop(heap))
+        return due
+
+    def clear(self):
+        """Drops every scheduled event."""
+        self.heap.clear()
@@ -0,0 +1,255 @@
+"""
+Persistent high scores and run history.
+
+Every finished run is one row of an SQLite table. Two indexes keep the
+queries the leaderboard and analytics need fast at millions of rows:
+(score) for the all-time top N and (day, score) for a day's top N and the
+per-day summaries.
+
+Interactive games write one run per transaction. Headless jobs should use
+writer() instead, which buffers runs and writes each batch in a single
+transaction, so ingesting is not bound by one fsync per game:
+
+    with ScoreStore("scores.db") as store:
+        with store.writer() as writer:
+            for result in results:
+                writer.add(run_from_result(result))
+        print(store.top(10))
+"""
+
+import collections
+import datetime
+import sqlite3
+import time
+
+from settings import BASE_STEP_RATE
+
+# One finished run. played_at is a Unix time; duration is in seconds of
+# game time; source tells player games from headless policies.
+Run = collections.namedtuple(
+    "Run",
+    [
+        "played_at",
+        "seed",
+        "level",
+        "score",
+        "cities_left",
+        "bases_left",
+        "frames",
+        "duration",
+        "source",
+    ],
+)
+
+# A day in the history: the UTC date, the runs finished that day, and their
+# best and mean scores.
+DaySummary = collections.namedtuple("DaySummary", ["day", "runs", "best", "mean"])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    day TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    cities_left INTEGER NOT NULL,
+    bases_left INTEGER NOT NULL,
+    frames INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    source TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_day ON runs (day, score DESC);
+"""
+
+INSERT = (
+    "INSERT INTO runs (played_at, day, seed, level, score, cities_left,"
+    " bases_left, frames, duration, source) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+COLUMNS = ", ".join(Run._fields)
+
+
+def day_of(played_at):
+    """Returns the UTC date of a Unix time as YYYY-MM-DD."""
+    return datetime.datetime.fromtimestamp(played_at, datetime.UTC).strftime("%Y-%m-%d")
+
+
+def run_from_simulation(simulation, played_at=None, source="player"):
+    """
+    Describes a finished Simulation as a Run.
+
+    Args:
+        simulation (Simulation): The finished game.
+        played_at (float | None): When it finished; defaults to now.
+        source (str): Who played it.
+    """
+    return Run(
+        played_at=time.time() if played_at is None else played_at,
+        seed=simulation.seed,
+        level=simulation.level,
+        score=simulation.score,
+        cities_left=len(simulation.cities),
+        bases_left=sum(not base.is_destroyed() for base in simulation.bases),
+        frames=simulation.frame,
+        duration=simulation.frame / simulation.step_rate,
+        source=source,
+    )
+
+
+def run_from_result(result, step_rate=BASE_STEP_RATE, played_at=None, cities=6):
+    """
+    Describes a batch.run_game() result as a Run.
+
+    Args:
+        result (dict): The result.
+        step_rate (int): Step rate the game ran at.
+        played_at (float | None): When it finished; defaults to now.
+        cities (int): Cities a game starts with.
+    """
+    return Run(
+        played_at=time.time() if played_at is None else played_at,
+        seed=result["seed"],
+        level=result["level"],
+        score=result["score"],
+        cities_left=cities - result["cities_lost"],
+        bases_left=result["bases_left"],
+        frames=result["frames"],
+        duration=result["frames"] / step_rate,
+        source=result["policy"],
+    )
+
+
+class ScoreStore:
+    """An SQLite file of finished runs."""
+
+    def __init__(self, path):
+        """
+        Opens the store, creating the file and schema if needed.
+
+        Args:
+            path (str): The database file, or ":memory:".
+        """
+        self.db = sqlite3.connect(path)
+        # WAL lets the leaderboard read while a job writes; NORMAL only
+        # syncs at checkpoints, which is safe with WAL.
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Closes the database."""
+        self.db.close()
+
+    def add(self, run):
+        """Records one run in its own transaction."""
+        self.add_many([run])
+
+    def add_many(self, runs):
+        """
+        Records runs in one transaction.
+
+        Args:
+            runs (Iterable[Run]): The runs.
+
+        Returns:
+            int: Rows written.
+        """
+        rows = [(run.played_at, day_of(run.played_at), *run[1:]) for run in runs]
+        with self.db:
+            self.db.executemany(INSERT, rows)
+        return len(rows)
+
+    def writer(self, batch_size=10_000):
+        """Returns a RunWriter that adds runs in batches of `batch_size`."""
+        return RunWriter(self, batch_size)
+
+    def count(self):
+        """Returns the number of runs recorded."""
+        return self.db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def top(self, n=10, day=None):
+        """
+        Returns the best runs, earliest first among equal scores.
+
+        Args:
+            n (int): Runs to return.
+            day (str | None): Only runs finished on this UTC date
+                (YYYY-MM-DD).
+
+        Returns:
+            list[Run]: The runs, best first.
+        """
+        if day is None:
+            rows = self.db.execute(
+                f"SELECT {COLUMNS} FROM runs ORDER BY score DESC, id LIMIT ?", (n,)
+            )
+        else:
+            rows = self.db.execute(
+                f"SELECT {COLUMNS} FROM runs WHERE day = ?"
+                " ORDER BY score DESC, id LIMIT ?",
+                (day, n),
+            )
+        return [Run(*row) for row in rows]
+
+    def rank(self, score):
+        """Returns the place `score` takes among all runs, starting at 1."""
+        query = "SELECT COUNT(*) FROM runs WHERE score > ?"
+        return self.db.execute(query, (score,)).fetchone()[0] + 1
+
+    def days(self, start=None, end=None):
+        """
+        Summarizes the runs of each day.
+
+        Args:
+            start (str | None): First UTC date to include (YYYY-MM-DD).
+            end (str | None): Last UTC date to include.
+
+        Returns:
+            list[DaySummary]: One summary per day with runs, oldest first.
+        """
+        rows = self.db.execute(
+            "SELECT day, COUNT(*), MAX(score), AVG(score) FROM runs"
+            " WHERE day >= ? AND day <= ? GROUP BY day ORDER BY day",
+            (start or "", end or "9999-12-31"),
+        )
+        return [DaySummary(*row) for row in rows]
+
+
+class RunWriter:
+    """Buffers runs and writes them to a ScoreStore in batches."""
+
+    def __init__(self, store, batch_size=10_000):
+        """
+        Args:
+            store (ScoreStore): Where to write.
+            batch_size (int): Runs per transaction.
+        """
+        self.store = store
+        self.batch_size = batch_size
+        self.pending = []
+        self.written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    def add(self, run):
+        """Buffers a run, writing the batch once it is full."""
+        self.pending.append(run)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered runs."""
+        if self.pending:
+            self.written += self.store.add_many(self.pending)
+            self.pending = []
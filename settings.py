@@ -9,6 +9,20 @@ SCREEN_HEIGHT = 600
 # Frames per second
 FPS = 60
 
+# Fixed-timestep loop. Speeds, lifespans and spawn intervals are tuned per
+# step at BASE_STEP_RATE; other step rates are scaled to the same real time.
+BASE_STEP_RATE = 60
+UPDATE_RATE = 60  # Simulation steps per second
+RENDER_RATE = FPS  # Frames drawn per second, 0 for uncapped
+MAX_CATCHUP_STEPS = 5  # Steps run per frame at most before dropping time
+INPUT_POLL_INTERVAL = 0.001  # Seconds between input polls while waiting
+MAX_INPUT_LEAD = 1.0  # Steps a late click's missile is moved ahead at most
+
+# High scores: the store finished games are recorded in and the number of
+# best scores the game over screen lists.
+SCORES_PATH = "scores.db"
+LEADERBOARD_SIZE = 5
+
 # Colors
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
@@ -17,3 +31,20 @@ WHITE = (255, 255, 255)
 SCORE_PER_METEOR = 25
 BONUS_PER_CITY = 100
 BONUS_PER_AMMO = 5
+
+# Player missiles
+PLAYER_MISSILE_SPEED = 10
+
+# Explosions
+PLAYER_EXPLOSION_RADIUS = 50
+GROUND_EXPLOSION_RADIUS = 30
+EXPLOSION_EXPAND_SPEED = 2
+EXPLOSION_LIFESPAN = 30
+
+# Sprite pools: sprites allocated when a pool is first used, the most each
+# pool keeps and the factor a pool grows by when it runs dry.
+MISSILE_POOL_SIZE = 32
+METEOR_POOL_SIZE = 64
+EXPLOSION_POOL_SIZE = 64
+POOL_MAX_SIZE = 2048
+POOL_GROWTH = 2.0
@@ -0,0 +1,545 @@
+"""
+Headless game simulation for Missile Command.
+
+The Simulation owns all game state and rules (spawning, movement, collisions,
+scoring and level changes). It never touches the display, fonts or the event
+queue, so it can be stepped as fast as the CPU allows. Game renders on top of it.
+"""
+
+import math
+import random
+
+import pygame
+
+from collision import CollisionSystem
+from pool import SpritePool
+from profiler import FrameProfiler
+from scheduler import EventScheduler
+from settings import (
+    BASE_STEP_RATE,
+    BONUS_PER_AMMO,
+    BONUS_PER_CITY,
+    EXPLOSION_EXPAND_SPEED,
+    EXPLOSION_LIFESPAN,
+    EXPLOSION_POOL_SIZE,
+    GROUND_EXPLOSION_RADIUS,
+    MAX_INPUT_LEAD,
+    METEOR_POOL_SIZE,
+    MISSILE_POOL_SIZE,
+    PLAYER_EXPLOSION_RADIUS,
+    PLAYER_MISSILE_SPEED,
+    POOL_GROWTH,
+    POOL_MAX_SIZE,
+    SCORE_PER_METEOR,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+)
+from sprites import City, EnemyMeteor, Explosion, MissileBase, PlayerMissile
+from waves import TargetIndex, classic, generate
+from world import METEOR, MISSILE, EntityWorld
+
+# Scheduler event kinds for the next meteor spawn and meteor splits.
+# Arrivals use the world's MISSILE and METEOR kinds.
+SPAWN = 0
+SPLIT = 4
+
+
+class ProjectileGroup(pygame.sprite.Group):
+    """
+    A sprite group that notes every projectile added to it.
+
+    Simulation.track() schedules the projectiles it launches itself. Sprites
+    added to player_missiles or enemy_meteors directly are noted here and
+    tracked at the start of the next step, so they are never ignored.
+    """
+
+    def __init__(self, kind, added):
+        """
+        Args:
+            kind (int): world.MISSILE or world.METEOR.
+            added (dict): Receives each added sprite, mapped to `kind`.
+        """
+        super().__init__()
+        self.kind = kind
+        self.added = added
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.added[sprite] = self.kind
+
+
+class Simulation:
+    """Fixed-step game state without any rendering."""
+
+    def __init__(
+        self, seed=None, verbose=False, vectorized=False, step_rate=None, waves=None
+    ):
+        """
+        Initializes a new game.
+
+        Args:
+            seed (int | None): Seed for the simulation's random generator.
+                The same seed and inputs always produce the same game.
+            verbose (bool): Print a message when a new level starts.
+            vectorized (bool): Keep missiles, meteors and explosions in a
+                NumPy EntityWorld and update them in batches. Sprites are
+                then only synced by sync_views() for drawing.
+            step_rate (int | None): Steps per second of game time. Speeds and
+                durations are scaled so the game plays at the same real-time
+                pace at any rate. Defaults to BASE_STEP_RATE.
+            waves (Callable[[int], Wave] | None): The wave of each level,
+                see the waves module. Defaults to waves.classic.
+        """
+        self.step_rate = step_rate or BASE_STEP_RATE
+        self.time_scale = BASE_STEP_RATE / self.step_rate
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.verbose = verbose
+        self.waves = waves or classic
+        # Receives every fire() call as record(frame, target_pos); see replay.
+        self.recorder = None
+        # A profiler.FrameProfiler timing the phases of step(), or None.
+        self.profiler: FrameProfiler | None = None
+        self.world = EntityWorld() if vectorized else None
+
+        self.all_sprites = pygame.sprite.Group()
+        self.cities = pygame.sprite.Group()
+        self.bases = pygame.sprite.Group()
+        # Projectiles added but not tracked yet, in the order they came.
+        self._untracked = {}
+        self.player_missiles = ProjectileGroup(MISSILE, self._untracked)
+        self.enemy_meteors = ProjectileGroup(METEOR, self._untracked)
+        self.explosions = pygame.sprite.Group()
+        # Killed missiles, meteors and explosions are reused from here. The
+        # pools fill on first use, so that creating a Simulation (restoring
+        # a snapshot, resetting an environment) stays cheap.
+        self.pools = {
+            "missiles": SpritePool(
+                lambda: PlayerMissile((0, 0), (0, 0)),
+                MISSILE_POOL_SIZE,
+                POOL_MAX_SIZE,
+                POOL_GROWTH,
+                lazy=True,
+            ),
+            "meteors": SpritePool(
+                lambda: EnemyMeteor((0, 0), (0, 0)),
+                METEOR_POOL_SIZE,
+                POOL_MAX_SIZE,
+                POOL_GROWTH,
+                lazy=True,
+            ),
+            "explosions": SpritePool(
+                lambda: Explosion((0, 0)),
+                EXPLOSION_POOL_SIZE,
+                POOL_MAX_SIZE,
+                POOL_GROWTH,
+                lazy=True,
+            ),
+        }
+
+        self.frame = 0
+        self.missiles_fired = 0
+        self.score = 0
+        self.game_over = False
+
+        self.level = 0
+        self.meteors_to_spawn_this_level = 0
+        self.meteors_spawned_this_level = 0
+        self._setup_initial_sprites()
+        self.collisions = CollisionSystem(self.cities, self.bases)
+
+        # Live cities and bases that meteors can aim at.
+        self.targets = TargetIndex(self.cities, self.bases)
+
+        # Arrivals, spawns and splits are scheduled ahead instead of polled.
+        self.events = EventScheduler()
+        self._next_token = 0
+        self._spawn_token = None
+        self._start_new_level()
+
+    def per_step(self, amount):
+        """Converts a per-base-step amount (a speed) to this step rate."""
+        return amount if self.time_scale == 1 else amount * self.time_scale
+
+    def steps_for(self, count):
+        """Converts a duration in base steps to steps at this step rate."""
+        return count if self.time_scale == 1 else max(1, round(count / self.time_scale))
+
+    def _token(self):
+        """Returns a new token for a scheduled event."""
+        self._next_token += 1
+        return self._next_token
+
+    def _start_new_level(self):
+        """Initializes parameters for a new game level."""
+        self.level += 1
+        self.set_wave(self.random.getrandbits(32), self.frame)
+        if self.verbose:
+            print(
+                f"Starting Level {self.level} with "
+                f"{self.meteors_to_spawn_this_level} meteors."
+            )
+
+    def set_wave(self, wave_seed, start_frame, spawned=0):
+        """
+        Loads the current level's spawn table and schedules its next spawn.
+
+        Args:
+            wave_seed (int): Seed the level's table is generated from.
+            start_frame (int): Frame the level started at; spawn times in
+                the table count from here.
+            spawned (int): Meteors of the table already spawned.
+        """
+        self.wave = self.waves(self.level)
+        self.wave_seed = wave_seed
+        self.spawn_table = generate(self.wave, wave_seed)
+        self.level_start_frame = start_frame
+        self.meteors_to_spawn_this_level = len(self.spawn_table.times)
+        self.meteors_spawned_this_level = spawned
+        self._schedule_spawn()
+
+    def _schedule_spawn(self):
+        """Schedules the next meteor of the spawn table, if any is left."""
+        self._spawn_token = self._token()
+        index = self.meteors_spawned_this_level
+        if index < self.meteors_to_spawn_this_level:
+            due = self.level_start_frame + self.steps_for(self.spawn_table.times[index])
+            self.events.push(max(due, self.frame + 1), SPAWN, token=self._spawn_token)
+
+    def _spawn_meteor(self):
+        """Spawns the next meteor of the spawn table."""
+        table = self.spawn_table
+        index = self.meteors_spawned_this_level
+        target = self.targets.pick(table.aims[index])
+        if target is None:
+            return
+
+        meteor = self.add_meteor(
+            (table.xs[index], 0),
+            target.rect.center,
+            self.per_step(table.speeds[index]),
+        )
+        if table.splits[index]:
+            self.schedule_split(
+                meteor, self.frame + self.steps_for(table.splits[index]), index
+            )
+        self.meteors_spawned_this_level += 1
+        self._schedule_spawn()
+
+    def schedule_split(self, meteor, frame, row):
+        """
+        Makes a meteor split into warheads at `frame`.
+
+        Args:
+            meteor (EnemyMeteor): The meteor.
+            frame (int): The step it splits at.
+            row (int): Its row in the spawn table, which holds the warheads'
+                target fractions.
+        """
+        meteor.split_frame = frame
+        meteor.split_row = row
+        meteor.split_token = token = self._token()
+        self.events.push(frame, SPLIT, meteor, token)
+
+    def _split(self, meteor):
+        """Replaces a meteor by the warheads listed in its table row."""
+        if self.world is not None:
+            x, y = self.world.pos[meteor.world_slot]
+        else:
+            x, y = meteor.current_pos
+        start_pos = (int(x), int(y))
+        fractions = self.spawn_table.split_aims[meteor.split_row]
+        self._remove(meteor)
+        for fraction in fractions:
+            target = self.targets.pick(fraction)
+            if target is not None:
+                self.add_meteor(start_pos, target.rect.center, meteor.speed)
+
+    def add_meteor(self, start_pos, target_pos, speed):
+        """
+        Adds an enemy meteor to the game.
+
+        Args:
+            start_pos (tuple[int, int]): The starting (x, y) coordinates.
+            target_pos (tuple[int, int]): The target (x, y) coordinates.
+            speed (float): Pixels per step.
+
+        Returns:
+            EnemyMeteor: The new meteor.
+        """
+        meteor = self.pools["meteors"].acquire(
+            start_pos, target_pos, speed, groups=(self.all_sprites, self.enemy_meteors)
+        )
+        meteor.split_frame = 0
+        meteor.split_token = None
+        self.track(meteor, METEOR)
+        return meteor
+
+    def _setup_initial_sprites(self):
+        """Create initial cities and missile bases."""
+        ground_level = SCREEN_HEIGHT - 50
+
+        # Setup missile bases
+        base_positions = [100, SCREEN_WIDTH // 2, SCREEN_WIDTH - 100]
+        for pos in base_positions:
+            MissileBase(
+                pos - 20, ground_level, 40, 20, 10, self.all_sprites, self.bases
+            )
+
+        # Setup cities
+        city_positions = []
+        # Cities to the right of the left base
+        for i in range(3):
+            city_positions.append(base_positions[0] + 50 + i * 60)
+        # Cities to the left of the right base
+        for i in range(3):
+            city_positions.append(base_positions[2] - 90 - i * 60)
+
+        for pos in city_positions:
+            City(pos, ground_level + 5, 50, 30, self.all_sprites, self.cities)
+
+    def fire(self, target_pos, lead=0.0):
+        """
+        Fires a missile from the closest usable base.
+
+        Args:
+            target_pos (tuple[int, int]): The point the missile explodes at.
+            lead (float): Steps to move the missile ahead along its path,
+                making up for the time the click waited for this step. Kept
+                in whole thousandths (as stored in replays), at most
+                MAX_INPUT_LEAD, and never so far that the missile passes
+                its target.
+
+        Returns:
+            PlayerMissile | None: The new missile, or None if no base can fire.
+        """
+        # Targets are whole pixels, as stored in replays and snapshots.
+        target_pos = (int(target_pos[0]), int(target_pos[1]))
+        lead = min(max(round(lead, 3), 0.0), MAX_INPUT_LEAD)
+        if self.recorder is not None:
+            self.recorder.record(self.frame, target_pos, lead)
+        if self.game_over:
+            return None
+        closest_base = self.find_closest_base(target_pos)
+        if not closest_base:
+            return None
+        missile = closest_base.fire_missile(
+            target_pos,
+            self.all_sprites,
+            self.player_missiles,
+            speed=self.per_step(PLAYER_MISSILE_SPEED),
+            pool=self.pools["missiles"],
+        )
+        if lead and missile.speed > 0:
+            steps = missile.current_pos.distance_to(target_pos) / missile.speed
+            missile.current_pos += missile.velocity * min(lead, max(steps - 1, 0.0))
+            missile.rect.center = (
+                int(missile.current_pos.x),
+                int(missile.current_pos.y),
+            )
+        self.missiles_fired += 1
+        self.track(missile, MISSILE)
+        return missile
+
+    def track(self, sprite, kind):
+        """
+        Starts simulating a new missile or meteor.
+
+        In vectorized mode the projectile is added to the world. Otherwise
+        its arrival is scheduled from its current position and velocity.
+        Projectiles added to player_missiles or enemy_meteors without a
+        call to track() are tracked by the next step().
+
+        Args:
+            sprite (PlayerMissile | EnemyMeteor): The projectile.
+            kind (int): world.MISSILE or world.METEOR.
+        """
+        self._untracked.pop(sprite, None)
+        if self.world is not None:
+            self.world.add_projectile(sprite, kind)
+            return
+        steps = sprite.steps_to_target()
+        if steps is not None:
+            sprite.arrival_token = token = self._token()
+            self.events.push(self.frame + steps, kind, sprite, token)
+
+    def find_closest_base(self, target_pos):
+        """Finds the closest active missile base to the target position."""
+        closest_base = None
+        min_distance = float("inf")
+
+        for base in self.bases:
+            if not base.is_destroyed() and base.ammo > 0:
+                distance = math.hypot(
+                    base.rect.centerx - target_pos[0], base.rect.centery - target_pos[1]
+                )
+                if distance < min_distance:
+                    min_distance = distance
+                    closest_base = base
+        return closest_base
+
+    def step(self):
+        """Advance the game by one simulation step."""
+        if self.game_over:
+            return
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start()
+
+        if self._untracked:
+            for sprite, kind in list(self._untracked.items()):
+                if sprite.alive():
+                    self.track(sprite, kind)
+            self._untracked.clear()
+        self.frame += 1
+        due = self.events.pop_due(self.frame)
+        for _, _, kind, item, token in due:
+            if kind == SPAWN and token == self._spawn_token:
+                self._spawn_meteor()
+            elif kind == SPLIT and item.split_token == token and item.alive():
+                self._split(item)
+        if profiler is not None:
+            profiler.mark("spawn")
+
+        arrived_missiles, landed_meteors = self._move(due)
+        if profiler is not None:
+            profiler.mark("move")
+        for missile in arrived_missiles:
+            self.add_explosion(missile.target_pos, PLAYER_EXPLOSION_RADIUS)
+            self._remove(missile)
+        for meteor, center in landed_meteors:
+            self.add_explosion(center, GROUND_EXPLOSION_RADIUS)
+            self._remove(meteor)
+        if profiler is not None:
+            profiler.mark("arrivals")
+
+        self._resolve_collisions()
+        if profiler is not None:
+            profiler.mark("collisions")
+
+        if (
+            self.meteors_spawned_this_level == self.meteors_to_spawn_this_level
+            and not self.enemy_meteors
+        ):
+            for city in self.cities:
+                self.score += BONUS_PER_CITY
+            for base in self.bases:
+                if not base.is_destroyed():
+                    self.score += BONUS_PER_AMMO * base.ammo
+
+            self._start_new_level()
+
+        if not self.cities:
+            self.game_over = True
+        if profiler is not None:
+            profiler.mark("level_end")
+
+    def _move(self, due):
+        """
+        Moves every entity by one step.
+
+        Args:
+            due (list[tuple]): The scheduler events due this step. Only the
+                projectiles with a due arrival are tested; those that turn
+                out not to have arrived yet are checked again next step.
+
+        Returns:
+            tuple[list, list]: Missiles that reached their target, and
+            (meteor, rect center) pairs for meteors that reached the ground.
+        """
+        if self.world is None:
+            self.all_sprites.update()
+            missiles = []
+            meteors = []
+            for _, order, kind, sprite, token in due:
+                if kind == SPAWN or kind == SPLIT:
+                    continue
+                if sprite.arrival_token != token or not sprite.alive():
+                    continue  # Destroyed, or reused by its pool.
+                if kind == MISSILE:
+                    if sprite.is_at_target():
+                        missiles.append(sprite)
+                        continue
+                elif sprite.has_reached_target():
+                    meteors.append((sprite, sprite.rect.center))
+                    continue
+                self.events.push(self.frame + 1, kind, sprite, token, order)
+            return missiles, meteors
+
+        removed, missiles, meteors = self.world.step()
+        for sprite in removed:
+            sprite.kill()
+        return missiles, [(m, self.world.center(m.world_slot)) for m in meteors]
+
+    def _resolve_collisions(self):
+        """Destroys meteors, cities and bases caught in an explosion."""
+        if self.world is None:
+            hits = self.collisions.collide(self.explosions, self.enemy_meteors)
+            for meteor in hits.meteors:
+                meteor.kill()
+            self.score += SCORE_PER_METEOR * len(hits.meteors)
+            for city in hits.cities:
+                self.collisions.remove_city(city)
+                self.targets.remove(city)
+                city.kill()
+            for base in hits.bases:
+                self.targets.remove(base)
+                base.destroy()
+            return
+
+        destroyed_meteors = self.world.meteor_hits()
+        for meteor in destroyed_meteors:
+            self._remove(meteor)
+        self.score += SCORE_PER_METEOR * len(destroyed_meteors)
+
+        for city in self.world.structure_hits(self.cities):
+            self.targets.remove(city)
+            city.kill()
+        for base in self.world.structure_hits(self.bases):
+            self.targets.remove(base)
+            base.destroy()
+
+    def add_explosion(self, pos, max_radius):
+        """Creates an explosion at `pos`."""
+        explosion = self.pools["explosions"].acquire(
+            pos,
+            max_radius,
+            self.per_step(EXPLOSION_EXPAND_SPEED),
+            self.steps_for(EXPLOSION_LIFESPAN),
+            groups=(self.all_sprites, self.explosions),
+        )
+        if self.world is not None:
+            self.world.add_explosion(explosion)
+        return explosion
+
+    def _remove(self, sprite):
+        """Removes a missile, meteor or explosion from the game."""
+        if self.world is not None:
+            self.world.remove(sprite.world_slot)
+        sprite.kill()
+
+    def pool_stats(self):
+        """Returns the stats of every sprite pool, keyed by pool name."""
+        return {name: pool.stats() for name, pool in self.pools.items()}
+
+    def sync_views(self):
+        """Brings sprite positions up to date before they are drawn."""
+        if self.world is not None:
+            self.world.sync_views()
+
+    def run(self, max_frames=None):
+        """
+        Steps the simulation until the game is over.
+
+        Args:
+            max_frames (int | None): Stop after this many steps even if the
+                game is still running.
+
+        Returns:
+            int: The number of steps taken.
+        """
+        steps = 0
+        while not self.game_over and (max_frames is None or steps < max_frames):
+            self.step()
+            steps += 1
+        return steps
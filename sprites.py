@@ -4,12 +4,75 @@ Sprite classes for Missile Command.
 
 import math
 import pygame
-from settings import WHITE
+from settings import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    WHITE,
+    PLAYER_EXPLOSION_RADIUS,
+    GROUND_EXPLOSION_RADIUS,
+    EXPLOSION_EXPAND_SPEED,
+    PLAYER_MISSILE_SPEED,
+)
+from pool import Poolable
 
+# Playfield bounds used for off-screen culling. Kept as a constant so that
+# sprites can be updated without a display (headless simulation).
+SCREEN_RECT = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
 
-class City(pygame.sprite.Sprite):
+# Color of a destroyed missile base.
+DESTROYED_COLOR = (80, 80, 80)
+
+# Process-wide cache of solid-color images, keyed by (size, color).
+_solid_images = {}
+
+
+def solid_image(size, color=WHITE):
+    """
+    Returns a shared surface filled with one color.
+
+    Sprites of the same size and color share one image, which saves a
+    surface per sprite and lets renderers draw them in batches per image.
+    The surfaces are shared and must be treated as immutable: never draw on
+    them, swap in another image instead.
+
+    Args:
+        size (tuple[int, int]): Width and height.
+        color (tuple[int, int, int]): The fill color.
+
+    Returns:
+        pygame.Surface: The image.
+    """
+    key = (tuple(size), color)
+    image = _solid_images.get(key)
+    if image is None:
+        image = pygame.Surface(size)
+        image.fill(color)
+        _solid_images[key] = image
+    return image
+
+
+def cached_image_count():
+    """Returns how many shared solid-color images have been created."""
+    return len(_solid_images)
+
+
+class CompactSprite(pygame.sprite.Sprite):
+    """
+    Base for sprites that keep their attributes in __slots__.
+
+    pygame.sprite.Sprite has no slots of its own, only the group set it
+    stores as _Sprite__g. Giving that a slot too means an entity never
+    allocates a __dict__ unless something sets an undeclared attribute.
+    """
+
+    __slots__ = ("_Sprite__g",)
+
+
+class City(CompactSprite):
     """Represents a city to be protected."""
 
+    __slots__ = ("image", "rect")
+
     def __init__(self, x, y, width=50, height=30, *groups):
         """
         Initializes a City sprite.
@@ -21,16 +84,17 @@ class City(pygame.sprite.Sprite):
             height (int): The height of the city.
         """
         super().__init__(*groups)
-        self.image = pygame.Surface([width, height])
-        self.image.fill(WHITE)
+        self.image = solid_image((width, height))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
 
 
-class MissileBase(pygame.sprite.Sprite):
+class MissileBase(CompactSprite):
     """Represents a missile base that fires missiles."""
 
+    __slots__ = ("ammo", "image", "is_alive", "rect")
+
     def __init__(self, x, y, width=40, height=20, ammo=10, *groups):
         """
         Initializes a MissileBase sprite.
@@ -43,8 +107,7 @@ class MissileBase(pygame.sprite.Sprite):
             ammo (int): The initial number of missiles.
         """
         super().__init__(*groups)
-        self.image = pygame.Surface([width, height])
-        self.image.fill(WHITE)
+        self.image = solid_image((width, height))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -59,19 +122,45 @@ class MissileBase(pygame.sprite.Sprite):
         """Destroys the base."""
         if self.is_alive:
             self.is_alive = False
-            self.image.fill((80, 80, 80))
+            # Swap images rather than filling in place: the image is shared,
+            # and renderers that track images by identity see the change.
+            self.image = solid_image(self.rect.size, DESTROYED_COLOR)
+
+    def fire_missile(self, target_pos, *groups, speed=PLAYER_MISSILE_SPEED, pool=None):
+        """
+        Fire a missile if ammo is available.
 
-    def fire_missile(self, target_pos, *groups):
-        """Fire a missile if ammo is available."""
+        Args:
+            target_pos (tuple[int, int]): The point the missile flies to.
+            *groups: Groups to add the missile to.
+            speed (float): Pixels per step.
+            pool (SpritePool | None): Pool to take the missile from.
+        """
         if self.ammo > 0 and self.is_alive:
             self.ammo -= 1
-            return PlayerMissile(self.rect.midtop, target_pos, 10, *groups)
+            if pool is not None:
+                return pool.acquire(self.rect.midtop, target_pos, speed, groups=groups)
+            return PlayerMissile(self.rect.midtop, target_pos, speed, *groups)
         return None
 
 
-class PlayerMissile(pygame.sprite.Sprite):
+class PlayerMissile(Poolable, CompactSprite):
     """Represents a missile fired by the player."""
 
+    __slots__ = (
+        "arrival_token",
+        "current_pos",
+        "image",
+        "pool",
+        "pooled",
+        "rect",
+        "speed",
+        "start_pos",
+        "target_pos",
+        "velocity",
+        "world_slot",
+    )
+
     def __init__(self, start_pos, target_pos, speed=10, *groups):
         """
         Initializes a PlayerMissile sprite.
@@ -82,8 +171,11 @@ class PlayerMissile(pygame.sprite.Sprite):
             speed (int): The speed of the missile.
         """
         super().__init__(*groups)
-        self.image = pygame.Surface([4, 4])
-        self.image.fill(WHITE)
+        self.image = solid_image((4, 4))
+        self.reset(start_pos, target_pos, speed)
+
+    def reset(self, start_pos, target_pos, speed):
+        """Starts a new flight, keeping the image; used by SpritePool."""
         self.rect = self.image.get_rect(center=start_pos)
 
         self.start_pos = start_pos
@@ -100,17 +192,48 @@ class PlayerMissile(pygame.sprite.Sprite):
         self.current_pos += self.velocity
         self.rect.center = (int(self.current_pos.x), int(self.current_pos.y))
 
-        if not pygame.display.get_surface().get_rect().colliderect(self.rect):
+        if not SCREEN_RECT.colliderect(self.rect):
             self.kill()
 
     def is_at_target(self):
         """Check if the missile has reached its target."""
         return self.current_pos.distance_to(self.target_pos) < self.speed
 
+    def steps_to_target(self):
+        """
+        Predicts when is_at_target() may first become true.
+
+        Returns:
+            int | None: Updates from now, erring one update early so that
+            rounding never makes the prediction late; None if the missile
+            cannot move.
+        """
+        if self.speed <= 0:
+            return None
+        distance = self.current_pos.distance_to(self.target_pos)
+        return max(1, math.floor(distance / self.speed) - 1)
+
 
-class EnemyMeteor(pygame.sprite.Sprite):
+class EnemyMeteor(Poolable, CompactSprite):
     """Represents an enemy meteor falling from the sky."""
 
+    __slots__ = (
+        "arrival_token",
+        "current_pos",
+        "image",
+        "pool",
+        "pooled",
+        "rect",
+        "speed",
+        "split_frame",
+        "split_row",
+        "split_token",
+        "start_pos",
+        "target_pos",
+        "velocity",
+        "world_slot",
+    )
+
     def __init__(self, start_pos, target_pos, speed=2.0, *groups):
         """
         Initializes an EnemyMeteor sprite.
@@ -121,8 +244,11 @@ class EnemyMeteor(pygame.sprite.Sprite):
             speed (float): The speed of the meteor.
         """
         super().__init__(*groups)
-        self.image = pygame.Surface([10, 10])
-        self.image.fill(WHITE)
+        self.image = solid_image((10, 10))
+        self.reset(start_pos, target_pos, speed)
+
+    def reset(self, start_pos, target_pos, speed):
+        """Starts a new flight, keeping the image; used by SpritePool."""
         self.rect = self.image.get_rect(center=start_pos)
 
         self.start_pos = start_pos
@@ -139,18 +265,149 @@ class EnemyMeteor(pygame.sprite.Sprite):
         self.current_pos += self.velocity
         self.rect.center = (int(self.current_pos.x), int(self.current_pos.y))
 
-        if not pygame.display.get_surface().get_rect().colliderect(self.rect):
+        if not SCREEN_RECT.colliderect(self.rect):
             self.kill()
 
     def has_reached_target(self):
         """Check if the meteor has reached or passed its target y-coordinate."""
         return self.current_pos.y >= self.target_pos[1]
 
+    def steps_to_target(self):
+        """
+        Predicts when has_reached_target() may first become true.
+
+        Returns:
+            int | None: Updates from now, erring one update early so that
+            rounding never makes the prediction late; None if the meteor
+            never gets lower.
+        """
+        remaining = self.target_pos[1] - self.current_pos.y
+        if self.velocity.y <= 0:
+            return 1 if remaining <= 0 else None
+        return max(1, math.ceil(remaining / self.velocity.y) - 1)
+
+
+# Process-wide cache of pre-rendered explosion frames, keyed by
+# (max_radius, expand_speed, color).
+_explosion_frames = {}
+
+
+def explosion_frames(max_radius, expand_speed, color=WHITE):
+    """
+    Returns the pre-rendered frames of an explosion.
+
+    Frame i shows the circle after i updates, i.e. with radius
+    i * expand_speed. All frames are subsurfaces of one atlas surface that
+    is rendered the first time a key is requested and shared afterwards.
+
+    Args:
+        max_radius (int): The maximum radius of the explosion.
+        expand_speed (float): The speed at which the explosion expands.
+        color (tuple[int, int, int]): The color of the explosion.
+
+    Returns:
+        list[pygame.Surface]: The frames, in update order.
+    """
+    key = (max_radius, expand_speed, color)
+    frames = _explosion_frames.get(key)
+    if frames is None:
+        count = int(max_radius // expand_speed) + 1 if expand_speed > 0 else 1
+        size = max_radius * 2
+        atlas = pygame.Surface([size * count, size], pygame.SRCALPHA)
+        frames = []
+        for i in range(count):
+            frame = atlas.subsurface((i * size, 0, size, size))
+            pygame.draw.circle(frame, color, (max_radius, max_radius), i * expand_speed)
+            frames.append(frame)
+        _explosion_frames[key] = frames
+    return frames
+
+
+def cached_explosion_count():
+    """Returns how many explosion frame atlases have been rendered."""
+    return len(_explosion_frames)
+
+
+# Outline versions of explosion frames, keyed by the filled frame.
+_simple_frames = {}
+
+
+def simple_explosion_frames(max_radius, expand_speed, color=WHITE):
+    """
+    Returns cheap outline versions of explosion_frames().
+
+    The frames are colorkeyed and RLE-encoded rings rather than per-pixel
+    alpha discs, so blitting one touches only the ring. Each is registered
+    under its filled frame for simplified().
+
+    Args:
+        max_radius (int): The maximum radius of the explosion.
+        expand_speed (float): The speed at which the explosion expands.
+        color (tuple[int, int, int]): The color of the explosion.
+
+    Returns:
+        list[pygame.Surface]: The frames, in update order.
+    """
+    frames = explosion_frames(max_radius, expand_speed, color)
+    simple = [_simple_frames.get(frame) for frame in frames]
+    if None in simple:
+        size = max_radius * 2
+        background = (0, 0, 0) if color != (0, 0, 0) else (255, 255, 255)
+        for i, frame in enumerate(frames):
+            ring = pygame.Surface((size, size))
+            ring.fill(background)
+            radius = i * expand_speed
+            if radius:
+                pygame.draw.circle(ring, color, (max_radius, max_radius), radius, 2)
+            ring.set_colorkey(background, pygame.RLEACCEL)
+            _simple_frames[frame] = simple[i] = ring
+    return simple
+
+
+def preload_simple_explosion_frames():
+    """Renders outline frames for every explosion rendered so far."""
+    for key in list(_explosion_frames):
+        simple_explosion_frames(*key)
+
+
+def simplified(image):
+    """Returns the outline version of an explosion frame, or `image` itself."""
+    return _simple_frames.get(image, image)
+
+
+def preload_explosion_frames(expand_speed=float(EXPLOSION_EXPAND_SPEED)):
+    """
+    Renders the frames of the explosions the game creates.
+
+    Args:
+        expand_speed (float): Explosion growth per step, as
+            Simulation.per_step() gives it for the game's step rate.
+    """
+    for max_radius in (PLAYER_EXPLOSION_RADIUS, GROUND_EXPLOSION_RADIUS):
+        explosion_frames(max_radius, expand_speed)
 
-class Explosion(pygame.sprite.Sprite):
+
+class Explosion(Poolable, CompactSprite):
     """Represents an explosion."""
 
-    def __init__(self, pos, max_radius=50, expand_speed=2, lifespan=30, *groups):
+    __slots__ = (
+        "current_radius",
+        "expand_speed",
+        "frames",
+        "image",
+        "lifespan",
+        "max_radius",
+        "pool",
+        "pooled",
+        "pos",
+        "radius",
+        "rect",
+        "world_slot",
+    )
+
+    def __init__(
+        self, pos, max_radius=50, expand_speed=2, lifespan=30, *groups, color=WHITE
+    ):
         """
         Initializes an Explosion sprite.
 
@@ -159,8 +416,13 @@ class Explosion(pygame.sprite.Sprite):
             max_radius (int): The maximum radius of the explosion.
             expand_speed (int): The speed at which the explosion expands.
             lifespan (int): The duration of the explosion in frames.
+            color (tuple[int, int, int]): The color of the explosion.
         """
         super().__init__(*groups)
+        self.reset(pos, max_radius, expand_speed, lifespan, color)
+
+    def reset(self, pos, max_radius=50, expand_speed=2, lifespan=30, color=WHITE):
+        """Restarts the explosion at `pos`; used by SpritePool."""
         self.pos = pos
         self.max_radius = max_radius
         self.current_radius = 0
@@ -168,9 +430,9 @@ class Explosion(pygame.sprite.Sprite):
         self.lifespan = lifespan
         self.radius = 0  # Add radius attribute for collision detection
 
-        self.image = pygame.Surface(
-            [self.max_radius * 2, self.max_radius * 2], pygame.SRCALPHA
-        )
+        # Frames are shared between explosions; an explosion never draws.
+        self.frames = explosion_frames(max_radius, expand_speed, color)
+        self.image = self.frames[0]
         self.rect = self.image.get_rect(center=self.pos)
 
     def update(self):
@@ -183,8 +445,10 @@ class Explosion(pygame.sprite.Sprite):
             self.kill()
             return
 
-        self.image.fill((0, 0, 0, 0))  # Clear the surface
-        pygame.draw.circle(
-            self.image, WHITE, (self.max_radius, self.max_radius), self.current_radius
-        )
-        self.rect = self.image.get_rect(center=self.pos)
+        self.render()
+
+    def render(self):
+        """Select the cached frame for the current radius."""
+        if self.expand_speed > 0:
+            index = round(self.current_radius / self.expand_speed)
+            self.image = self.frames[min(index, len(self.frames) - 1)]
@@ -0,0 +1,71 @@
+"""
+Startup timing.
+
+StartupTimer splits the time from process start to the first presented
+frame into named phases, so a slow launch can be traced to imports, the
+display, the first simulation or the first draw:
+
+    timer = StartupTimer()
+    with timer.phase("display"):
+        screen = pygame.display.set_mode(size)
+    print(timer.report())
+"""
+
+import time
+from contextlib import contextmanager
+
+# Taken when this module is first imported. Entry points import it before
+# anything else, so it approximates the process start.
+IMPORTED_AT = time.perf_counter()
+
+
+class StartupTimer:
+    """Wall-clock durations of the startup phases, in the order they ran."""
+
+    def __init__(self, start=None):
+        """
+        Starts timing.
+
+        Args:
+            start (float | None): time.perf_counter() value the first phase
+                is measured from, e.g. IMPORTED_AT. Defaults to now.
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.phases = []
+        self._last = self.start
+
+    def mark(self, name):
+        """Records the time since the previous mark as phase `name`."""
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Times the body of a with statement as phase `name`.
+
+        Like mark(), the phase runs from the previous mark, so any work
+        between that mark and the with statement is counted in it too and
+        the phases always add up to the total. Mark that work first to
+        keep it apart.
+        """
+        try:
+            yield
+        finally:
+            self.mark(name)
+
+    @property
+    def total(self):
+        """Seconds from the start to the last recorded phase."""
+        return self._last - self.start
+
+    def report(self):
+        """Returns the phases as a table in milliseconds."""
+        width = max((len(name) for name, _ in self.phases), default=0)
+        lines = [
+            f"{name:<{width}}  {seconds * 1000:8.1f} ms"
+            for name, seconds in self.phases
+        ]
+        lines.append(f"{'total':<{width}}  {self.total * 1000:8.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,80 @@
+import csv
+import json
+
+import pytest
+
+import batch
+from simulation import Simulation
+
+
+def test_run_game_is_deterministic():
+    """同じシードとポリシーなら同じ結果になることを確認するテスト。"""
+    for policy in batch.POLICIES:
+        first = batch.run_game(5, policy)
+        assert first == batch.run_game(5, policy)
+        assert set(first) == set(batch.FIELDS)
+        assert first["cities_lost"] == 6
+        assert 0 < first["ammo_used"] <= 30
+
+
+def test_lowest_policy_sees_vectorized_positions():
+    """ベクトル化モードでも最新の隕石位置を狙い、通常モードと同じ標的になることを確認する。"""
+    pytest.importorskip("numpy")
+    targets = []
+    for vectorized in (False, True):
+        sim = Simulation(seed=3, vectorized=vectorized)
+        policy = batch.POLICIES["lowest"](3)
+        fired = []
+        for _ in range(400):
+            target = policy(sim)
+            if target is not None:
+                fired.append(target)
+            sim.step()
+        targets.append(fired)
+
+    assert targets[0] and targets[0] == targets[1]
+
+
+def test_batch_writes_jsonl_and_resumes(tmp_path):
+    """結果がJSONLに書き出され、再開時に済んだシードを飛ばすことを確認する。"""
+    output = str(tmp_path / "results.jsonl")
+
+    assert batch.main(["--games", "3", "--workers", "1", "--output", output]) == 3
+    with open(output, "a") as f:
+        f.write('{"seed": 9')  # 書き込み途中で止まった行
+
+    ran = batch.main(
+        ["--games", "5", "--workers", "2", "--output", output, "--resume", "--quiet"]
+    )
+
+    assert ran == 2
+    assert batch.completed_seeds(output) == {0, 1, 2, 3, 4}
+    with open(output) as f:
+        results = [json.loads(line) for line in f if line.endswith("}\n")]
+    assert sorted(r["seed"] for r in results) == [0, 1, 2, 3, 4]
+
+
+def test_batch_writes_csv(tmp_path):
+    """拡張子が.csvならCSVで書き出すことを確認するテスト。"""
+    output = str(tmp_path / "results.csv")
+
+    batch.main(["--games", "2", "--workers", "1", "--output", output, "--quiet"])
+
+    with open(output, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [int(row["seed"]) for row in rows] == [0, 1]
+
+
+def test_batch_closes_output_when_a_game_fails(tmp_path, monkeypatch):
+    """ゲームが例外を出しても出力ファイルを閉じることを確認するテスト。"""
+    closed = []
+    monkeypatch.setattr(batch.ResultWriter, "close", lambda self: closed.append(1))
+
+    def fail(job):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(batch, "_run_game", fail)
+
+    with pytest.raises(RuntimeError):
+        batch.run_batch([0], str(tmp_path / "results.jsonl"), workers=1)
+    assert closed == [1]
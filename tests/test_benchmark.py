@@ -0,0 +1,39 @@
+import json
+
+import benchmark
+
+
+def test_scenarios_report_frame_metrics():
+    """全シナリオが指標を出力することを確認するテスト。"""
+    results = benchmark.run(frames=5, warmup=1)
+
+    assert set(results["scenarios"]) == set(benchmark.SCENARIOS)
+    for result in results["scenarios"].values():
+        assert result["frames"] == 5
+        assert 0 < result["p50_ms"] <= result["p95_ms"] <= result["max_ms"]
+        assert result["fps"] > 0
+    assert results["scenarios"]["meteors_500"]["entities"] >= 500
+
+
+def test_compare_flags_regressions():
+    """しきい値を超えて遅くなったシナリオだけが報告されることを確認する。"""
+    baseline = {"scenarios": {"a": {"frames": 10, "p50_ms": 1.0, "p95_ms": 2.0}}}
+    fast = {"scenarios": {"a": {"frames": 10, "p50_ms": 1.1, "p95_ms": 2.1}}}
+    slow = {"scenarios": {"a": {"frames": 10, "p50_ms": 1.5, "p95_ms": 2.1}}}
+
+    assert benchmark.compare(fast, baseline, 0.25) == []
+    assert len(benchmark.compare(slow, baseline, 0.25)) == 1
+
+
+def test_main_fails_on_regression(tmp_path):
+    """ベースラインより遅いと終了コード1を返すことを確認するテスト。"""
+    path = tmp_path / "baseline.json"
+    args = ["--scenarios", "idle_level_1", "--frames", "5", "--warmup", "0"]
+
+    assert benchmark.main(args + ["--save-baseline", str(path)]) == 0
+
+    baseline = json.loads(path.read_text())
+    for metric in ("p50_ms", "p95_ms"):
+        baseline["scenarios"]["idle_level_1"][metric] = 1e-9
+    path.write_text(json.dumps(baseline))
+    assert benchmark.main(args + ["--baseline", str(path)]) == 1
@@ -0,0 +1,54 @@
+import random
+
+import pygame
+
+from collision import CollisionSystem, SpatialHash
+from simulation import Simulation
+from sprites import EnemyMeteor, Explosion
+
+
+def test_spatial_hash_matches_collide_circle():
+    """グリッド検索の結果が総当たりの collide_circle と一致することを確認する。"""
+    rng = random.Random(7)
+    meteors = [
+        EnemyMeteor((rng.randint(0, 800), rng.randint(0, 600)), (400, 600))
+        for _ in range(300)
+    ]
+    explosions = []
+    for _ in range(40):
+        explosion = Explosion((rng.randint(0, 800), rng.randint(0, 600)), 50)
+        explosion.radius = rng.randint(0, 50)
+        explosions.append(explosion)
+
+    grid = SpatialHash(cell_size=32)
+    for meteor in meteors:
+        grid.insert(meteor, meteor.rect.center, 0.5 * (10**2 + 10**2) ** 0.5)
+
+    for explosion in explosions:
+        expected = {m for m in meteors if pygame.sprite.collide_circle(explosion, m)}
+        actual = set(grid.query(explosion.rect.center, explosion.radius))
+        assert actual == expected
+
+
+def test_collision_system_reports_each_hit_once():
+    """重なった爆発でも同じ隕石・都市が一度だけ報告されることを確認する。"""
+    sim = Simulation(seed=0)
+    city = sim.cities.sprites()[0]
+    base = sim.bases.sprites()[0]
+    meteor = EnemyMeteor((300, 100), (300, 600))
+    explosions = [Explosion((300, 100), 50) for _ in range(3)]
+    explosions += [Explosion(city.rect.center, 50), Explosion(base.rect.center, 50)]
+    for explosion in explosions:
+        explosion.radius = 20
+
+    system = CollisionSystem(sim.cities, sim.bases)
+    hits = system.collide(explosions, [meteor])
+
+    assert hits.meteors == [meteor]
+    assert city in hits.cities
+    assert base in hits.bases
+    assert len(hits.cities) == len(set(hits.cities))
+
+    system.remove_city(city)
+    hits = system.collide(explosions, [])
+    assert city not in hits.cities
@@ -0,0 +1,90 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from env import BASES, CITIES, VectorEnv, attach
+
+
+def _actions(env, fire=0, x=400, y=300):
+    return np.array([[fire, x, y]] * env.num_envs)
+
+
+def test_buffers_have_fixed_shapes():
+    """観測配列が一度だけ確保され、形状が固定されていることを確認するテスト。"""
+    env = VectorEnv(4, max_meteors=8)
+    obs = env.reset()
+
+    assert obs["meteors"].shape == (4, 8, 4)
+    assert obs["cities"].shape == (4, CITIES)
+    assert obs["ammo"].shape == (4, BASES)
+    assert obs["cities"].all() and obs["bases"].all()
+    step_obs, reward, terminated, truncated, _ = env.step(_actions(env))
+    assert step_obs["meteors"] is obs["meteors"]
+    assert reward.shape == terminated.shape == truncated.shape == (4,)
+
+
+def test_same_seed_same_rollout():
+    """同じシードと行動列から同じ観測が得られることを確認するテスト。"""
+    first, second = VectorEnv(3, seed=5), VectorEnv(3, seed=5)
+    for _ in range(200):
+        a = first.step(_actions(first))[0]["meteors"].copy()
+        b = second.step(_actions(second))[0]["meteors"]
+        assert np.array_equal(a, b)
+    assert first.observation["meteor_count"].any()
+
+
+def test_vectorized_games_observe_the_same():
+    """ベクトル化モードでも同じ観測になることを確認するテスト。"""
+    sprites, world = VectorEnv(2, seed=1), VectorEnv(2, seed=1, vectorized=True)
+    for step in range(150):
+        fire = step % 30 == 0
+        a = sprites.step(_actions(sprites, fire))[0]
+        b = world.step(_actions(world, fire))[0]
+        for name in a:
+            assert np.allclose(a[name], b[name]), name
+
+
+def test_fire_action_spends_ammo():
+    """fire が立った行だけ弾数が減ることを確認するテスト。"""
+    env = VectorEnv(2)
+    before = env.observation["ammo"].sum(axis=1).copy()
+    actions = _actions(env)
+    actions[0, 0] = 1
+    env.step(actions)
+
+    after = env.observation["ammo"].sum(axis=1)
+    assert after[0] == before[0] - 1
+    assert after[1] == before[1]
+
+
+def test_truncated_games_reset_automatically():
+    """max_steps で打ち切られたゲームが自動で再開されることを確認するテスト。"""
+    env = VectorEnv(2, seed=0, max_steps=10)
+    for _ in range(9):
+        _, _, _, truncated, info = env.step(_actions(env))
+        assert not truncated.any() and not info["final_score"]
+    _, _, terminated, truncated, info = env.step(_actions(env))
+
+    assert truncated.all() and not terminated.any()
+    assert set(info["final_score"]) == {0, 1}
+    assert env.episodes == [1, 1]
+    assert env.seeds != env.initial_seeds
+    assert all(game.frame == 0 for game in env.games)
+
+
+def test_shared_observations_are_visible_after_attach():
+    """共有メモリの観測が別のアタッチから見えることを確認するテスト。"""
+    env = VectorEnv(2, max_meteors=16, shared=True)
+    assert env.shm is not None
+    shm, views = attach(env.shm.name, 2, max_meteors=16)
+    try:
+        for _ in range(120):
+            env.step(_actions(env))
+        assert np.array_equal(views["meteors"], env.observation["meteors"])
+        assert (
+            views["meteor_count"].tolist() == env.observation["meteor_count"].tolist()
+        )
+    finally:
+        del views
+        shm.close()
+        env.close()
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+import firecontrol
+from batch import run_game
+from simulation import Simulation
+from waves import Wave
+
+
+def QUIET(level):
+    """追加の隕石を出さないウェーブ。"""
+    return Wave(meteors=1, interval=10**6)
+
+
+def _threatened(seed, meteors=5):
+    sim = Simulation(seed=seed, waves=QUIET)
+    rng = random.Random(seed)
+    targets = [city.rect.center for city in sim.cities]
+    for _ in range(meteors):
+        start = (rng.randint(0, 800), rng.randint(0, 150))
+        sim.add_meteor(start, rng.choice(targets), rng.uniform(0.5, 4))
+    return sim
+
+
+def test_planned_shots_destroy_their_meteors():
+    """計画どおりに撃つと、各隕石が迎撃ステップまでに破壊されることを確認する。"""
+    for seed in range(10):
+        sim = _threatened(seed)
+        plan = firecontrol.plan(sim)
+        assert plan
+        for shot in plan:
+            assert sim.find_closest_base(shot.aim) is shot.base
+            sim.fire(shot.aim)
+        sim.run(max(shot.intercept_step for shot in plan))
+        assert not any(shot.meteor.alive() for shot in plan)
+
+
+def test_plan_is_ranked_and_respects_ammo():
+    """着弾が早い順に並び、基地の弾数を超えないことを確認するテスト。"""
+    sim = _threatened(1, meteors=40)
+    for base in sim.bases:
+        base.ammo = 2
+    plan = firecontrol.plan(sim)
+
+    impacts = [shot.impact_step for shot in plan]
+    assert impacts == sorted(impacts)
+    assert len(plan) <= 6
+    for base in sim.bases:
+        assert sum(shot.base is base for shot in plan) <= 2
+    assert all(shot.intercept_step < shot.impact_step for shot in plan)
+
+
+def test_vectorized_simulation_plans_the_same():
+    """ベクトル化モードでも同じ射撃計画になることを確認するテスト。"""
+    sprites = _threatened(2)
+    world = Simulation(seed=2, vectorized=True, waves=QUIET)
+    for meteor in sprites.enemy_meteors:
+        world.add_meteor(meteor.start_pos, meteor.target_pos, meteor.speed)
+    sprites.run(20)
+    world.run(20)
+
+    assert [shot.aim for shot in firecontrol.plan(sprites)] == [
+        shot.aim for shot in firecontrol.plan(world)
+    ]
+
+
+def test_intercept_policy_plays_a_game():
+    """射撃計画を使うポリシーでゲームを最後まで実行できることを確認する。"""
+    result = run_game(0, "intercept", max_frames=3000)
+    assert result["ammo_used"] > 0 and result["score"] > 0
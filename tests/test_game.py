@@ -184,3 +184,28 @@ def test_explosion_destroys_base(game_with_base):
     # 基地は破壊されてもリストに残るが、aliveフラグがFalseになる
     assert base in game_instance.bases
     assert not list(game_instance.bases)[0].is_alive
+
+
+def test_draw_items_interpolates_between_steps(game_instance):
+    """描画時に前後のステップ間で位置が補間されることを確認するテスト。"""
+    missile = game_instance.simulation.fire((SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+    game_instance.update()
+
+    def drawn_center(alpha):
+        for image, dest in game_instance.draw_items(alpha):
+            if image is missile.image:
+                return dest.center
+
+    assert drawn_center(1.0) == missile.rect.center
+    previous = missile.current_pos - missile.velocity
+    assert drawn_center(0.0) == (int(previous.x), int(previous.y))
+
+
+def test_font_and_hud_are_created_on_first_draw(game_instance):
+    """フォントと HUD が最初の描画まで作られないことを確認するテスト。"""
+    assert game_instance._font is None and game_instance._hud is None
+
+    game_instance.draw()
+
+    assert game_instance._font is not None
+    assert game_instance.hud is game_instance._hud
@@ -0,0 +1,65 @@
+import pygame
+
+from hud import HUD
+from settings import SCREEN_HEIGHT, SCREEN_WIDTH
+from simulation import Simulation
+
+
+class CountingFont:
+    """font.render の呼び出し回数を数えるラッパー。"""
+
+    def __init__(self):
+        pygame.font.init()
+        self.font = pygame.font.Font(None, 36)
+        self.calls = 0
+
+    def render(self, *args):
+        self.calls += 1
+        return self.font.render(*args)
+
+
+def test_hud_renders_text_only_when_values_change():
+    """値が変わらない限りフォントを再描画しないことを確認するテスト。"""
+    font = CountingFont()
+    hud = HUD(font)
+    sim = Simulation(seed=0)
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    hud.draw(screen, sim)
+    calls = font.calls
+    score_text = hud.label("score", "Score: ", sim.score)
+
+    for _ in range(10):
+        hud.draw(screen, sim)
+    assert font.calls == calls
+
+    sim.score += 25
+    hud.draw(screen, sim)
+    assert font.calls == calls  # 数字はグリフから合成される
+    assert hud.label("score", "Score: ", sim.score) is not score_text
+
+
+def test_game_over_overlay_is_built_once():
+    """ゲームオーバー画面のオーバーレイが使い回されることを確認するテスト。"""
+    font = CountingFont()
+    hud = HUD(font)
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    hud.draw_game_over(screen, 100)
+    overlay = hud._overlay
+    hud.draw_game_over(screen, 100)
+
+    assert hud._overlay is overlay
+
+
+def test_game_over_lists_leaderboard():
+    """ゲームオーバー画面に記録済みの上位スコアが並ぶことを確認するテスト。"""
+    hud = HUD(CountingFont())
+
+    plain = hud.game_over_items(100)
+    items = hud.game_over_items(100, [900, 500])
+
+    assert len(items) == len(plain) + 2
+    first, second = items[-2:]
+    assert first[0] is hud.label(("best", 1), "1. ", 900)
+    assert second[1][1] > first[1][1]
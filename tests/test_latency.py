@@ -0,0 +1,83 @@
+import pygame
+
+from latency import InputSampler, LatencyHistogram, LatencyTracker, TimedClick
+from settings import MAX_INPUT_LEAD
+from simulation import Simulation
+
+
+def test_sampler_stamps_clicks_and_keeps_other_events(monkeypatch):
+    """クリックに時刻が付き、その他のイベントは別に保持されることを確認する。"""
+    click = pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(10, 20))
+    key = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F3)
+    monkeypatch.setattr(pygame.event, "get", lambda: [click, key])
+    sampler = InputSampler()
+    sampler.poll()
+
+    assert sampler.take_events() == [key]
+    assert sampler.take_events() == []
+    stamped = sampler.clicks[0]
+    assert sampler.due(stamped.time - 1) == []
+    assert sampler.due(stamped.time) == [stamped]
+    assert stamped.pos == (10, 20)
+
+    # リプレイ中はクリックを溜めない
+    replaying = InputSampler(keep_clicks=False)
+    replaying.poll()
+    assert not replaying.clicks and replaying.take_events() == [key]
+
+
+def test_histogram_buckets_and_percentiles():
+    """バケット数と百分位数が正しく計算されることを確認するテスト。"""
+    histogram = LatencyHistogram(bucket_ms=5, max_ms=20)
+    for ms in (1, 2, 7, 12, 250):
+        histogram.add(ms / 1000)
+
+    assert histogram.counts == [2, 1, 1, 0, 1]
+    assert histogram.percentile(0.5) == 7
+    assert histogram.summary()["max_ms"] == 250
+    assert ">=20 ms" in histogram.format()
+
+
+def test_histogram_keeps_a_bounded_window():
+    """百分位数用のサンプルが窓の大きさを超えず、件数と最大値は全体を数えることを確認する。"""
+    histogram = LatencyHistogram(window=100)
+    for ms in range(1000):
+        histogram.add(ms / 1000)
+
+    assert len(histogram.samples) == 100
+    assert len(histogram) == histogram.summary()["count"] == 1000
+    assert sum(histogram.counts) == 1000
+    assert histogram.percentile(0.0) == 900
+    assert histogram.summary()["max_ms"] == 999
+
+
+def test_tracker_measures_spawn_and_pixel_latency():
+    """発射と表示までの遅延が記録され、不発のクリックは除かれることを確認する。"""
+    tracker = LatencyTracker()
+    tracker.spawned(TimedClick(1.000, (0, 0)), object(), now=1.004)
+    tracker.spawned(TimedClick(1.001, (0, 0)), None, now=1.004)
+    tracker.presented(now=1.020)
+    tracker.presented(now=1.040)
+
+    assert len(tracker.spawn) == len(tracker.pixel) == 1
+    assert abs(tracker.spawn.samples[0] - 4) < 1e-6
+    assert abs(tracker.pixel.samples[0] - 20) < 1e-6
+
+
+def test_lead_moves_missile_ahead_without_passing_target():
+    """リードでミサイルが前進し、上限と目標を超えないことを確認するテスト。"""
+    sim = Simulation(seed=0)
+    plain = sim.fire((400, 100))
+    led = sim.fire((400, 100), lead=0.5)
+    capped = sim.fire((400, 100), lead=5)
+    assert plain is not None and led is not None and capped is not None
+    start = plain.current_pos
+
+    assert led.current_pos.distance_to(start + plain.velocity * 0.5) < 1e-9
+    assert (
+        capped.current_pos.distance_to(start + plain.velocity * MAX_INPUT_LEAD) < 1e-9
+    )
+
+    near = sim.fire((plain.start_pos[0], plain.start_pos[1] - 12), lead=1)
+    assert near is not None and not near.is_at_target()
+    assert near.current_pos.distance_to(near.target_pos) >= near.speed
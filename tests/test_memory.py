@@ -0,0 +1,76 @@
+import json
+import tracemalloc
+
+from batch import POLICIES
+from memory import GROUPS, MemoryTelemetry
+from simulation import Simulation
+from sprites import EnemyMeteor, Explosion, PlayerMissile
+
+
+def test_entities_are_compact_and_share_images():
+    """エンティティが __dict__ を持たず、同じ画像を共有することを確認する。"""
+    sim = Simulation(seed=0)
+    entities = [
+        sim.add_meteor((10, 10), (10, 500), 1.0),
+        sim.fire((400, 200)),
+        sim.add_explosion((300, 300), 50),
+    ]
+    for entity in entities:
+        assert type(entity) in (EnemyMeteor, PlayerMissile, Explosion)
+        assert "__dict__" not in object.__getattribute__(entity, "__class__").__slots__
+        assert not vars(entity)
+
+    assert len({id(city.image) for city in sim.cities}) == 1
+    first, second, _ = sim.bases
+    first.destroy()
+    second.destroy()
+    assert first.image is second.image
+    assert first.image is not sim.bases.sprites()[2].image
+
+
+def test_telemetry_samples_counts_and_dumps(tmp_path):
+    """サンプルとメモリレポートが記録・出力されることを確認するテスト。"""
+    sim = Simulation(seed=1)
+    telemetry = MemoryTelemetry(sim, interval=10)
+    telemetry.start()
+    try:
+        for _ in range(30):
+            sim.step()
+            telemetry.tick()
+        path = tmp_path / "memory.json"
+        telemetry.dump(str(path))
+    finally:
+        telemetry.stop()
+
+    assert not tracemalloc.is_tracing()
+    assert [s["frame"] for s in telemetry.samples] == [0, 10, 20, 30, 30]
+    counts = telemetry.samples[-1]["counts"]
+    assert set(GROUPS) <= set(counts) and counts["cities"] == 6
+    report = json.loads(path.read_text())
+    assert report["top"] and "growth" in report
+    assert len(report["samples"]) == 5
+
+
+def test_memory_stays_flat_over_many_games():
+    """アトラクトモードのように続けてプレイしてもメモリが増えないことを確認する。"""
+    telemetry = MemoryTelemetry(Simulation(seed=0), history=50)
+    telemetry.start()
+    try:
+        for seed in range(5):
+            # 新しいゲームに切り替えてから前のゲームの分を計測する
+            sim = telemetry.simulation = Simulation(seed=seed)
+            # intercept はnumpyが必要なので、無ければlowestで代用する
+            policy = POLICIES.get("intercept", POLICIES["lowest"])(seed)
+            while not sim.game_over:
+                target = policy(sim)
+                if target is not None:
+                    sim.fire(target)
+                sim.step()
+            telemetry.sample(collect=True)
+    finally:
+        telemetry.stop()
+
+    samples = list(telemetry.samples)[1:]
+    settled = [s["traced_bytes"] for s in samples[2:]]
+    assert max(settled) - min(settled) < 32 * 1024
+    assert samples[-1]["counts"]["solid_images"] == samples[2]["counts"]["solid_images"]
@@ -0,0 +1,77 @@
+import time
+
+import pygame
+import pytest
+
+from game import Game
+from pipeline import SimulationThread, capture, draw_snapshot
+from settings import BLACK, SCREEN_HEIGHT, SCREEN_WIDTH
+from simulation import Simulation
+
+
+def _pixels(surface):
+    return pygame.image.tobytes(surface, "RGB")
+
+
+def test_snapshot_draws_like_the_game():
+    """スナップショットの描画が Game.draw と同じ画素になることを確認する。"""
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    reference = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    game = Game(reference, Simulation(seed=4))
+    worker = SimulationThread(game.simulation)
+
+    for frame in range(150):
+        if frame % 30 == 0:
+            worker.fire((SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
+        worker.advance()
+        snapshot = worker.latest()
+        assert snapshot.frame == game.simulation.frame
+        alpha = (frame % 3) / 3
+        screen.fill(BLACK)
+        draw_snapshot(screen, snapshot, game.hud, alpha)
+        reference.fill(BLACK)
+        game.draw(alpha)
+        assert _pixels(screen) == _pixels(reference)
+
+
+def test_snapshots_do_not_change_after_publishing():
+    """公開済みのスナップショットが後のステップで変わらないことを確認する。"""
+    sim = Simulation(seed=1)
+    sim.run(100)
+    first = capture(sim)
+    moving = [row[2:] for row in first.moving]
+    sim.run(20)
+
+    assert [row[2:] for row in first.moving] == moving
+    assert capture(sim).frame == first.frame + 20
+
+
+def test_worker_keeps_stepping_while_the_main_thread_is_busy():
+    """メインスレッドが止まっている間もシミュレーションが進むことを確認する。"""
+    worker = SimulationThread(Simulation(seed=2, step_rate=240))
+    worker.fire((SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+    worker.start()
+    try:
+        time.sleep(0.25)  # 遅い flip の代わり
+        snapshot = worker.latest()
+    finally:
+        worker.stop()
+
+    assert snapshot.frame >= 10
+    assert sum(ammo for _, ammo, _, _ in snapshot.bases) == 29
+
+
+def test_worker_errors_reach_the_main_thread(monkeypatch):
+    """ワーカーで起きた例外がメインスレッドに伝わることを確認するテスト。"""
+    sim = Simulation(seed=0, step_rate=240)
+
+    def broken():
+        raise ValueError("boom")
+
+    monkeypatch.setattr(sim, "step", broken)
+    worker = SimulationThread(sim)
+    worker.start()
+    time.sleep(0.1)
+    with pytest.raises(RuntimeError) as info:
+        worker.stop()
+    assert isinstance(info.value.__cause__, ValueError)
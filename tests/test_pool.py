@@ -0,0 +1,67 @@
+import pygame
+
+from pool import SpritePool
+from simulation import Simulation
+from sprites import Explosion, PlayerMissile
+
+
+def test_killed_sprites_are_reused():
+    """kill() されたスプライトが再初期化されて再利用されることを確認する。"""
+    group = pygame.sprite.Group()
+    pool = SpritePool(lambda: PlayerMissile((0, 0), (0, 0)), capacity=2)
+
+    first = pool.acquire((10, 10), (10, 100), 5, groups=(group,))
+    image = first.image
+    first.kill()
+    second = pool.acquire((50, 50), (150, 50), 4, groups=(group,))
+
+    assert second is first and second.image is image
+    assert second.alive() and second.current_pos == pygame.Vector2(50, 50)
+    assert second.velocity == pygame.Vector2(4, 0)
+    second.kill()
+    second.kill()  # 二重の kill でプールに二度戻らない
+    assert pool.stats()["free"] == 2 and pool.stats()["in_use"] == 0
+
+
+def test_growth_cap_and_high_water():
+    """成長ポリシー・上限・最大同時使用数の統計を確認するテスト。"""
+    pool = SpritePool(lambda: Explosion((0, 0)), capacity=2, max_size=5, growth=2.0)
+    sprites = [pool.acquire((0, 0), 30, 2, 30) for _ in range(7)]
+
+    stats = pool.stats()
+    assert stats["size"] == 5  # 2 -> 4 -> 5 (上限)
+    assert stats["overflows"] == 2 and stats["allocated"] == 7
+    assert stats["high_water"] == 5
+    for sprite in sprites:
+        sprite.kill()
+    assert pool.stats()["free"] == 5 and pool.stats()["in_use"] == 0
+
+
+def test_lazy_pool_allocates_on_first_acquire():
+    """lazyなプールは最初のacquire()まで確保せず、その時にcapacity分を確保することを確認する。"""
+    pool = SpritePool(lambda: Explosion((0, 0)), capacity=8, lazy=True)
+    assert pool.stats()["size"] == 0 and pool.stats()["allocated"] == 0
+
+    pool.acquire((0, 0), 30, 2, 30)
+
+    assert pool.stats()["size"] == 8 and pool.stats()["overflows"] == 0
+    assert len(pool.free) == 7
+    assert all(stats["size"] == 0 for stats in Simulation(seed=1).pool_stats().values())
+
+
+def test_simulation_reuses_pooled_sprites():
+    """ゲーム全体を通して事前確保したスプライトだけで足りることを確認する。"""
+    sim = Simulation(seed=1)
+    for frame in range(3000):
+        if frame % 15 == 0:
+            sim.fire((frame % 800, 200))
+        sim.step()
+
+    stats = sim.pool_stats()
+    for name, pool in sim.pools.items():
+        assert stats[name]["size"] == len(pool.free) + stats[name]["in_use"]
+        assert stats[name]["overflows"] == 0
+    assert stats["missiles"]["acquired"] == sim.missiles_fired
+    assert stats["explosions"]["acquired"] > stats["explosions"]["high_water"]
+    assert stats["explosions"]["in_use"] == len(sim.explosions)
+    assert stats["meteors"]["in_use"] == len(sim.enemy_meteors)
@@ -0,0 +1,107 @@
+import csv
+import json
+import time
+
+import pygame
+
+import renderer as renderer_module
+from game import Game
+from profiler import COLUMNS, PHASES, FrameProfiler
+from renderer import BatchedRenderer
+from settings import SCREEN_HEIGHT, SCREEN_WIDTH
+from simulation import Simulation
+
+
+def _run(game, profiler, frames):
+    for _ in range(frames):
+        profiler.begin_frame()
+        game.update()
+        game.draw()
+        profiler.mark("present")
+        profiler.end_frame(game.simulation)
+
+
+def test_profiler_records_phases_and_counts():
+    """各フレームのフェーズ時間とエンティティ数が記録されることを確認する。"""
+    sim = Simulation(seed=0)
+    sim.profiler = profiler = FrameProfiler(capacity=8)
+    game = Game(pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)), sim)
+    for _ in range(3):
+        sim.add_meteor((400, 100), (400, 500), 1)
+
+    _run(game, profiler, 5)
+
+    frames = profiler.frames()
+    assert [frame["frame"] for frame in frames] == [0, 1, 2, 3, 4]
+    last = frames[-1]
+    assert last["meteors"] >= 3
+    assert all(last[f"{phase}_ms"] >= 0 for phase in PHASES)
+    assert last["total_ms"] == sum(last[f"{phase}_ms"] for phase in PHASES)
+    assert last["move_ms"] > 0 and last["sprites_ms"] > 0
+
+
+def test_ring_buffer_keeps_last_frames():
+    """容量を超えると古いフレームから上書きされることを確認するテスト。"""
+    sim = Simulation(seed=0)
+    sim.profiler = profiler = FrameProfiler(capacity=4)
+    game = Game(pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)), sim)
+
+    _run(game, profiler, 10)
+
+    assert [frame["frame"] for frame in profiler.frames()] == [6, 7, 8, 9]
+    assert [frame["frame"] for frame in profiler.frames(2)] == [8, 9]
+
+
+def test_profiling_does_not_change_the_game():
+    """プロファイラの有無でゲームの進行が変わらないことを確認するテスト。"""
+    plain = Simulation(seed=3)
+    profiled = Simulation(seed=3)
+    profiled.profiler = FrameProfiler()
+    plain.run(600)
+    profiled.run(600)
+
+    assert (plain.frame, plain.score, plain.level) == (
+        profiled.frame,
+        profiled.score,
+        profiled.level,
+    )
+
+
+def test_export_and_overlay(tmp_path):
+    """CSV/JSON の書き出しとオーバーレイ描画を確認するテスト。"""
+    sim = Simulation(seed=0)
+    sim.profiler = profiler = FrameProfiler()
+    game = Game(pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)), sim)
+    game.show_profiler = True
+    _run(game, profiler, 6)
+
+    profiler.export_csv(tmp_path / "profile.csv", 4)
+    with open(tmp_path / "profile.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 4 and tuple(rows[0]) == COLUMNS
+
+    profiler.export_json(tmp_path / "profile.json")
+    with open(tmp_path / "profile.json") as f:
+        assert len(json.load(f)) == 6
+
+    items = game.draw_items()
+    overlay = items[-1][0]
+    assert overlay.get_size() == (300, 100)
+
+
+def test_batched_renderer_charges_sprite_blits_to_blit(monkeypatch):
+    """まとめ描画のスプライト転送時間がhudではなくblitに数えられることを確認する。"""
+    sim = Simulation(seed=0)
+    sim.profiler = profiler = FrameProfiler(capacity=4)
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    game = Game(screen, sim)
+    renderer = BatchedRenderer(screen)
+    monkeypatch.setattr(renderer_module, "blit_batches", lambda *_: time.sleep(0.02))
+
+    profiler.begin_frame()
+    renderer.draw(game)
+    profiler.end_frame(sim)
+
+    (frame,) = profiler.frames()
+    assert frame["blit_ms"] >= 20
+    assert frame["hud_ms"] < 20
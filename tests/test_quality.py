@@ -0,0 +1,98 @@
+import random
+
+import pygame
+import pytest
+
+from game import Game
+from quality import LEVELS, QualityGovernor, level
+from settings import SCREEN_HEIGHT, SCREEN_WIDTH
+from simulation import Simulation
+from snapshot import snapshot
+from sprites import simplified
+
+
+def test_governor_lowers_and_raises_quality():
+    """予算超過で品質を下げ、余裕が続くと戻し、変更を記録することを確認する。"""
+    lines = []
+    governor = QualityGovernor(0.010, window=5, hold=20, log=lines.append)
+
+    changes = [governor.record(0.008, 0.006) for _ in range(5)]
+    assert changes[:4] == [None] * 4
+    assert changes[4] is LEVELS[1]
+
+    # 予算内だが余裕が少なければそのまま
+    assert all(governor.record(0.003, 0.004) is None for _ in range(40))
+    assert governor.quality is LEVELS[1]
+
+    raised = [governor.record(0.001, 0.001) for _ in range(20)]
+    assert [quality for quality in raised if quality] == [LEVELS[0]]
+    assert [c.new for c in governor.changes] == ["medium", "high"]
+    assert len(lines) == 2 and "high -> medium" in lines[0]
+
+
+def test_governor_stops_at_cheapest_level():
+    """最低品質より下には下がらないことを確認するテスト。"""
+    governor = QualityGovernor(0.010, window=2, log=None)
+    for _ in range(50):
+        governor.record(0.1, 0.1)
+    assert governor.quality is LEVELS[-1]
+    assert len(governor.changes) == len(LEVELS) - 1
+    assert level("minimal") is LEVELS[-1]
+    with pytest.raises(ValueError):
+        level("ultra")
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_quality_never_changes_gameplay(vectorized):
+    """品質を切り替えながら描画してもゲームの進行が全く同じことを確認する。"""
+    if vectorized:
+        pytest.importorskip("numpy")
+    games = [
+        Game(
+            pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)),
+            Simulation(seed=6, vectorized=vectorized),
+            trails=True,
+        )
+        for _ in range(2)
+    ]
+    rng = random.Random(6)
+    for frame in range(600):
+        if frame % 12 == 0:
+            target = (rng.randint(0, SCREEN_WIDTH), rng.randint(0, 400))
+            for game in games:
+                game.simulation.fire(target)
+        for game in games:
+            game.update()
+        games[1].set_quality(LEVELS[frame // 40 % len(LEVELS)])
+        games[0].draw(0.5)
+        games[1].draw(0.5)
+        games[1].draw_batches(0.5)
+
+    assert snapshot(games[0].simulation) == snapshot(games[1].simulation)
+
+
+def test_lower_levels_simplify_drawing():
+    """低い品質では爆発が簡略化され、HUDが使い回され、軌跡が止まることを確認する。"""
+    game = Game(pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)), trails=True)
+    sim = game.simulation
+    explosion = sim.add_explosion((400, 300), 50)
+    sim.step()
+
+    game.set_quality(level("medium"))
+    images = [image for image, _ in game.draw_items()]
+    assert simplified(explosion.image) in images
+    assert simplified(explosion.image) is not explosion.image
+
+    game.set_quality(level("low"))
+    hud = game.hud_items()
+    sim.score += 25
+    sim.step()
+    assert game.hud_items()[0][0] is hud[0][0]  # 前のスコア表示のまま
+
+    layer = game._trail_layer
+    assert layer is not None
+    game.set_quality(level("minimal"))
+    assert game.trails is None
+    assert all(image is not layer.surface for image, _ in game.draw_items())
+    game.set_quality(level("high"))
+    assert game.trails is layer
@@ -0,0 +1,122 @@
+import random
+
+import pygame
+import pytest
+
+from game import Game
+from renderer import BatchedRenderer, DirtyRectRenderer, blit_batches
+from settings import BLACK, SCREEN_HEIGHT, SCREEN_WIDTH
+from simulation import Simulation
+
+
+def _pixels(surface):
+    return pygame.image.tobytes(surface, "RGB")
+
+
+@pytest.mark.parametrize("trails", [False, True])
+def test_dirty_rect_renderer_matches_full_redraw(monkeypatch, trails):
+    """差分描画が全画面描画と一致し、変化した領域が更新されることを確認する。"""
+    updates = []
+    monkeypatch.setattr(pygame.display, "flip", lambda: updates.append(None))
+    monkeypatch.setattr(pygame.display, "update", lambda rects: updates.append(rects))
+
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    game = Game(screen, Simulation(seed=3), trails=trails)
+    reference_screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    reference = Game(reference_screen, Simulation(seed=3), trails=trails)
+    renderer = DirtyRectRenderer(screen)
+
+    previous = None
+    for frame in range(200):
+        if frame % 50 == 0:
+            for g in (game, reference):
+                g.simulation.fire((SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
+        game.update()
+        reference.update()
+
+        renderer.render(game)
+        reference_screen.fill(BLACK)
+        reference.draw()
+        assert _pixels(screen) == _pixels(reference_screen)
+
+        if previous is not None and updates[-1] is not None:
+            # 更新されなかった領域は前フレームと同じでなければならない
+            before = previous.copy()
+            after = screen.copy()
+            for rect in updates[-1]:
+                before.fill(BLACK, rect)
+                after.fill(BLACK, rect)
+            assert _pixels(before) == _pixels(after)
+        previous = screen.copy()
+
+    assert updates[0] is None  # 最初のフレームは全画面
+    assert all(rects is not None for rects in updates[1:])
+
+
+def test_dirty_rect_renderer_copies_only_changed_trail_regions(monkeypatch):
+    """軌跡レイヤー全体ではなく変化した領域だけが画面に写されることを確認する。"""
+    monkeypatch.setattr(pygame.display, "flip", lambda: None)
+    monkeypatch.setattr(pygame.display, "update", lambda rects: None)
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    game = Game(screen, Simulation(seed=3), trails=True)
+    assert game.trails is not None
+    renderer = DirtyRectRenderer(screen)
+    renderer.render(game)
+
+    # どの軌跡も変えていない場所にレイヤーへ直接印を付ける
+    game.trails.surface.set_at((5, 5), (255, 255, 255))
+    for _ in range(10):
+        game.update()
+        renderer.render(game)
+
+    assert screen.get_at((5, 5))[:3] == BLACK
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_batched_renderer_matches_full_redraw(monkeypatch, vectorized):
+    """画像ごとのまとめ描画が通常の描画と同じ画素になることを確認するテスト。"""
+    if vectorized:
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(pygame.display, "flip", lambda: None)
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    game = Game(screen, Simulation(seed=2, vectorized=vectorized))
+    rng = random.Random(2)
+    for _ in range(300):
+        start = (rng.randint(0, SCREEN_WIDTH), rng.randint(0, 200))
+        game.simulation.add_meteor(start, (rng.randint(0, SCREEN_WIDTH), 580), 0.7)
+    renderer = BatchedRenderer(screen)
+    reference = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    for frame in range(60):
+        if frame % 20 == 0:
+            game.simulation.fire((SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
+        game.update()
+        alpha = (frame % 4) / 4
+        renderer.render(game, alpha)
+        game.screen = reference
+        reference.fill(BLACK)
+        game.draw(alpha)
+        game.screen = screen
+        assert _pixels(screen) == _pixels(reference)
+
+    batches = game.draw_batches()
+    meteor_image = next(iter(game.enemy_meteors)).image
+    assert len(dict(batches)[meteor_image]) == len(game.enemy_meteors)
+
+
+def test_blit_batches_prefers_fblits():
+    """fblits があれば画像ごとに一度だけ呼ばれることを確認するテスト。"""
+
+    class Target:
+        def __init__(self):
+            self.calls = []
+
+        def fblits(self, pairs):
+            self.calls.append(pairs)
+
+    image = pygame.Surface((4, 4))
+    target = Target()
+    blit_batches(target, [(image, [(0, 0), (5, 5)]), (image.copy(), [(1, 1)])])
+
+    assert len(target.calls) == 2
+    assert target.calls[0] == [(image, (0, 0)), (image, (5, 5))]
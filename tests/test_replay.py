@@ -0,0 +1,110 @@
+import json
+import os
+
+import pytest
+
+from replay import RECORD, Replay, main, record
+from settings import SCREEN_HEIGHT, SCREEN_WIDTH
+from simulation import Simulation
+from snapshot import snapshot
+from waves import load
+
+
+def _play_live(sim, frames):
+    """マウス入力の代わりに決まったクリックでゲームを進める。"""
+    for frame in range(frames):
+        if frame % 35 == 0:
+            sim.fire(((frame * 53) % SCREEN_WIDTH, SCREEN_HEIGHT // 4))
+        sim.step()
+    return sim
+
+
+def test_replay_reproduces_recorded_game(tmp_path):
+    """記録したリプレイを再生すると同じ結果になることを確認するテスト。"""
+    path = str(tmp_path / "game.mcr")
+    sim = Simulation(seed=11)
+    with record(sim, path) as writer:
+        _play_live(sim, 1500)
+        writer.close(sim.frame)
+
+    replay = Replay.load(path)
+    replayed = replay.play()
+
+    assert replay.seed == 11
+    assert replay.end_frame == sim.frame
+    assert (replayed.frame, replayed.score, replayed.level) == (
+        sim.frame,
+        sim.score,
+        sim.level,
+    )
+    # 1クリックあたり9バイト
+    assert os.path.getsize(path) < 20 + RECORD.size * (1500 // 35 + 2)
+
+
+def test_replay_keeps_input_lead(tmp_path):
+    """リード付きのクリックも記録・再生で同じ展開になることを確認するテスト。"""
+    path = str(tmp_path / "lead.mcr")
+    sim = Simulation(seed=8)
+    writer = record(sim, path)
+    for frame in range(600):
+        if frame % 40 == 0:
+            sim.fire(((frame * 31) % SCREEN_WIDTH, SCREEN_HEIGHT // 3), frame % 7 / 7)
+        sim.step()
+    writer.close(sim.frame)
+
+    replay = Replay.load(path)
+    leads = [lead for clicks in replay.clicks.values() for _, _, lead in clicks]
+    assert leads[:3] == [0.0, 0.714, 0.429]
+    assert snapshot(replay.play()) == snapshot(sim)
+
+
+def test_truncated_replay_plays_until_game_over(tmp_path):
+    """途中で切れたファイルでも最後の完全なレコードまで再生できることを確認する。"""
+    path = str(tmp_path / "cut.mcr")
+    sim = Simulation(seed=3)
+    with record(sim, path):
+        _play_live(sim, 300)
+    with open(path, "ab") as f:
+        f.write(b"\x00\x01")  # 書きかけのレコード
+
+    replayed = Replay.load(path).play()
+
+    assert replayed.game_over
+
+
+def test_replay_cli_renders_chosen_frames(tmp_path, capsys):
+    """早送り再生で指定したフレームだけ画像に保存することを確認するテスト。"""
+    path = str(tmp_path / "run.mcr")
+    sim = Simulation(seed=5)
+    writer = record(sim, path)
+    _play_live(sim, 200)
+    writer.close(sim.frame)
+
+    results = main([path, "--render-frames", "50,150", "--output-dir", str(tmp_path)])
+
+    assert results[0]["frames"] == 200
+    assert os.path.exists(tmp_path / "run_50.png")
+    assert os.path.exists(tmp_path / "run_150.png")
+    assert not os.path.exists(tmp_path / "run_100.png")
+
+
+def test_replay_requires_the_recorded_waves(tmp_path):
+    """--wavesで記録したリプレイは同じウェーブ表でなければ再生できないことを確認する。"""
+    waves_path = tmp_path / "waves.json"
+    waves_path.write_text(json.dumps({"waves": [{"meteors": 3, "split_chance": 0.5}]}))
+    path = str(tmp_path / "waves.mcr")
+    sim = Simulation(seed=9, waves=load(str(waves_path)))
+    writer = record(sim, path)
+    _play_live(sim, 400)
+    writer.close(sim.frame)
+
+    replay = Replay.load(path)
+    with pytest.raises(ValueError):
+        replay.play()
+    with pytest.raises(ValueError):
+        main([path])
+
+    replayed = replay.play(replay.simulation(waves=load(str(waves_path))))
+    assert snapshot(replayed) == snapshot(sim)
+    results = main([path, "--waves", str(waves_path)])
+    assert results[0]["score"] == sim.score
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from scheduler import EventScheduler
+from simulation import SPAWN, Simulation
+from sprites import EnemyMeteor, PlayerMissile
+from waves import Wave
+
+
+def test_events_pop_in_due_order():
+    """期限順、同じフレームでは登録順にイベントが取り出されることを確認する。"""
+    events = EventScheduler()
+    events.push(5, 0, "b")
+    events.push(3, 0, "a")
+    late = events.push(5, 0, "c")
+    events.push(9, 0, "d")
+
+    assert [item for _, _, _, item, _ in events.pop_due(5)] == ["a", "b", "c"]
+    events.push(9, 0, "c", order=late)
+    assert [item for _, _, _, item, _ in events.pop_due(9)] == ["c", "d"]
+    assert len(events) == 0
+
+
+def test_predicted_arrival_is_never_late():
+    """予測した到着ステップが実際の到着より遅れないことを確認するテスト。"""
+    rng = random.Random(0)
+    for _ in range(500):
+        start = (rng.randint(0, 800), rng.randint(0, 300))
+        target = (rng.randint(0, 800), rng.randint(300, 600))
+        missile = PlayerMissile(start, target, rng.randint(1, 12))
+        meteor = EnemyMeteor(start, target, rng.uniform(0.5, 5))
+        for sprite, check in (
+            (missile, missile.is_at_target),
+            (meteor, meteor.has_reached_target),
+        ):
+            predicted = sprite.steps_to_target()
+            assert predicted is not None
+            steps = 0
+            while not check():
+                sprite.current_pos += sprite.velocity
+                steps += 1
+            assert predicted <= max(steps, 1) <= predicted + 2
+
+
+def test_only_due_projectiles_are_checked(monkeypatch):
+    """到着予定のない隕石は毎ステップ判定されないことを確認するテスト。"""
+    calls = []
+    original = EnemyMeteor.has_reached_target
+
+    def counting(self):
+        calls.append(self)
+        return original(self)
+
+    monkeypatch.setattr(EnemyMeteor, "has_reached_target", counting)
+    sim = Simulation(seed=0)
+    for x in range(0, 800, 40):
+        sim.add_meteor((x, 0), (x, 500), 1)
+    for _ in range(100):
+        sim.step()
+
+    assert not calls
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_projectiles_added_to_groups_are_tracked(vectorized):
+    """track()を通さずグループに直接追加した隕石も次のステップから着弾することを確認する。"""
+    if vectorized:
+        pytest.importorskip("numpy")
+    sim = Simulation(seed=0, vectorized=vectorized)
+    meteor = EnemyMeteor((100, 480), (100, 500), 2)
+    sim.enemy_meteors.add(meteor)
+    sim.all_sprites.add(meteor)
+
+    for _ in range(15):
+        sim.step()
+
+    assert not meteor.alive()
+    assert not sim._untracked
+
+
+def test_spawns_follow_the_wave_table():
+    """スポーン表の時刻どおりに隕石が生成されることを確認するテスト。"""
+    sim = Simulation(seed=0, waves=lambda level: Wave(meteors=3, interval=10))
+    sim.run(9)
+    assert len(sim.enemy_meteors) == 0
+    sim.step()
+    assert len(sim.enemy_meteors) == 1
+    sim.run(20)
+    assert sim.meteors_spawned_this_level == 3
+    # 表を使い切ったので次のスポーンは予定されていない
+    assert all(kind != SPAWN for _, _, kind, _, _ in sim.events.heap)
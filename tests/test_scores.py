@@ -0,0 +1,112 @@
+import batch
+from scores import Run, ScoreStore, day_of, run_from_result, run_from_simulation
+from simulation import Simulation
+
+DAY = 86400
+
+
+def make_run(score, played_at=0.0, seed=0):
+    return Run(played_at, seed, 1, score, 6, 3, 600, 10.0, "test")
+
+
+def test_top_orders_by_score_then_insertion(tmp_path):
+    """上位N件がスコア順、同点なら先に記録した順で返ることを確認するテスト。"""
+    with ScoreStore(str(tmp_path / "scores.db")) as store:
+        for seed, score in enumerate([300, 900, 500, 900, 100]):
+            store.add(make_run(score, seed=seed))
+
+        top = store.top(3)
+
+        assert [run.score for run in top] == [900, 900, 500]
+        assert [run.seed for run in top] == [1, 3, 2]
+        assert store.rank(900) == 1
+        assert store.rank(600) == 3
+        assert store.count() == 5
+
+
+def test_per_day_queries(tmp_path):
+    """日ごとの上位N件と集計がUTCの日付で分かれることを確認するテスト。"""
+    with ScoreStore(str(tmp_path / "scores.db")) as store:
+        store.add_many(
+            [
+                make_run(100, played_at=0.5 * DAY),
+                make_run(700, played_at=0.9 * DAY),
+                make_run(400, played_at=1.2 * DAY),
+            ]
+        )
+        first, second = day_of(0), day_of(DAY)
+
+        assert [run.score for run in store.top(5, day=first)] == [700, 100]
+        assert [run.score for run in store.top(5, day=second)] == [400]
+        summaries = store.days()
+        assert [(s.day, s.runs, s.best, s.mean) for s in summaries] == [
+            (first, 2, 700, 400.0),
+            (second, 1, 400, 400.0),
+        ]
+        assert store.days(start=second) == summaries[1:]
+
+
+def test_queries_use_the_indexes():
+    """上位N件と日別の問い合わせがインデックスを使い、並べ替えをしないことを確認する。"""
+    store = ScoreStore(":memory:")
+    queries = [
+        "SELECT * FROM runs ORDER BY score DESC, id LIMIT 10",
+        "SELECT * FROM runs WHERE day = '1970-01-01' ORDER BY score DESC, id LIMIT 10",
+        (
+            "SELECT day, COUNT(*), MAX(score), AVG(score) FROM runs"
+            " WHERE day >= '' AND day <= '9' GROUP BY day ORDER BY day"
+        ),
+    ]
+    for query in queries:
+        plan = " ".join(
+            row[3] for row in store.db.execute("EXPLAIN QUERY PLAN " + query)
+        )
+        assert "USING" in plan and "INDEX" in plan
+        assert "TEMP B-TREE" not in plan
+    store.close()
+
+
+def test_writer_ingests_in_batches(tmp_path):
+    """バッチ書き込みで大量の結果をまとめて取り込めることを確認するテスト。"""
+    count = 20_000
+    with ScoreStore(str(tmp_path / "scores.db")) as store:
+        with store.writer(batch_size=5_000) as writer:
+            for seed in range(count):
+                writer.add(make_run(seed % 1000, played_at=seed, seed=seed))
+            assert len(writer.pending) < 5_000
+
+        assert writer.written == count
+        assert store.count() == count
+        assert store.top(1)[0].score == 999
+
+
+def test_runs_from_games():
+    """シミュレーションとバッチ結果からRunを作れることを確認するテスト。"""
+    sim = Simulation(seed=4)
+    for _ in range(30):
+        sim.step()
+    run = run_from_simulation(sim, played_at=5.0)
+    assert (run.seed, run.cities_left, run.bases_left, run.frames) == (4, 6, 3, 30)
+    assert run.duration == 30 / sim.step_rate
+    assert run.source == "player"
+
+    result = batch.run_game(5, "lowest")
+    run = run_from_result(result)
+    assert run.cities_left == 0
+    assert run.bases_left == result["bases_left"]
+    assert run.source == "lowest"
+
+
+def test_batch_adds_results_to_store(tmp_path):
+    """batchの--scoresで結果がスコアストアにも記録されることを確認するテスト。"""
+    path = str(tmp_path / "scores.db")
+    output = str(tmp_path / "results.jsonl")
+
+    batch.main(
+        ["--games", "3", "--workers", "1", "--output", output, "--scores", path]
+        + ["--quiet"]
+    )
+
+    with ScoreStore(path) as store:
+        assert store.count() == 3
+        assert sorted(run.seed for run in store.top(10)) == [0, 1, 2]
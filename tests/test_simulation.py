@@ -0,0 +1,60 @@
+from settings import SCREEN_HEIGHT, SCREEN_WIDTH
+from simulation import Simulation
+
+
+def test_simulation_runs_without_display():
+    """ディスプレイなしでゲームオーバーまで進められることを確認するテスト。"""
+    sim = Simulation(seed=1)
+
+    steps = sim.run(max_frames=100_000)
+
+    assert sim.game_over
+    assert steps == sim.frame
+    assert len(sim.cities) == 0
+
+
+def test_simulation_is_deterministic_for_seed():
+    """同じシードと入力で同じ結果になることを確認するテスト。"""
+    results = []
+    for _ in range(2):
+        sim = Simulation(seed=42)
+        for frame in range(3000):
+            if frame % 45 == 0:
+                sim.fire((SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
+            sim.step()
+        results.append((sim.score, sim.level, len(sim.cities), sim.frame))
+
+    assert results[0] == results[1]
+
+
+def test_fire_uses_closest_base():
+    """fire()が最も近い基地からミサイルを発射することを確認するテスト。"""
+    sim = Simulation(seed=0)
+    target_pos = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    base = sim.find_closest_base(target_pos)
+    assert base is not None
+
+    missile = sim.fire(target_pos)
+
+    assert missile is not None
+    assert missile.start_pos == base.rect.midtop
+    assert base.ammo == 9
+    assert missile in sim.player_missiles
+
+
+def test_step_rate_keeps_real_time_pace():
+    """ステップレートを変えても実時間あたりの進み方が同じことを確認するテスト。"""
+    target_pos = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)
+    arrival_steps = {}
+    for step_rate in (60, 120):
+        sim = Simulation(seed=0, step_rate=step_rate)
+        sim.fire(target_pos)
+        steps = 0
+        while sim.player_missiles:
+            sim.step()
+            steps += 1
+        arrival_steps[step_rate] = steps
+        explosion = next(iter(sim.explosions))
+        assert explosion.lifespan == 30 * step_rate // 60
+
+    assert abs(arrival_steps[120] - 2 * arrival_steps[60]) <= 1
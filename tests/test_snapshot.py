@@ -0,0 +1,53 @@
+import pytest
+
+from settings import SCREEN_HEIGHT, SCREEN_WIDTH
+from simulation import Simulation
+from snapshot import restore, snapshot
+
+
+def _advance(sim, frames):
+    """決まったクリックでゲームを進め、状態をまとめて返す。"""
+    for _ in range(frames):
+        if sim.frame % 30 == 0:
+            sim.fire(((sim.frame * 71) % SCREEN_WIDTH, SCREEN_HEIGHT // 3))
+        sim.step()
+    sim.sync_views()
+    return (
+        sim.frame,
+        sim.score,
+        sim.level,
+        sim.game_over,
+        sorted(city.rect.x for city in sim.cities),
+        [(base.ammo, base.is_alive) for base in sim.bases],
+        sorted(tuple(m.current_pos) for m in sim.enemy_meteors),
+    )
+
+
+@pytest.mark.parametrize("frames", [1, 250, 700])
+def test_restored_simulation_continues_identically(frames):
+    """途中で保存・復元しても元のゲームと同じように進むことを確認するテスト。"""
+    sim = Simulation(seed=21)
+    _advance(sim, frames)
+
+    data = snapshot(sim)
+    restored = restore(data)
+
+    assert snapshot(restored) == data
+    assert _advance(restored, 600) == _advance(sim, 600)
+
+
+def test_snapshot_restores_into_vectorized_world():
+    """スプライト版の状態をベクトル化版に復元できることを確認するテスト。"""
+    pytest.importorskip("numpy")
+    sim = Simulation(seed=8)
+    _advance(sim, 400)
+
+    restored = restore(snapshot(sim), vectorized=True)
+
+    assert _advance(restored, 400) == _advance(sim, 400)
+
+
+def test_restore_rejects_foreign_data():
+    """スナップショット以外のデータを拒否することを確認するテスト。"""
+    with pytest.raises(ValueError):
+        restore(b"\0" * 4096)
@@ -79,3 +79,19 @@ def test_explosion_expansion_and_lifespan():
     assert not explosion.alive()
 
     pygame.quit()
+
+
+def test_explosion_frames_are_shared():
+    """Test that explosions reuse cached frames instead of drawing."""
+    first = Explosion((100, 100), 50, 2, 30)
+    second = Explosion((200, 200), 50, 2, 30)
+
+    assert first.frames is second.frames
+    assert len(first.frames) == 26
+
+    first.update()
+    first.update()
+
+    assert first.image is first.frames[2]
+    assert first.rect.center == (100, 100)
+    assert first.image.get_bounding_rect().width == 2 * first.current_radius
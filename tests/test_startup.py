@@ -0,0 +1,22 @@
+import time
+
+from startup import StartupTimer
+
+
+def test_phases_are_recorded_in_order():
+    """各フェーズの時間が順番どおりに記録され、合計と一致することを確認する。"""
+    timer = StartupTimer()
+    with timer.phase("first"):
+        time.sleep(0.01)
+    time.sleep(0.01)  # フェーズの外の処理も次のフェーズに数えられる
+    with timer.phase("second"):
+        pass
+    timer.mark("third")
+
+    names = [name for name, _ in timer.phases]
+    assert names == ["first", "second", "third"]
+    assert timer.phases[0][1] >= 0.01 and timer.phases[1][1] >= 0.01
+    assert abs(sum(seconds for _, seconds in timer.phases) - timer.total) < 1e-3
+
+    report = timer.report().splitlines()
+    assert report[0].startswith("first") and report[-1].startswith("total")
@@ -0,0 +1,104 @@
+import pygame
+import pytest
+
+from settings import BLACK
+from simulation import Simulation
+from trails import METEOR_TRAIL_COLOR, MISSILE_TRAIL_COLOR, TrailLayer
+
+
+def _empty_simulation(vectorized=False):
+    sim = Simulation(seed=0, vectorized=vectorized)
+    for meteor in list(sim.enemy_meteors):
+        sim._remove(meteor)
+    sim._spawn_token = None  # 予定済みの出現を無効にする
+    return sim
+
+
+def test_trail_follows_meteor_and_is_erased_when_it_dies():
+    """隕石の軌跡が描かれ、隕石が消えると軌跡もまとめて消えることを確認する。"""
+    sim = _empty_simulation()
+    layer = TrailLayer()
+    meteor = sim.add_meteor((100, 100), (100, 500), 2.0)
+    for _ in range(20):
+        sim.step()
+        layer.update(sim)
+
+    assert layer.surface.get_at((100, 110))[:3] == METEOR_TRAIL_COLOR
+    assert layer.surface.get_at((100, 139))[:3] == METEOR_TRAIL_COLOR
+
+    sim._remove(meteor)
+    dirty = layer.update(sim)
+
+    assert not layer.trails
+    assert dirty[0].collidepoint(100, 120)
+    assert layer.surface.get_at((100, 110))[:3] == BLACK
+
+
+def test_erasing_keeps_crossing_trails():
+    """消えた軌跡と交差する軌跡が描き直されて残ることを確認するテスト。"""
+    sim = _empty_simulation()
+    layer = TrailLayer()
+    falling = sim.add_meteor((250, 50), (250, 550), 4.0)
+    sim.add_meteor((100, 100), (500, 500), 4.0)
+    for _ in range(60):
+        sim.step()
+        layer.update(sim)
+
+    sim._remove(falling)
+    layer.update(sim)
+
+    assert layer.surface.get_at((250, 200))[:3] == BLACK
+    assert layer.surface.get_at((250, 250))[:3] == METEOR_TRAIL_COLOR
+    assert layer.surface.get_at((200, 200))[:3] == METEOR_TRAIL_COLOR
+
+
+def test_reused_missile_starts_a_new_trail():
+    """プールから再利用されたミサイルが前の軌跡を消して描き始めることを確認する。"""
+    sim = _empty_simulation()
+    layer = TrailLayer()
+    missile = sim.fire((400, 100))
+    assert missile is not None
+    first_target = missile.target_pos
+    for _ in range(10):
+        sim.step()
+        layer.update(sim)
+    sim._remove(missile)
+
+    again = sim.fire((300, 100))
+    assert again is missile  # 同じスプライトがプールから戻る
+    sim.step()
+    layer.update(sim)
+
+    (trail,) = layer.trails.values()
+    assert trail.target == (300, 100)
+    head = layer.surface.get_at(tuple(map(round, missile.current_pos)))
+    assert head[:3] == MISSILE_TRAIL_COLOR
+    x, y = first_target
+    start_x, start_y = missile.start_pos
+    assert layer.surface.get_at(((x + start_x) // 2, (y + start_y) // 2)) == BLACK
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_each_frame_draws_only_new_segments(monkeypatch, vectorized):
+    """軌跡が伸びても1フレームの描画は物体ごとに1本の線分だけであることを確認する。"""
+    if vectorized:
+        pytest.importorskip("numpy")
+    sim = _empty_simulation(vectorized)
+    for i in range(20):
+        sim.add_meteor((40 * i, 0), (40 * i, 580), 3.0)
+    layer = TrailLayer()
+    calls = []
+    line = pygame.draw.line
+
+    def counting_line(surface, color, start, end, width=1):
+        calls.append((start, end))
+        return line(surface, color, start, end, width)
+
+    monkeypatch.setattr(pygame.draw, "line", counting_line)
+    for frame in range(150):
+        sim.step()
+        calls.clear()
+        layer.update(sim, lag=0.5)
+        assert len(calls) == 20
+        for start, end in calls:
+            assert abs(end[1] - start[1]) <= 4  # 前フレームからの分だけ
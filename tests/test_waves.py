@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from simulation import Simulation
+from snapshot import restore, snapshot
+from waves import TargetIndex, Wave, classic, generate, load
+
+
+def _mirv(level):
+    """すべての隕石が早めに3つに分裂するウェーブ。"""
+    return Wave(meteors=4, interval=20, split_chance=1.0, split_min=30, split_max=40)
+
+
+def test_spawn_table_is_seeded():
+    """同じシードから同じスポーン表が生成されることを確認するテスト。"""
+    wave = classic(3)
+    table = generate(wave, 7)
+
+    assert table == generate(wave, 7)
+    assert table != generate(wave, 8)
+    assert len(table.times) == wave.meteors == 11
+    assert all(wave.min_speed <= speed <= wave.max_speed for speed in table.speeds)
+    assert not any(table.splits)
+
+
+def test_load_merges_designer_waves(tmp_path):
+    """JSON のウェーブ設定が既定値に上書きされることを確認するテスト。"""
+    path = tmp_path / "waves.json"
+    path.write_text(json.dumps({"waves": [{"meteors": 2}, {"split_chance": 0.5}]}))
+    waves = load(path)
+
+    assert waves(1) == classic(1)._replace(meteors=2)
+    assert waves(2).split_chance == 0.5 and waves(2).meteors == classic(2).meteors
+    assert waves(5) == classic(5)
+
+    path.write_text(json.dumps({"waves": [{"meteor": 2}]}))
+    with pytest.raises(ValueError):
+        load(path)
+
+
+def test_target_index_skips_destroyed_targets():
+    """破壊された都市や基地が狙われないことを確認するテスト。"""
+    sim = Simulation(seed=0)
+    index = TargetIndex(sim.cities, sim.bases)
+    assert len(index) == 9
+
+    city = next(iter(sim.cities))
+    index.remove(city)
+    city.kill()
+    for base in sim.bases:
+        base.destroy()  # remove() なしで破壊
+
+    picks = {index.pick(i / 100) for i in range(100)}
+    assert picks == set(sim.cities)
+    assert len(index) == 5
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_meteors_split_into_warheads(vectorized):
+    """分裂イベントで隕石が複数の弾頭に置き換わることを確認するテスト。"""
+    if vectorized:
+        pytest.importorskip("numpy")
+    sim = Simulation(seed=4, waves=_mirv, vectorized=vectorized)
+    sim.run(20)
+    assert len(sim.enemy_meteors) == 1
+    parent = next(iter(sim.enemy_meteors))
+
+    sim.run(sim.spawn_table.splits[0])
+
+    assert not parent.alive() or parent.split_frame == 0
+    assert len(sim.enemy_meteors) >= 3
+    assert sim.meteors_spawned_this_level <= sim.meteors_to_spawn_this_level
+
+
+def test_snapshot_keeps_pending_splits():
+    """分裂前の隕石を含む状態を保存・復元しても同じ展開になることを確認する。"""
+    sim = Simulation(seed=5, waves=_mirv)
+    sim.run(45)
+    restored = restore(snapshot(sim), waves=_mirv)
+
+    sim.run(120)
+    restored.run(120)
+    assert snapshot(restored) == snapshot(sim)
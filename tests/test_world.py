@@ -0,0 +1,68 @@
+import pytest
+
+from settings import SCREEN_HEIGHT, SCREEN_WIDTH
+from simulation import Simulation
+from sprites import EnemyMeteor, Explosion
+
+pytest.importorskip("numpy")
+import world
+
+
+def _play(sim, frames):
+    """決まった入力でゲームを進め、結果をまとめて返す。"""
+    for frame in range(frames):
+        if frame % 40 == 0:
+            x = (frame * 37) % SCREEN_WIDTH
+            sim.fire((x, SCREEN_HEIGHT // 3))
+        sim.step()
+    return (
+        sim.score,
+        sim.level,
+        sim.game_over,
+        len(sim.cities),
+        [base.ammo for base in sim.bases],
+        [base.is_alive for base in sim.bases],
+        len(sim.enemy_meteors),
+        len(sim.explosions),
+    )
+
+
+def test_vectorized_simulation_matches_sprite_simulation():
+    """ベクトル化した更新がスプライト単位の更新と同じ結果になることを確認する。"""
+    for seed in range(3):
+        expected = _play(Simulation(seed=seed), 4000)
+        actual = _play(Simulation(seed=seed, vectorized=True), 4000)
+        assert actual == expected
+
+
+def test_world_culls_offscreen_meteor():
+    """画面外に出た隕石が取り除かれることを確認するテスト。"""
+    entities = world.EntityWorld(capacity=1)
+    meteor = EnemyMeteor((SCREEN_WIDTH - 1, 10), (SCREEN_WIDTH + 500, 10), 10)
+    entities.add_projectile(meteor, world.METEOR)
+
+    removed, _, _ = entities.step()
+
+    assert removed == [meteor]
+    assert len(entities) == 0
+
+
+def test_world_expires_explosion_and_grows():
+    """爆発が拡大し、寿命で消えることを確認するテスト。"""
+    entities = world.EntityWorld(capacity=1)
+    explosion = Explosion((300, 300), 50, 5, 10)
+    other = Explosion((100, 100), 50, 5, 20)
+    entities.add_explosion(explosion)
+    entities.add_explosion(other)  # 容量を超えて配列が拡張される
+
+    for _ in range(5):
+        entities.step()
+    entities.sync_views()
+    assert explosion.current_radius == 25
+    assert explosion.lifespan == 5
+
+    removed = []
+    for _ in range(5):
+        removed += entities.step()[0]
+    assert removed == [explosion]
+    assert len(entities) == 1
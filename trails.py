@@ -0,0 +1,188 @@
+"""
+Contrails behind missiles and meteors.
+
+TrailLayer keeps every trail drawn on one persistent surface. Each frame
+update() only draws the segment every projectile covered since the last
+frame, so its cost follows the number of projectiles, not the length of
+their trails. When a projectile dies its trail is erased in bulk: the
+trail's bounding box is cleared and the few live trails crossing that box
+are redrawn as single lines. Trails are straight, from where the projectile
+was launched to where it is now, so a whole trail is always one line.
+
+The layer is opaque and replaces the background fill: Game draws it first
+and the sprites on top.
+"""
+
+import pygame
+
+from settings import BLACK, SCREEN_HEIGHT, SCREEN_WIDTH
+from sprites import EnemyMeteor, PlayerMissile
+from world import METEOR, MISSILE, np
+
+MISSILE_TRAIL_COLOR = (90, 140, 255)
+METEOR_TRAIL_COLOR = (255, 90, 60)
+
+COLORS = {
+    PlayerMissile: MISSILE_TRAIL_COLOR,
+    EnemyMeteor: METEOR_TRAIL_COLOR,
+}
+
+
+class Trail:
+    """The trail of one flight: launch point, last drawn head and color."""
+
+    __slots__ = ("color", "head", "launch", "progress", "seen", "start", "target")
+
+    def __init__(self, launch, target, color):
+        # launch and target identify the flight; start is the pixel the
+        # trail begins at.
+        self.launch = launch
+        self.target = target
+        self.start = (round(launch[0]), round(launch[1]))
+        self.head = self.start
+        self.progress = 0
+        self.color = color
+        self.seen = 0
+
+    def progress_of(self, point):
+        """How far `point` lies along the flight, in arbitrary units."""
+        return (point[0] - self.start[0]) * (self.target[0] - self.start[0]) + (
+            point[1] - self.start[1]
+        ) * (self.target[1] - self.start[1])
+
+    def rect(self, width):
+        """Bounding box of the whole trail drawn `width` pixels wide."""
+        (x1, y1), (x2, y2) = self.start, self.head
+        return pygame.Rect(
+            min(x1, x2) - width,
+            min(y1, y2) - width,
+            abs(x2 - x1) + 2 * width + 1,
+            abs(y2 - y1) + 2 * width + 1,
+        )
+
+
+def heads(simulation, lag=0.0):
+    """
+    Yields every missile and meteor with the point its trail reaches.
+
+    Args:
+        simulation (Simulation): The game.
+        lag (float): Steps to move back along the velocity, so that trails
+            end where interpolated sprites are drawn.
+
+    Yields:
+        tuple[PlayerMissile | EnemyMeteor, tuple[int, int]]: The projectile
+        and its rounded center.
+    """
+    world = simulation.world
+    if world is None:
+        for group in (simulation.player_missiles, simulation.enemy_meteors):
+            for sprite in group:
+                position = sprite.current_pos - sprite.velocity * lag
+                yield sprite, (round(position.x), round(position.y))
+        return
+    slots = world.slots(MISSILE).tolist() + world.slots(METEOR).tolist()
+    centers = world.pos[slots]
+    if lag:
+        centers = centers - world.vel[slots] * lag
+    # np.rint rounds halves to even, like round().
+    xs, ys = np.rint(centers).astype(np.int64).T.tolist()
+    owners = world.owners
+    yield from zip([owners[slot] for slot in slots], zip(xs, ys))
+
+
+class TrailLayer:
+    """A persistent surface holding the contrails of a game."""
+
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT), background=BLACK, width=1):
+        """
+        Args:
+            size (tuple[int, int]): Size of the layer, normally the screen's.
+            background (tuple[int, int, int]): Color the layer is cleared to.
+            width (int): Line width of the trails.
+        """
+        self.surface = pygame.Surface(size)
+        self.background = background
+        self.width = width
+        self.surface.fill(background)
+        self.trails = {}
+        # Regions changed by the last update(), for dirty-rect presentation.
+        self.dirty = []
+        self._frame = 0
+
+    def clear(self):
+        """Erases every trail."""
+        self.surface.fill(self.background)
+        self.trails.clear()
+        self.dirty = [self.surface.get_rect()]
+
+    def update(self, simulation, lag=0.0):
+        """
+        Extends the trails of live projectiles and erases those of dead ones.
+
+        Args:
+            simulation (Simulation): The game.
+            lag (float): Interpolation lag, as in Game.draw_items().
+
+        Returns:
+            list[pygame.Rect]: The regions of the layer that changed.
+        """
+        self._frame += 1
+        frame = self._frame
+        surface = self.surface
+        width = self.width
+        trails = self.trails
+        dirty = []
+        erased = []
+        for sprite, head in heads(simulation, lag):
+            trail = trails.get(sprite)
+            # Every launch passes new position tuples, so a pooled sprite
+            # that died and flew again since last frame shows up here.
+            if (
+                trail is None
+                or trail.launch is not sprite.start_pos
+                or trail.target is not sprite.target_pos
+            ):
+                if trail is not None:
+                    erased.append(trail)
+                trail = trails[sprite] = Trail(
+                    sprite.start_pos, sprite.target_pos, COLORS[type(sprite)]
+                )
+            trail.seen = frame
+            if head == trail.head:
+                continue
+            progress = trail.progress_of(head)
+            if 0 < progress < trail.progress:
+                # Back on the same line, launched again from the same tuples.
+                erased.append(trail)
+                trail = trails[sprite] = Trail(trail.launch, trail.target, trail.color)
+                trail.seen = frame
+            # Only ever draw forwards: an interpolated head can lie just
+            # behind the launch point right after launch.
+            if progress > trail.progress:
+                dirty.append(
+                    pygame.draw.line(surface, trail.color, trail.head, head, width)
+                )
+                trail.head = head
+                trail.progress = progress
+
+        for sprite in [
+            sprite for sprite, trail in trails.items() if trail.seen != frame
+        ]:
+            erased.append(trails.pop(sprite))
+        if erased:
+            dirty += self._erase(erased)
+        self.dirty = dirty
+        return dirty
+
+    def _erase(self, erased):
+        """Clears the boxes of finished trails and repairs crossing ones."""
+        boxes = [trail.rect(self.width) for trail in erased]
+        for box in boxes:
+            self.surface.fill(self.background, box)
+        for trail in self.trails.values():
+            if trail.rect(self.width).collidelist(boxes) != -1:
+                pygame.draw.line(
+                    self.surface, trail.color, trail.start, trail.head, self.width
+                )
+        return boxes
@@ -0,0 +1,183 @@
+"""
+Data-driven meteor waves.
+
+A Wave describes one level: how many meteors fall, how often, how fast and
+how likely they are to split into several warheads (MIRV). When a level
+starts the Simulation draws a seed and generate() pre-computes the level's
+whole spawn table from it, so spawning a meteor is a table read.
+
+Targets are stored in the table as fractions in [0, 1) and resolved against
+the TargetIndex of live cities and bases when the meteor spawns, so a table
+never aims at something that has been destroyed since it was made.
+
+Waves can be loaded from a JSON file:
+
+    {"waves": [{"meteors": 6, "interval": 50}, {"split_chance": 0.2}]}
+
+Entry i configures level i + 1; missing fields and levels past the list use
+the classic formulas.
+"""
+
+import collections
+import json
+import random
+import zlib
+
+from settings import SCREEN_WIDTH
+
+# Levels compared by digest(); games practically never get further.
+DIGEST_LEVELS = 50
+
+# One level's meteors: how many, base steps between spawns, speed range in
+# pixels per base step, the chance that a meteor splits, the range of base
+# steps after spawning at which it does, and the warheads it splits into.
+Wave = collections.namedtuple(
+    "Wave",
+    [
+        "meteors",
+        "interval",
+        "min_speed",
+        "max_speed",
+        "split_chance",
+        "split_min",
+        "split_max",
+        "split_count",
+    ],
+    defaults=(0, 60, 1.0, 3.0, 0.0, 60, 120, 3),
+)
+
+# Pre-computed spawns of one level, one list entry per meteor: base steps
+# after the level start, spawn x, target fraction for TargetIndex.pick(),
+# speed per base step, base steps until it splits (0 for never) and the
+# target fractions of its warheads.
+SpawnTable = collections.namedtuple(
+    "SpawnTable", ["times", "xs", "aims", "speeds", "splits", "split_aims"]
+)
+
+
+def classic(level):
+    """The original level progression: more, faster meteors each level."""
+    return Wave(
+        meteors=5 + level * 2,
+        interval=max(20, 60 - level * 5),
+        min_speed=1 + level * 0.2,
+        max_speed=3 + level * 0.2,
+    )
+
+
+def load(path):
+    """
+    Reads designer waves from a JSON file.
+
+    Args:
+        path (str): The waves file; see the module docstring.
+
+    Returns:
+        Callable[[int], Wave]: Wave for each level.
+    """
+    with open(path) as f:
+        entries = json.load(f)["waves"]
+    for entry in entries:
+        unknown = set(entry) - set(Wave._fields)
+        if unknown:
+            raise ValueError(f"{path}: unknown wave fields {sorted(unknown)}")
+
+    def waves(level):
+        wave = classic(level)
+        if level <= len(entries):
+            wave = wave._replace(**entries[level - 1])
+        return wave
+
+    return waves
+
+
+def digest(waves, levels=DIGEST_LEVELS):
+    """
+    Fingerprints a wave progression by the waves of its first levels.
+
+    Args:
+        waves (Callable[[int], Wave] | None): Wave for each level; None
+            means classic.
+        levels (int): Levels to compare, starting at level 1.
+
+    Returns:
+        int: A 32-bit digest, equal for progressions with equal waves.
+    """
+    waves = waves or classic
+    data = json.dumps([list(waves(level)) for level in range(1, levels + 1)])
+    return zlib.crc32(data.encode())
+
+
+def generate(wave, seed):
+    """
+    Pre-computes the spawns of one level.
+
+    Args:
+        wave (Wave): The level's configuration.
+        seed (int): Seed for the table; the same seed gives the same table.
+
+    Returns:
+        SpawnTable: The level's spawns.
+    """
+    rng = random.Random(seed)
+    count = wave.meteors
+    splits = [
+        rng.randint(wave.split_min, wave.split_max)
+        if rng.random() < wave.split_chance
+        else 0
+        for _ in range(count)
+    ]
+    return SpawnTable(
+        times=[wave.interval * (i + 1) for i in range(count)],
+        xs=[rng.randint(0, SCREEN_WIDTH) for _ in range(count)],
+        aims=[rng.random() for _ in range(count)],
+        speeds=[rng.uniform(wave.min_speed, wave.max_speed) for _ in range(count)],
+        splits=splits,
+        split_aims=[
+            tuple(rng.random() for _ in range(wave.split_count)) if split else ()
+            for split in splits
+        ],
+    )
+
+
+class TargetIndex:
+    """Live cities and bases meteors can aim at."""
+
+    def __init__(self, cities, bases):
+        """
+        Indexes the initial targets.
+
+        Args:
+            cities (Iterable[City]): The cities.
+            bases (Iterable[MissileBase]): The missile bases.
+        """
+        self.targets = list(cities) + [b for b in bases if not b.is_destroyed()]
+
+    def __len__(self):
+        return len(self.targets)
+
+    def remove(self, target):
+        """Drops a destroyed city or base."""
+        if target in self.targets:
+            self.targets.remove(target)
+
+    def pick(self, fraction):
+        """
+        Returns the target at `fraction` of the live targets.
+
+        Targets destroyed without a remove() call are dropped on the way.
+
+        Args:
+            fraction (float): A number in [0, 1).
+
+        Returns:
+            City | MissileBase | None: The target, or None if none is left.
+        """
+        targets = self.targets
+        while targets:
+            target = targets[int(fraction * len(targets))]
+            destroyed = getattr(target, "is_destroyed", None)
+            if target.alive() and not (destroyed and destroyed()):
+                return target
+            targets.remove(target)
+        return None
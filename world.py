@@ -0,0 +1,306 @@
+"""
+NumPy-backed struct-of-arrays store for moving entities.
+
+Missiles, meteors and explosions keep their state in contiguous arrays so a
+whole frame (movement, arrival checks, off-screen culling and explosion
+expiry) runs as a handful of batched array operations. The sprites stay
+around as views that are synced from the arrays only when they are drawn.
+
+NumPy is optional; install it with the "fast" extra to use this module.
+"""
+
+import math
+
+from settings import SCREEN_HEIGHT, SCREEN_WIDTH
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+EMPTY = 0
+MISSILE = 1
+METEOR = 2
+EXPLOSION = 3
+
+
+def _require_numpy():
+    """Returns the numpy module, or raises ImportError when it is missing."""
+    if np is None:
+        raise ImportError("EntityWorld requires numpy; install the 'fast' extra.")
+    return np
+
+
+def _bounding_radius(width, height):
+    """Radius pygame.sprite.collide_circle uses for a sprite without one."""
+    return 0.5 * math.sqrt(width**2 + height**2)
+
+
+class EntityWorld:
+    """Struct-of-arrays storage and batched update for dynamic entities."""
+
+    def __init__(self, capacity=256):
+        """
+        Initializes an empty world.
+
+        Args:
+            capacity (int): Initial number of slots. The arrays grow on demand.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        np = _require_numpy()
+        self.capacity = 0
+        self.kind = np.zeros(0, dtype=np.int8)
+        self.pos = np.zeros((0, 2))
+        self.vel = np.zeros((0, 2))
+        self.target = np.zeros((0, 2))
+        self.speed = np.zeros(0)
+        self.size = np.zeros(0, dtype=np.int64)
+        self.radius = np.zeros(0)
+        self.max_radius = np.zeros(0)
+        self.expand_speed = np.zeros(0)
+        self.lifespan = np.zeros(0, dtype=np.int64)
+        self.owners = []
+        self._free = []
+        self._grow(max(1, capacity))
+
+    def _grow(self, capacity):
+        """Resize every array to hold `capacity` slots."""
+        np = _require_numpy()
+        extra = capacity - self.capacity
+        self.kind = np.concatenate([self.kind, np.zeros(extra, dtype=np.int8)])
+        for name in ("pos", "vel", "target"):
+            arr = getattr(self, name)
+            setattr(self, name, np.concatenate([arr, np.zeros((extra, 2))]))
+        for name in ("speed", "radius", "max_radius", "expand_speed"):
+            arr = getattr(self, name)
+            setattr(self, name, np.concatenate([arr, np.zeros(extra)]))
+        for name in ("size", "lifespan"):
+            arr = getattr(self, name)
+            setattr(self, name, np.concatenate([arr, np.zeros(extra, dtype=np.int64)]))
+        self.owners.extend([None] * extra)
+        self._free.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
+
+    def _allocate(self, kind, owner):
+        """Take a free slot for a new entity."""
+        if not self._free:
+            self._grow(self.capacity * 2)
+        slot = self._free.pop()
+        self.kind[slot] = kind
+        self.owners[slot] = owner
+        owner.world_slot = slot
+        return slot
+
+    def __len__(self):
+        return self.capacity - len(self._free)
+
+    def add_projectile(self, sprite, kind):
+        """
+        Registers a PlayerMissile or EnemyMeteor.
+
+        Args:
+            sprite (PlayerMissile | EnemyMeteor): The sprite to mirror.
+            kind (int): MISSILE or METEOR.
+
+        Returns:
+            int: The slot holding the entity.
+        """
+        slot = self._allocate(kind, sprite)
+        self.pos[slot] = sprite.current_pos
+        self.vel[slot] = sprite.velocity
+        self.target[slot] = sprite.target_pos
+        self.speed[slot] = sprite.speed
+        self.size[slot] = sprite.rect.width
+        return slot
+
+    def add_explosion(self, sprite):
+        """
+        Registers an Explosion.
+
+        Args:
+            sprite (Explosion): The sprite to mirror.
+
+        Returns:
+            int: The slot holding the entity.
+        """
+        slot = self._allocate(EXPLOSION, sprite)
+        self.pos[slot] = sprite.pos
+        self.radius[slot] = sprite.current_radius
+        self.max_radius[slot] = sprite.max_radius
+        self.expand_speed[slot] = sprite.expand_speed
+        self.lifespan[slot] = sprite.lifespan
+        return slot
+
+    def remove(self, slot):
+        """Frees a slot and returns the sprite that owned it."""
+        owner = self.owners[slot]
+        self.kind[slot] = EMPTY
+        self.owners[slot] = None
+        self._free.append(slot)
+        return owner
+
+    def slots(self, kind):
+        """Returns the occupied slots of one kind."""
+        np = _require_numpy()
+        return np.flatnonzero(self.kind == kind)
+
+    def center(self, slot):
+        """Integer rect center of one entity, truncated like sprite rects."""
+        x, y = self.pos[slot]
+        return (int(x), int(y))
+
+    def step(self):
+        """
+        Advances every entity by one frame.
+
+        Projectiles move and are culled once their rect leaves the screen.
+        Explosions grow and expire. Culled and expired entities are freed.
+
+        Returns:
+            tuple[list, list, list]: The sprites that were culled or expired,
+            the missiles that reached their target and the meteors that
+            reached the ground. Arrived entities are not freed; the caller
+            decides what to do with them.
+        """
+        np = _require_numpy()
+        kind = self.kind
+        moving = (kind == MISSILE) | (kind == METEOR)
+        self.pos[moving] += self.vel[moving]
+
+        # Off-screen culling, mirroring SCREEN_RECT.colliderect(sprite.rect).
+        center = np.trunc(self.pos)
+        half = self.size // 2
+        left = center[:, 0] - half
+        top = center[:, 1] - half
+        onscreen = (
+            (left < SCREEN_WIDTH)
+            & (left + self.size > 0)
+            & (top < SCREEN_HEIGHT)
+            & (top + self.size > 0)
+        )
+        culled = moving & ~onscreen
+
+        blasts = kind == EXPLOSION
+        self.radius[blasts] += self.expand_speed[blasts]
+        self.lifespan[blasts] -= 1
+        expired = blasts & ((self.lifespan <= 0) | (self.radius > self.max_radius))
+
+        removed = [self.remove(slot) for slot in np.flatnonzero(culled | expired)]
+
+        offset = self.pos - self.target
+        distance = np.hypot(offset[:, 0], offset[:, 1])
+        arrived = (self.kind == MISSILE) & (distance < self.speed)
+        landed = (self.kind == METEOR) & (self.pos[:, 1] >= self.target[:, 1])
+
+        arrived_missiles = [self.owners[slot] for slot in np.flatnonzero(arrived)]
+        landed_meteors = [self.owners[slot] for slot in np.flatnonzero(landed)]
+        return removed, arrived_missiles, landed_meteors
+
+    def explosion_hits(self, centers, radii):
+        """
+        Tests every live explosion against a set of circles.
+
+        Args:
+            centers (numpy.ndarray): (n, 2) integer centers of the targets.
+            radii (numpy.ndarray): (n,) radii of the targets.
+
+        Returns:
+            numpy.ndarray: Boolean mask of targets touched by any explosion.
+        """
+        np = _require_numpy()
+        blasts = self.slots(EXPLOSION)
+        if not len(blasts) or not len(centers):
+            return np.zeros(len(centers), dtype=bool)
+        delta = centers[None, :, :] - self.pos[blasts][:, None, :]
+        distance_sq = (delta**2).sum(axis=2)
+        reach = self.radius[blasts][:, None] + radii[None, :]
+        return (distance_sq <= reach**2).any(axis=0)
+
+    def meteor_hits(self):
+        """Returns the owners of meteors touched by any explosion."""
+        np = _require_numpy()
+        meteors = self.slots(METEOR)
+        if not len(meteors):
+            return []
+        centers = np.trunc(self.pos[meteors])
+        radii = 0.5 * np.sqrt(2.0 * self.size[meteors] ** 2)
+        hit = self.explosion_hits(centers, radii)
+        return [self.owners[slot] for slot in meteors[hit]]
+
+    def structure_hits(self, sprites):
+        """
+        Returns the static sprites (cities, bases) touched by any explosion.
+
+        Args:
+            sprites (Iterable[pygame.sprite.Sprite]): Sprites to test, using
+                the same radius rule as pygame.sprite.collide_circle.
+        """
+        np = _require_numpy()
+        sprites = list(sprites)
+        if not sprites:
+            return []
+        centers = np.array([sprite.rect.center for sprite in sprites])
+        radii = np.array(
+            [
+                getattr(sprite, "radius", None)
+                or _bounding_radius(sprite.rect.width, sprite.rect.height)
+                for sprite in sprites
+            ]
+        )
+        hit = self.explosion_hits(centers, radii)
+        return [sprite for sprite, was_hit in zip(sprites, hit) if was_hit]
+
+    def draw_batches(self, kind, lag=0.0):
+        """
+        Top-left corners of one kind of projectile, grouped by size.
+
+        Positions are placed like Game.draw_items() places the sprites: the
+        truncated center on a step, the rounded interpolated center between
+        steps.
+
+        Args:
+            kind (int): MISSILE or METEOR.
+            lag (float): Steps to move back along the velocity.
+
+        Returns:
+            list[tuple[pygame.sprite.Sprite, list[list[int]]]]: For every
+            size, one sprite of that size and the corners to draw its image at.
+        """
+        np = _require_numpy()
+        slots = self.slots(kind)
+        if not len(slots):
+            return []
+        centers = self.pos[slots]
+        if lag:
+            centers = centers - self.vel[slots] * lag
+            centers = np.copysign(np.floor(np.abs(centers) + 0.5), centers)
+        corners = centers.astype(np.int64)
+        sizes = self.size[slots]
+        batches = []
+        for size in np.unique(sizes):
+            same = sizes == size
+            first = slots[np.argmax(same)]
+            batches.append((self.owners[first], (corners[same] - size // 2).tolist()))
+        return batches
+
+    def sync_views(self, projectiles=True):
+        """
+        Copies array state back onto the sprites so they can be drawn.
+
+        Args:
+            projectiles (bool): Also sync missiles and meteors. Renderers that
+                draw them straight from the arrays only need the explosions.
+        """
+        np = _require_numpy()
+        mask = self.kind != EMPTY if projectiles else self.kind == EXPLOSION
+        for slot in np.flatnonzero(mask):
+            sprite = self.owners[slot]
+            if self.kind[slot] == EXPLOSION:
+                sprite.current_radius = sprite.radius = self.radius[slot].item()
+                sprite.lifespan = self.lifespan[slot].item()
+                sprite.render()
+            else:
+                sprite.current_pos.update(*self.pos[slot])
+                sprite.rect.center = self.center(slot)